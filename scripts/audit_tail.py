@@ -0,0 +1,299 @@
+"""
+audit_logs / system_audit_logs 최근 기록 조회와 실시간 추적 (check_audit.py / check_all_audit.py / check_system_audit.py 대체).
+
+--follow 는 tail -f 처럼 (created_at, id) 커서 이후의 새 행만 주기적으로 가져온다.
+- keyset 조건 created_at > X or (created_at = X and id > Y) 로 (created_at, id) 순서대로 받는다.
+  offset 을 쓰지 않으므로 같은 created_at 에 여러 행이 있어도(한 트랜잭션의 대량 동기화) 건너뛰지 않는다.
+- created_at 은 트랜잭션 시작 시각이라, 오래 걸린 트랜잭션의 행은 커서보다 앞선 시각으로 늦게 커밋된다.
+  새 행을 다 따라잡으면 커서 - --overlap-seconds 구간의 id 를 다시 읽어 아직 내보내지 않은 행을 내보낸다
+  (이 행은 시각 순서보다 늦게 출력된다). overlap 보다 오래 걸린 트랜잭션의 행은 여전히 놓칠 수 있다.
+- created_at 인덱스: audit_logs 는 settlement_core_schema.sql, system_audit_logs 는 supabase_audit_setup.sql.
+  두 파일 모두 이름이 idx_audit_logs_created_at 이라 IF NOT EXISTS 때문에 나중에 실행한 쪽은 만들어지지 않는다.
+- 한 번에 --batch 건만 받고, 출력/flush 가 끝난 뒤에야 다음 조회를 한다. 파이프 건너편이 느리면
+  조회도 그만큼 늦춰진다(backpressure). 가득 찬 배치가 오면 곧바로 이어서 받고, 비어 있으면
+  --interval 부터 --max-interval 까지 대기 시간을 늘린다.
+
+사용:
+    python scripts/audit_tail.py                       # 최근 20건
+    python scripts/audit_tail.py --entity-id <uuid> --action-type UPDATE --limit 50
+    python scripts/audit_tail.py --table system_audit_logs --json
+    python scripts/audit_tail.py --follow --ndjson | jq .
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import IO, Any, Iterator
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.supabase_client import get_client  # noqa: E402
+
+DEFAULT_LIMIT = 20
+DEFAULT_BATCH = 200
+DEFAULT_INTERVAL = 1.0
+DEFAULT_MAX_INTERVAL = 10.0
+DEFAULT_OVERLAP_SECONDS = 60.0
+
+Row = dict[str, Any]
+
+
+@dataclass(frozen=True)
+class AuditTable:
+    name: str
+    entity_column: str
+    action_column: str
+    summary_fields: tuple[str, ...]
+
+
+TABLES = {
+    "audit_logs": AuditTable("audit_logs", "entity_id", "action", ("entity_type", "entity_id", "actor", "reason")),
+    "system_audit_logs": AuditTable(
+        "system_audit_logs", "target_entity_id", "action_type", ("actor_email", "target_entity_id", "ip_address")
+    ),
+}
+DEFAULT_TABLE = "audit_logs"
+
+
+def base_query(spec: AuditTable, entity_id: str | None, action_type: str | None, columns: str = "*") -> Any:
+    query = get_client().table(spec.name).select(columns)
+    if entity_id:
+        query = query.eq(spec.entity_column, entity_id)
+    if action_type:
+        query = query.eq(spec.action_column, action_type)
+    return query
+
+
+def fetch_recent(
+    limit: int,
+    entity_id: str | None = None,
+    action_type: str | None = None,
+    table: str = DEFAULT_TABLE,
+    until: str | None = None,
+) -> list[Row]:
+    query = base_query(TABLES[table], entity_id, action_type)
+    if until is not None:
+        query = query.lte("created_at", until)
+    res = query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+    return res.data or []
+
+
+@dataclass
+class Cursor:
+    """마지막으로 내보낸 행의 (created_at, id)."""
+
+    created_at: str | None = None
+    row_id: str | None = None
+
+    def advance(self, row: Row) -> None:
+        self.created_at = str(row.get("created_at"))
+        self.row_id = str(row.get("id"))
+
+    def after_filter(self) -> str:
+        """PostgREST or 필터: created_at > X or (created_at = X and id > Y)."""
+        created_at = f'"{self.created_at}"'
+        return f'created_at.gt.{created_at},and(created_at.eq.{created_at},id.gt."{self.row_id}")'
+
+
+def prime_cursor(spec: AuditTable, entity_id: str | None, action_type: str | None) -> Cursor:
+    """가장 최근 (created_at, id) 로 커서를 만든다."""
+    cursor = Cursor()
+    latest = (
+        base_query(spec, entity_id, action_type, "created_at, id")
+        .order("created_at", desc=True)
+        .order("id", desc=True)
+        .limit(1)
+        .execute()
+        .data
+    )
+    if latest:
+        cursor.advance(latest[0])
+    return cursor
+
+
+def window_start(created_at: str, overlap_seconds: float) -> str:
+    start = datetime.fromisoformat(created_at.replace("Z", "+00:00")) - timedelta(seconds=overlap_seconds)
+    return start.isoformat()
+
+
+def window_ids(
+    spec: AuditTable, cursor: Cursor, overlap_seconds: float, batch: int, entity_id: str | None, action_type: str | None
+) -> set[str]:
+    """커서 - overlap 부터 커서까지 행의 id."""
+    ids: set[str] = set()
+    if cursor.created_at is None or overlap_seconds <= 0:
+        return ids
+    scan = Cursor()
+    while True:
+        query = base_query(spec, entity_id, action_type, "id, created_at").lte("created_at", cursor.created_at)
+        if scan.created_at is None:
+            query = query.gte("created_at", window_start(cursor.created_at, overlap_seconds))
+        else:
+            query = query.or_(scan.after_filter())
+        rows = query.order("created_at").order("id").limit(batch).execute().data or []
+        ids.update(str(row["id"]) for row in rows)
+        if rows:
+            scan.advance(rows[-1])
+        if len(rows) < batch:
+            return ids
+
+
+def poll_late(
+    spec: AuditTable,
+    cursor: Cursor,
+    seen: set[str],
+    overlap_seconds: float,
+    batch: int,
+    entity_id: str | None,
+    action_type: str | None,
+) -> list[Row]:
+    """overlap 구간에 늦게 커밋된 행 중 아직 내보내지 않은 행. seen 은 구간 안의 id 만 남긴다."""
+    window = window_ids(spec, cursor, overlap_seconds, batch, entity_id, action_type)
+    missing = sorted(window - seen)
+    seen.intersection_update(window)
+    rows: list[Row] = []
+    for offset in range(0, len(missing), batch):
+        chunk = missing[offset : offset + batch]
+        rows.extend(base_query(spec, entity_id, action_type).in_("id", chunk).execute().data or [])
+    rows.sort(key=lambda row: (str(row.get("created_at")), str(row.get("id"))))
+    seen.update(str(row["id"]) for row in rows)
+    return rows
+
+
+def poll_new(spec: AuditTable, cursor: Cursor, batch: int, entity_id: str | None, action_type: str | None) -> list[Row]:
+    query = base_query(spec, entity_id, action_type)
+    if cursor.created_at is not None:
+        query = query.or_(cursor.after_filter())
+    rows = query.order("created_at").order("id").limit(batch).execute().data or []
+    if rows:
+        cursor.advance(rows[-1])
+    return rows
+
+
+def follow(
+    table: str = DEFAULT_TABLE,
+    entity_id: str | None = None,
+    action_type: str | None = None,
+    batch: int = DEFAULT_BATCH,
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    backlog: int = DEFAULT_LIMIT,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+) -> Iterator[list[Row]]:
+    """새 행을 배치 단위로 yield. 소비자가 다음 값을 요청해야 다음 조회를 한다."""
+    spec = TABLES[table]
+    cursor = prime_cursor(spec, entity_id, action_type)
+    # 시작 시점에 이미 있던 overlap 구간 행은 늦게 커밋된 행으로 보지 않는다
+    seen = window_ids(spec, cursor, overlap_seconds, batch, entity_id, action_type)
+
+    # 커서 시각까지의 최근 backlog 건을 먼저 보여주고 그 이후부터 추적
+    if backlog > 0 and cursor.created_at is not None:
+        recent = list(reversed(fetch_recent(backlog, entity_id, action_type, table, cursor.created_at)))
+        if recent:
+            yield recent
+
+    wait = interval
+    while True:
+        rows = poll_new(spec, cursor, batch, entity_id, action_type)
+        seen.update(str(row["id"]) for row in rows)
+        if rows:
+            yield rows
+            wait = interval
+        # 받은 페이지가 가득 찼으면 더 남아 있으므로 기다리지 않고 이어서 받는다
+        if len(rows) >= batch:
+            continue
+        # 따라잡았을 때만 overlap 구간을 다시 확인한다
+        late = poll_late(spec, cursor, seen, overlap_seconds, batch, entity_id, action_type)
+        if late:
+            yield late
+            wait = interval
+            continue
+        time.sleep(wait)
+        wait = min(wait * 2, max_interval)
+
+
+def format_row(row: Row, spec: AuditTable = TABLES[DEFAULT_TABLE]) -> str:
+    parts = [str(row.get("created_at") or "-"), str(row.get(spec.action_column) or "-")]
+    for field_name in spec.summary_fields:
+        if row.get(field_name):
+            parts.append(f"{field_name}={row[field_name]}")
+    return " | ".join(parts)
+
+
+def emit(rows: list[Row], spec: AuditTable, ndjson: bool, out: IO[str]) -> None:
+    for row in rows:
+        if ndjson:
+            out.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        else:
+            out.write(format_row(row, spec) + "\n")
+    # 다 쓸 때까지 다음 조회를 하지 않는다
+    out.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="audit_logs / system_audit_logs 최근 기록 조회 및 추적")
+    parser.add_argument("--table", choices=sorted(TABLES), default=DEFAULT_TABLE, help=f"대상 테이블 (기본 {DEFAULT_TABLE})")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help=f"조회 건수 (기본 {DEFAULT_LIMIT}, --follow 에서는 시작 시 보여줄 건수)")
+    parser.add_argument("--entity-id", help="entity_id (system_audit_logs 는 target_entity_id) 필터")
+    parser.add_argument("--action-type", help="action 종류 필터 (audit_logs.action / system_audit_logs.action_type)")
+    parser.add_argument("--json", action="store_true", help="원본 행을 JSON 으로 출력")
+    parser.add_argument("--ndjson", action="store_true", help="한 줄에 한 행씩 JSON 으로 출력")
+    parser.add_argument("--follow", "-f", action="store_true", help="새 기록을 계속 추적 (Ctrl+C 로 종료)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH, help=f"추적 시 한 번에 받는 건수 (기본 {DEFAULT_BATCH})")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help=f"추적 조회 간격 초 (기본 {DEFAULT_INTERVAL})")
+    parser.add_argument(
+        "--max-interval", type=float, default=DEFAULT_MAX_INTERVAL, help=f"새 기록이 없을 때 최대 간격 초 (기본 {DEFAULT_MAX_INTERVAL})"
+    )
+    parser.add_argument(
+        "--overlap-seconds",
+        type=float,
+        default=DEFAULT_OVERLAP_SECONDS,
+        help=f"늦게 커밋된 행을 찾으려고 커서 뒤로 다시 확인할 초 (기본 {DEFAULT_OVERLAP_SECONDS}, 0 이면 끔)",
+    )
+    args = parser.parse_args()
+    spec = TABLES[args.table]
+
+    if args.follow:
+        try:
+            for rows in follow(
+                args.table,
+                args.entity_id,
+                args.action_type,
+                args.batch,
+                args.interval,
+                args.max_interval,
+                args.limit,
+                args.overlap_seconds,
+            ):
+                emit(rows, spec, args.ndjson or args.json, sys.stdout)
+        except KeyboardInterrupt:
+            pass
+        except BrokenPipeError:
+            # head 등 파이프 건너편이 먼저 닫힌 경우: 종료 시 flush 에러가 나지 않도록 stdout 을 돌려둔다
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+
+    try:
+        rows = fetch_recent(args.limit, args.entity_id, args.action_type, args.table)
+    except Exception as e:
+        print(f"Error: {e}")
+        return
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return
+
+    # 오래된 것부터 위에서 아래로 (tail 과 같은 순서)
+    emit(list(reversed(rows)), spec, args.ndjson, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
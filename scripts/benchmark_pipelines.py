@@ -0,0 +1,379 @@
+"""
+수집/매칭 파이프라인 벤치마크 (회귀 추적 포함).
+
+측정 대상:
+- excel_parse      : sync_latest_address_book.read_excel_rows
+- sheet_parse      : MigrationManager.smart_read_sheet (원본 파일 전체 시트)
+- matching         : build_member_indexes + match_main_row_to_member (메인/기타 전체 행)
+- cert_extraction  : extract_certificate_numbers (legacy_records 전체)
+- legacy_link      : run_sync --apply (FakeSupabase, 지연 주입) - members 반영 + legacy 연결
+- upload_batching  : MigrationManager.upload (FakeSupabase, 지연 주입)
+
+generate_synthetic_data 로 만든 규모별 데이터를 사용하고, 케이스마다 별도 프로세스에서 실행해
+wall time / peak RSS / 요청 수를 독립적으로 잰다. 결과는 JSON history 에 누적되며,
+최근 정상 실행의 중앙값 대비 --threshold 를 넘게 느려지면(또는 RSS/요청 수가 늘면) 종료 코드 1.
+
+사용:
+    python scripts/benchmark_pipelines.py --sizes 1000,10000
+    python scripts/benchmark_pipelines.py --cases matching,cert_extraction --no-record
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+DEFAULT_SIZES = "1000,10000"
+DEFAULT_DATA_DIR = "data/benchmarks/synthetic"
+DEFAULT_HISTORY = "data/benchmarks/history.json"
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_LATENCY = 0.002
+BASELINE_WINDOW = 5
+METRICS = ("wall_time", "peak_rss_mb", "requests")
+
+TimedCase = Callable[[], dict[str, int]]
+
+
+# ============================================
+# 케이스 (자식 프로세스에서 실행)
+# ============================================
+def case_excel_parse(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    import sync_latest_address_book as sync
+
+    sync.FILE_PATH = paths["address_book"]
+
+    def run() -> dict[str, int]:
+        main_rows, extra_rows = sync.read_excel_rows()
+        return {"main_rows": len(main_rows), "extra_rows": len(extra_rows)}
+
+    return run
+
+
+def case_sheet_parse(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    import pandas as pd
+
+    from migrate_rights_data import MigrationManager
+
+    mgr = MigrationManager(dry_run=True)
+    sheets = pd.ExcelFile(paths["raw_file"]).sheet_names
+
+    def run() -> dict[str, int]:
+        rows = 0
+        for sheet in sheets:
+            df, _ = mgr.smart_read_sheet(paths["raw_file"], sheet)
+            rows += 0 if df is None else len(df)
+        return {"sheets": len(sheets), "rows": rows}
+
+    return run
+
+
+def case_matching(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    import sync_latest_address_book as sync
+
+    sync.FILE_PATH = paths["address_book"]
+    main_rows, extra_rows = sync.read_excel_rows()
+    members = load_fixture(paths)["members"]
+
+    def run() -> dict[str, int]:
+        indexes = sync.build_member_indexes(members)
+        assigned: set[str] = set()
+        matched = 0
+        for row in main_rows + extra_rows:
+            member, _ = sync.match_main_row_to_member(row, indexes, assigned)
+            if member:
+                assigned.add(member["id"])
+                matched += 1
+        return {"rows": len(main_rows) + len(extra_rows), "matched": matched}
+
+    return run
+
+
+def case_cert_extraction(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    from recalculate_rights_count_from_cert_numbers import extract_certificate_numbers
+
+    records = load_fixture(paths)["legacy_records"]
+
+    def run() -> dict[str, int]:
+        numbers = 0
+        for record in records:
+            numbers += len(extract_certificate_numbers(record.get("raw_data"), record.get("certificates")))
+        return {"records": len(records), "numbers": numbers}
+
+    return run
+
+
+def case_legacy_link(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    import sync_latest_address_book as sync
+    from lib.checkpoint import Journal
+    from lib.fake_supabase import FakeSupabase
+    from lib.supabase_client import use_client
+
+    sync.FILE_PATH = paths["address_book"]
+    fake = FakeSupabase(load_fixture(paths), latency=args.latency)
+    use_client(fake)
+    sync_args = argparse.Namespace(concurrency=args.concurrency)
+
+    def run() -> dict[str, int]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync.run_sync(sync_args, dry_run=False, journal=Journal.disabled())
+        linked = sum(1 for r in fake.rows("legacy_records") if r.get("member_id"))
+        return {"legacy_records": len(fake.rows("legacy_records")), "linked": linked}
+
+    return run
+
+
+def case_upload_batching(paths: dict[str, str], args: argparse.Namespace) -> TimedCase:
+    import migrate_rights_data
+    from lib.fake_supabase import FakeSupabase
+    from lib.supabase_client import use_client
+
+    fake = FakeSupabase({"legacy_records": []}, latency=args.latency)
+    use_client(fake)
+    journal_dir = tempfile.mkdtemp(prefix="bench_journal_")
+    migrate_rights_data.default_journal_path = lambda name: os.path.join(journal_dir, f"{name}.journal")
+
+    mgr = migrate_rights_data.MigrationManager(dry_run=False)
+    for record in load_fixture(paths)["legacy_records"]:
+        record.pop("id", None)
+        mgr.merged_data[record["original_name"]] = record
+
+    def run() -> dict[str, int]:
+        with contextlib.redirect_stdout(io.StringIO()):
+            mgr.upload()
+        return {"uploaded": len(fake.rows("legacy_records"))}
+
+    return run
+
+
+CASES: dict[str, Callable[[dict[str, str], argparse.Namespace], TimedCase]] = {
+    "excel_parse": case_excel_parse,
+    "sheet_parse": case_sheet_parse,
+    "matching": case_matching,
+    "cert_extraction": case_cert_extraction,
+    "legacy_link": case_legacy_link,
+    "upload_batching": case_upload_batching,
+}
+
+
+def load_fixture(paths: dict[str, str]) -> dict[str, list[dict[str, Any]]]:
+    with open(paths["fixture"], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_child(args: argparse.Namespace) -> None:
+    from lib.supabase_client import request_stats
+
+    paths = data_paths(args.data_dir, args.size)
+    timed = CASES[args.child](paths, args)
+    request_stats.reset()
+
+    started = time.perf_counter()
+    counters = timed()
+    wall_time = time.perf_counter() - started
+
+    totals = request_stats.totals()
+    result = {
+        "case": args.child,
+        "size": args.size,
+        "wall_time": round(wall_time, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "requests": totals.requests,
+        "bytes_sent": totals.bytes_sent,
+        "bytes_received": totals.bytes_received,
+        "counters": counters,
+    }
+    print(json.dumps(result, ensure_ascii=False))
+
+
+# ============================================
+# 실행 / 기록 / 회귀 판정 (부모 프로세스)
+# ============================================
+def data_paths(data_dir: str, size: int) -> dict[str, str]:
+    from generate_synthetic_data import ADDRESS_BOOK_FILE, FIXTURE_FILE, MAIN_FILE, RAW_FILE
+
+    base = os.path.join(data_dir, str(size))
+    return {
+        "address_book": os.path.join(base, ADDRESS_BOOK_FILE),
+        "main_file": os.path.join(base, MAIN_FILE),
+        "raw_file": os.path.join(base, RAW_FILE),
+        "fixture": os.path.join(base, FIXTURE_FILE),
+    }
+
+
+def ensure_data(data_dir: str, size: int, seed: int) -> None:
+    from generate_synthetic_data import generate
+
+    paths = data_paths(data_dir, size)
+    if all(os.path.exists(p) for p in paths.values()):
+        return
+    print(f"  합성 데이터 생성: {size:,}명 -> {os.path.dirname(paths['fixture'])}")
+    generate(os.path.dirname(paths["fixture"]), size, seed)
+
+
+def spawn_case(case: str, size: int, args: argparse.Namespace) -> dict[str, Any]:
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--child", case,
+        "--size", str(size),
+        "--data-dir", args.data_dir,
+        "--latency", str(args.latency),
+        "--concurrency", str(args.concurrency),
+    ]
+    proc = subprocess.run(command, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return {"case": case, "size": size, "error": proc.stderr.strip().splitlines()[-1:] or ["unknown"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def load_history(path: str) -> dict[str, Any]:
+    if not os.path.exists(path):
+        return {"runs": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_history(path: str, history: dict[str, Any]) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+
+
+def baseline_for(history: dict[str, Any], result: dict[str, Any], settings: dict[str, Any]) -> dict[str, float]:
+    """같은 케이스/규모/설정의 최근 정상 실행 중앙값."""
+    samples: dict[str, list[float]] = {metric: [] for metric in METRICS}
+    for run in reversed(history["runs"]):
+        if run.get("settings") != settings or run.get("regressions"):
+            continue
+        for past in run["results"]:
+            if past["case"] == result["case"] and past["size"] == result["size"] and "error" not in past:
+                for metric in METRICS:
+                    samples[metric].append(float(past[metric]))
+        if len(samples["wall_time"]) >= BASELINE_WINDOW:
+            break
+    return {metric: statistics.median(values) for metric, values in samples.items() if values}
+
+
+def find_regressions(
+    results: list[dict[str, Any]],
+    history: dict[str, Any],
+    settings: dict[str, Any],
+    threshold: float,
+) -> list[str]:
+    regressions: list[str] = []
+    for result in results:
+        if "error" in result:
+            continue
+        baseline = baseline_for(history, result, settings)
+        for metric, base in baseline.items():
+            current = float(result[metric])
+            if base > 0 and current > base * (1 + threshold):
+                regressions.append(
+                    f"{result['case']}@{result['size']} {metric}: {base:g} -> {current:g} (+{(current / base - 1):.0%})"
+                )
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="수집/매칭 파이프라인 벤치마크")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"인원 규모 목록 (기본 {DEFAULT_SIZES})")
+    parser.add_argument("--cases", default=",".join(CASES), help="실행할 케이스 (쉼표 구분)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="합성 데이터 캐시 디렉터리")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="결과 history JSON 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판정 비율 (기본 0.2 = 20%%)")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="FakeSupabase 요청당 지연(초)")
+    parser.add_argument("--concurrency", type=int, default=1, help="legacy_link 의 update 동시 전송 수")
+    parser.add_argument("--seed", type=int, default=42, help="합성 데이터 시드")
+    parser.add_argument("--no-record", action="store_true", help="history 에 기록하지 않음")
+    parser.add_argument("--child", choices=sorted(CASES), help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"알 수 없는 케이스: {', '.join(unknown)}")
+
+    settings = {"latency": args.latency, "concurrency": args.concurrency, "seed": args.seed}
+    results: list[dict[str, Any]] = []
+
+    print("\n=== 파이프라인 벤치마크 ===")
+    for size in sizes:
+        ensure_data(args.data_dir, size, args.seed)
+        for case in cases:
+            result = spawn_case(case, size, args)
+            results.append(result)
+            if "error" in result:
+                print(f"- {case}@{size:,}: 실패 ({result['error'][0]})")
+            else:
+                print(
+                    f"- {case}@{size:,}: {result['wall_time']:.3f}s / RSS {result['peak_rss_mb']}MB / "
+                    f"요청 {result['requests']}건 {result['counters']}"
+                )
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, settings, args.threshold)
+
+    if not args.no_record:
+        history["runs"].append(
+            {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "settings": settings,
+                "results": results,
+                "regressions": regressions,
+            }
+        )
+        save_history(args.history, history)
+        print(f"\nhistory 기록: {args.history}")
+
+    if regressions:
+        print(f"\n[회귀] 기준 대비 {args.threshold:.0%} 초과")
+        for line in regressions:
+            print(f"- {line}")
+        sys.exit(1)
+    if any("error" in r for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,32 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+"""
+account_entities 한 건의 조합번호(member_number) 조회.
 
-load_dotenv('.env.local')
+사용:
+    python scripts/check_member_no.py [entity_id]
+"""
 
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+from __future__ import annotations
 
-entity_id = '656e0807-1dda-4568-9078-3053a52df857'
+import argparse
 
-try:
-    res = supabase.table('account_entities').select('id, display_name, member_number').eq('id', entity_id).execute()
-    print(f"Results for {entity_id}:")
-    print(res.data)
-except Exception as e:
-    print(f"Error: {e}")
+from lib.supabase_client import get_client
+
+DEFAULT_ENTITY_ID = '656e0807-1dda-4568-9078-3053a52df857'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="account_entities 조합번호 조회")
+    parser.add_argument("entity_id", nargs="?", default=DEFAULT_ENTITY_ID, help="account_entities.id (기본 %(default)s)")
+    args = parser.parse_args()
+
+    supabase = get_client()
+    try:
+        res = supabase.table('account_entities').select('id, display_name, member_number').eq('id', args.entity_id).execute()
+        print(f"Results for {args.entity_id}:")
+        print(res.data)
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
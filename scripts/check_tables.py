@@ -1,12 +1,6 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from lib.supabase_client import get_client
 
-load_dotenv('.env.local')
-
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+supabase = get_client()
 
 tables = ['account_entities', 'asset_rights', 'certificate_registry', 'membership_roles', 'person_certificate_summaries']
 
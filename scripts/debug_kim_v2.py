@@ -1,13 +1,7 @@
-import os
 import json
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from lib.supabase_client import get_client
 
-load_dotenv('.env.local')
-
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+supabase = get_client()
 
 entity_id = '656e0807-1dda-4568-9078-3053a52df857'
 results = {}
@@ -0,0 +1,188 @@
+"""
+권리증 번호 공유(중복 보유) 탐지 스크립트.
+
+vw_certificate_shared_holders 뷰를 스캔하지 않고, 파이썬에서 한 번에 계산한다.
+
+동작:
+1) legacy_records(raw_data, certificates) 와 certificate_registry(account_entities) 에서
+   권리증 번호를 추출/정규화
+2) 정규화 번호 -> 보유자 목록 역색인(inverted index)을 한 번의 순회로 구성
+3) 서로 다른 사람(이름 키 기준)이 같은 번호를 가진 경우를 충돌로 보고
+4) 번호를 공유하는 사람들을 union-find 로 묶어 연결 요소(그룹) 단위로 출력
+
+전체 비용은 추출된 번호 수에 선형이다. 기본은 조회 전용.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from recalculate_rights_count_from_cert_numbers import (  # noqa: E402
+    extract_certificate_numbers,
+    normalize_cert_no,
+)
+from lib.normalize import as_text, simple_name_key  # noqa: E402
+from lib.queries import cached_rows, print_cache_stats  # noqa: E402
+from lib.supabase_client import print_request_stats  # noqa: E402
+
+LEGACY_COLUMNS = "id, original_name, rights_count, raw_data, certificates"
+
+HolderKey = tuple[str, str]
+
+
+@dataclass
+class Holder:
+    source: str
+    id: str
+    name: str
+    person_key: str
+    numbers: set[str] = field(default_factory=set)
+
+
+@dataclass
+class CertificateIndex:
+    holders: dict[HolderKey, Holder] = field(default_factory=dict)
+    by_number: dict[str, list[HolderKey]] = field(default_factory=dict)
+
+    def add(self, source: str, holder_id: str, name: str, numbers: Iterable[str]) -> None:
+        key = (source, holder_id)
+        holder = self.holders.get(key)
+        if holder is None:
+            holder = Holder(source=source, id=holder_id, name=name, person_key=simple_name_key(name) or key[1])
+            self.holders[key] = holder
+        for number in numbers:
+            if number in holder.numbers:
+                continue
+            holder.numbers.add(number)
+            self.by_number.setdefault(number, []).append(key)
+
+    def conflicts(self) -> dict[str, list[Holder]]:
+        """서로 다른 사람 2명 이상이 보유한 번호 -> 보유자 목록."""
+        result: dict[str, list[Holder]] = {}
+        for number, keys in self.by_number.items():
+            if len(keys) < 2:
+                continue
+            holders = [self.holders[key] for key in keys]
+            if len({h.person_key for h in holders}) > 1:
+                result[number] = holders
+        return result
+
+    def components(self) -> list[list[Holder]]:
+        """번호 공유로 연결된 보유자 그룹 (서로 다른 사람이 2명 이상인 그룹만)."""
+        parent: dict[HolderKey, HolderKey] = {key: key for key in self.holders}
+
+        def find(key: HolderKey) -> HolderKey:
+            root = key
+            while parent[root] != root:
+                root = parent[root]
+            while parent[key] != root:
+                parent[key], key = root, parent[key]
+            return root
+
+        for keys in self.by_number.values():
+            first = find(keys[0])
+            for other in keys[1:]:
+                root = find(other)
+                if root != first:
+                    parent[root] = first
+
+        groups: dict[HolderKey, list[Holder]] = {}
+        for key, holder in self.holders.items():
+            groups.setdefault(find(key), []).append(holder)
+
+        return [
+            members
+            for members in groups.values()
+            if len({h.person_key for h in members}) > 1
+        ]
+
+
+def build_certificate_index(
+    legacy_records: list[dict[str, Any]],
+    entities: list[dict[str, Any]],
+    registry_rows: list[dict[str, Any]],
+) -> CertificateIndex:
+    index = CertificateIndex()
+
+    for record in legacy_records:
+        numbers = extract_certificate_numbers(record.get("raw_data"), record.get("certificates"))
+        if numbers:
+            index.add("legacy", record["id"], as_text(record.get("original_name")), numbers)
+
+    entity_names = {e["id"]: as_text(e.get("display_name")) for e in entities}
+    for row in registry_rows:
+        entity_id = row.get("entity_id")
+        number = normalize_cert_no(row.get("certificate_number_normalized") or row.get("certificate_number_raw"))
+        if entity_id and number:
+            index.add("entity", entity_id, entity_names.get(entity_id, ""), [number])
+
+    return index
+
+
+def describe(holder: Holder) -> str:
+    return f"{holder.name or '(이름없음)'}[{holder.source}:{holder.id[:8]}]"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="권리증 번호 공유(중복 보유) 탐지")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--limit", type=int, default=30, help="화면 출력 건수 (기본 30)")
+    args = parser.parse_args()
+
+    legacy_records = cached_rows("legacy_records", LEGACY_COLUMNS)
+    entities = cached_rows("account_entities", "id, display_name")
+    registry_rows = cached_rows(
+        "certificate_registry",
+        "entity_id, certificate_number_raw, certificate_number_normalized",
+        {"is_active": True, "certificate_status": "confirmed"},
+    )
+
+    index = build_certificate_index(legacy_records, entities, registry_rows)
+    conflicts = index.conflicts()
+    components = sorted(index.components(), key=len, reverse=True)
+
+    print("\n=== 권리증 번호 공유 탐지 ===")
+    print(f"보유자: {len(index.holders)}명 / 고유 번호: {len(index.by_number)}개")
+    print(f"충돌 번호: {len(conflicts)}개 / 연결 그룹: {len(components)}개")
+
+    if conflicts:
+        print("\n[충돌 번호]")
+        for number in sorted(conflicts)[: args.limit]:
+            print(f"- {number}: {', '.join(describe(h) for h in conflicts[number])}")
+
+    if components:
+        print("\n[번호 공유 그룹]")
+        for members in components[: args.limit]:
+            shared = sorted({n for h in members for n in h.numbers if n in conflicts})
+            print(f"- {len(members)}명: {', '.join(describe(h) for h in members)} | {', '.join(shared)}")
+
+    if args.json_path:
+        payload = {
+            "conflicts": {
+                number: [{"source": h.source, "id": h.id, "name": h.name} for h in holders]
+                for number, holders in sorted(conflicts.items())
+            },
+            "components": [
+                [{"source": h.source, "id": h.id, "name": h.name, "numbers": sorted(h.numbers)} for h in members]
+                for members in components
+            ],
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON 저장: {args.json_path}")
+
+    print_cache_stats()
+    print_request_stats()
+
+
+if __name__ == "__main__":
+    main()
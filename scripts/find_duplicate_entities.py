@@ -0,0 +1,252 @@
+"""
+중복 인물 후보 탐지 스크립트 (account_entities + members).
+
+merge_duplicate_entities.js / merge_samename_v4.js 처럼 이름 하나로 묶지 않고,
+여러 blocking key 로 후보 블록을 만든 뒤 블록 내부 쌍만 점수화한다.
+
+blocking key:
+- 정규화 이름 (simple_name_key)
+- 전화번호 뒷자리 8자리 (phone / phone_secondary)
+- 생년월일 (숫자만)
+- 조합번호 (member_number)
+
+전체 쌍(O(n²))을 비교하지 않으므로 수만 건에서도 블록 크기에 비례하는 비용만 든다.
+
+members 와 그 member 로 만든 account_entities 행(accounting_domain_phase2_backfill.sql 의
+meta.source_member_id, membership_roles.source_member_id)은 같은 사람으로 이미 연결돼 있으므로 후보에서 뺀다.
+조회 전용이며, 병합은 기존 병합 스크립트로 검토 후 진행.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from itertools import combinations
+from typing import Any
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.normalize import as_text, simple_name_key  # noqa: E402
+from lib.queries import cached_rows, print_cache_stats  # noqa: E402
+from lib.supabase_client import print_request_stats  # noqa: E402
+
+PHONE_SUFFIX_LENGTH = 8
+# 한 블록이 이보다 크면(예: 흔한 이름, 공용 번호) 쌍 비교를 건너뛴다.
+MAX_BLOCK_SIZE = 200
+
+SCORE_WEIGHTS = {
+    "name": 0.4,
+    "phone": 0.3,
+    "birth_date": 0.3,
+    "member_number": 0.3,
+}
+BIRTH_DATE_MISMATCH_PENALTY = 0.4
+MEMBER_NUMBER_MISMATCH_PENALTY = 0.2
+
+
+@dataclass
+class Person:
+    source: str
+    id: str
+    name: str
+    name_key: str
+    phone_suffixes: set[str] = field(default_factory=set)
+    birth_date: str = ""
+    member_number: str = ""
+
+    @property
+    def key(self) -> str:
+        return f"{self.source}:{self.id}"
+
+
+@dataclass
+class Candidate:
+    left: Person
+    right: Person
+    score: float
+    reasons: list[str]
+
+
+def phone_suffix(value: Any) -> str:
+    digits = re.sub(r"\D", "", as_text(value))
+    if len(digits) < PHONE_SUFFIX_LENGTH:
+        return ""
+    return digits[-PHONE_SUFFIX_LENGTH:]
+
+
+def normalize_birth_date(value: Any) -> str:
+    digits = re.sub(r"\D", "", as_text(value))
+    return digits if len(digits) in (6, 8) else ""
+
+
+def to_person(source: str, row: dict[str, Any], name_field: str) -> Person:
+    meta = row.get("meta") if isinstance(row.get("meta"), dict) else {}
+    name = as_text(row.get(name_field))
+    phones = {phone_suffix(row.get("phone")), phone_suffix(row.get("phone_secondary"))}
+    return Person(
+        source=source,
+        id=str(row["id"]),
+        name=name,
+        name_key=simple_name_key(name),
+        phone_suffixes={p for p in phones if p},
+        birth_date=normalize_birth_date(row.get("birth_date") or meta.get("birth_date")),
+        member_number=as_text(row.get("member_number")),
+    )
+
+
+def linked_pairs(entities: list[dict[str, Any]], roles: list[dict[str, Any]]) -> set[frozenset[str]]:
+    """이미 연결된 (entity, member) 쌍: meta.source_member_id / membership_roles.source_member_id."""
+    links: set[frozenset[str]] = set()
+    for row in entities:
+        meta = row.get("meta") if isinstance(row.get("meta"), dict) else {}
+        member_id = as_text(meta.get("source_member_id"))
+        if member_id:
+            links.add(frozenset((f"entity:{row['id']}", f"member:{member_id}")))
+    for row in roles:
+        member_id = as_text(row.get("source_member_id"))
+        if member_id and row.get("entity_id"):
+            links.add(frozenset((f"entity:{row['entity_id']}", f"member:{member_id}")))
+    return links
+
+
+def blocking_keys(person: Person) -> set[tuple[str, str]]:
+    keys: set[tuple[str, str]] = set()
+    if person.name_key:
+        keys.add(("name", person.name_key))
+    for suffix in person.phone_suffixes:
+        keys.add(("phone", suffix))
+    if person.birth_date:
+        keys.add(("birth_date", person.birth_date[-6:]))
+    if person.member_number:
+        keys.add(("member_number", person.member_number))
+    return keys
+
+
+def score_pair(left: Person, right: Person) -> tuple[float, list[str]]:
+    score = 0.0
+    reasons: list[str] = []
+
+    if left.name_key and left.name_key == right.name_key:
+        score += SCORE_WEIGHTS["name"]
+        reasons.append("name")
+    if left.phone_suffixes & right.phone_suffixes:
+        score += SCORE_WEIGHTS["phone"]
+        reasons.append("phone")
+
+    if left.birth_date and right.birth_date:
+        if left.birth_date[-6:] == right.birth_date[-6:]:
+            score += SCORE_WEIGHTS["birth_date"]
+            reasons.append("birth_date")
+        else:
+            score -= BIRTH_DATE_MISMATCH_PENALTY
+            reasons.append("birth_date_mismatch")
+
+    if left.member_number and right.member_number:
+        if left.member_number == right.member_number:
+            score += SCORE_WEIGHTS["member_number"]
+            reasons.append("member_number")
+        else:
+            score -= MEMBER_NUMBER_MISMATCH_PENALTY
+            reasons.append("member_number_mismatch")
+
+    return round(score, 3), reasons
+
+
+def find_candidates(
+    people: list[Person], min_score: float, linked: set[frozenset[str]] | None = None
+) -> tuple[list[Candidate], dict[str, int]]:
+    blocks: dict[tuple[str, str], list[int]] = {}
+    for idx, person in enumerate(people):
+        for key in blocking_keys(person):
+            blocks.setdefault(key, []).append(idx)
+
+    stats = {"people": len(people), "blocks": 0, "skipped_large_blocks": 0, "pairs_scored": 0, "linked_pairs": 0}
+    seen_pairs: set[tuple[int, int]] = set()
+    candidates: list[Candidate] = []
+
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) > MAX_BLOCK_SIZE:
+            stats["skipped_large_blocks"] += 1
+            continue
+        stats["blocks"] += 1
+
+        for i, j in combinations(members, 2):
+            pair = (i, j) if i < j else (j, i)
+            if pair in seen_pairs:
+                continue
+            seen_pairs.add(pair)
+            left, right = people[pair[0]], people[pair[1]]
+            if linked and frozenset((left.key, right.key)) in linked:
+                stats["linked_pairs"] += 1
+                continue
+            stats["pairs_scored"] += 1
+
+            score, reasons = score_pair(left, right)
+            if score >= min_score:
+                candidates.append(Candidate(left=left, right=right, score=score, reasons=reasons))
+
+    candidates.sort(key=lambda c: (-c.score, c.left.name_key, c.left.id, c.right.id))
+    return candidates, stats
+
+
+def describe(person: Person) -> str:
+    return f"{person.name or '(이름없음)'}[{person.source}:{person.id[:8]}]"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="중복 인물 후보 탐지 (blocking key 기반)")
+    parser.add_argument("--min-score", type=float, default=0.5, help="출력 최소 점수 (기본 0.5)")
+    parser.add_argument("--limit", type=int, default=50, help="화면 출력 건수 (기본 50)")
+    parser.add_argument("--json", dest="json_path", help="후보 전체를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    entities = cached_rows(
+        "account_entities",
+        "id, display_name, phone, phone_secondary, member_number, birth_date, meta",
+    )
+    members = cached_rows("members")
+    roles = cached_rows("membership_roles", "entity_id, source_member_id")
+
+    people = [to_person("entity", row, "display_name") for row in entities]
+    people.extend(to_person("member", row, "name") for row in members)
+
+    candidates, stats = find_candidates(people, args.min_score, linked_pairs(entities, roles))
+
+    print("\n=== 중복 인물 후보 탐지 ===")
+    for key, value in stats.items():
+        print(f"{key}: {value}")
+    print(f"candidates: {len(candidates)}")
+
+    if candidates:
+        print(f"\n[병합 후보 상위 {min(args.limit, len(candidates))}건]")
+        for c in candidates[: args.limit]:
+            print(f"- {c.score:.2f} {describe(c.left)} <-> {describe(c.right)} ({', '.join(c.reasons)})")
+
+    if args.json_path:
+        payload = [
+            {
+                "score": c.score,
+                "reasons": c.reasons,
+                "left": {"source": c.left.source, "id": c.left.id, "name": c.left.name},
+                "right": {"source": c.right.source, "id": c.right.id, "name": c.right.name},
+            }
+            for c in candidates
+        ]
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON 저장: {args.json_path}")
+
+    print_cache_stats()
+    print_request_stats()
+
+
+if __name__ == "__main__":
+    main()
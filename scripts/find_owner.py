@@ -1,19 +1,33 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+"""
+certificate_registry 한 건과 보유자(account_entities.display_name) 조회.
 
-load_dotenv('.env.local')
+사용:
+    python scripts/find_owner.py [record_id]
+"""
 
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+from __future__ import annotations
 
-record_id = '2a845e72-8830-4bf9-9880-65bad530cdba'
+import argparse
+import json
 
-try:
-    # Select all columns to see entity_id
-    res = supabase.table('certificate_registry').select('*, account_entities(display_name)').eq('id', record_id).execute()
-    import json
-    print(json.dumps(res.data, indent=2, ensure_ascii=False))
-except Exception as e:
-    print(f"Error: {e}")
+from lib.supabase_client import get_client
+
+DEFAULT_RECORD_ID = '2a845e72-8830-4bf9-9880-65bad530cdba'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="권리증 보유자 조회")
+    parser.add_argument("record_id", nargs="?", default=DEFAULT_RECORD_ID, help="certificate_registry.id (기본 %(default)s)")
+    args = parser.parse_args()
+
+    supabase = get_client()
+    try:
+        # Select all columns to see entity_id
+        res = supabase.table('certificate_registry').select('*, account_entities(display_name)').eq('id', args.record_id).execute()
+        print(json.dumps(res.data, indent=2, ensure_ascii=False))
+    except Exception as e:
+        print(f"Error: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,429 @@
+"""
+성능 측정용 합성 데이터 생성 스크립트.
+
+실제 파일과 같은 컬럼 구성으로 아래를 만든다. (규모: --people 1,000 ~ 1,000,000)
+1) 최신주소(피플용).xlsx      - read_excel_rows 입력 ('최신 주소록' 시트, header=1, NO 1~116 메인 구간)
+2) 권리증_최종정리_완전판(이름순).xlsx - MigrationManager.process_main_file 입력 (필증NO_1..4 등)
+3) 권리증현황(보관및호환용).xlsx - MigrationManager.process_raw_file 입력 (다중 시트, 헤더 위치 제각각)
+4) fixture.json               - FakeSupabase 용 테이블 (members, relationships, legacy_records,
+                                account_entities, certificate_registry)
+
+이름에는 실제 데이터처럼 '별세', 'X', '?', 괄호 별칭, 줄바꿈 등 주석 노이즈를 섞는다.
+원본 .xls 는 쓰기 엔진(xlwt)이 더 이상 지원되지 않아 같은 시트 구성의 .xlsx 로 만든다.
+
+사용:
+    python scripts/generate_synthetic_data.py --people 10000 --out data/synthetic
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+import pandas as pd
+
+REGISTERED_COUNT = 116
+ADDRESS_BOOK_FILE = "최신주소(피플용).xlsx"
+ADDRESS_BOOK_SHEET = "최신 주소록"
+MAIN_FILE = "권리증_최종정리_완전판(이름순).xlsx"
+RAW_FILE = "권리증현황(보관및호환용).xlsx"
+FIXTURE_FILE = "fixture.json"
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄채원천방공현함변염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감호제"
+GIVEN_SYLLABLES = "민서준지현우진수영호성은하윤재정희동상경미연철석혜선숙자순옥명태광용기원종승훈규병남덕길숙분례점이"
+CITIES = ("서울시 강서구", "서울시 양천구", "경기도 부천시", "인천시 계양구", "경기도 김포시", "서울시 마포구")
+UNIT_GROUPS = ("59A", "59B", "74A", "84A", "84B")
+RAW_SHEETS = ("1차모집", "2차모집", "환불대장", "특별분양", "보관자료")
+NAME_HEADERS = ("성명", "회원성명", "이름", "성 명")
+
+ADDRESS_BOOK_COLUMNS = [
+    "NO", "조합원", "핸드폰번호", "핸드폰번호", "조합번호", "주소", "입주평형", "대리인",
+    "대리인 연락처 및 기타", "소송", "탈퇴", "변경신청", "기타", "25_정기총회", "27일 총회", "설문조사", "모임",
+]
+
+
+@dataclass
+class Person:
+    idx: int
+    name: str
+    raw_name: str
+    phone: str
+    phone_secondary: str
+    member_number: str
+    address: str
+    birth_date: str
+    unit_group: str
+    certificates: list[dict[str, str]] = field(default_factory=list)
+    proxy_name: str = ""
+    proxy_phone: str = ""
+    is_registered: bool = False
+    deceased: bool = False
+    member_id: str = ""
+    entity_id: str = ""
+
+
+def random_name(rng: random.Random, used: set[str]) -> str:
+    while True:
+        length = rng.choices((1, 2, 3), weights=(8, 85, 7))[0]
+        name = rng.choice(SURNAMES) + "".join(rng.choice(GIVEN_SYLLABLES) for _ in range(length))
+        # 실제 명부처럼 동명이인을 일부 허용
+        if name not in used or rng.random() < 0.02:
+            used.add(name)
+            return name
+
+
+def random_phone(rng: random.Random) -> str:
+    return f"010-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}"
+
+
+def random_cert_number(rng: random.Random) -> str:
+    year = rng.randint(2003, 2012)
+    if rng.random() < 0.04:
+        return f"{year}-특-{rng.randint(1, 300)}"
+    sep = rng.choices(("-", ".", "/"), weights=(90, 7, 3))[0]
+    return f"{year}{sep}{rng.randint(1, 12)}{sep}{rng.randint(1, 999)}"
+
+
+def noisy_name(rng: random.Random, person_name: str, alias_pool: list[str], deceased: bool) -> str:
+    text = person_name
+    roll = rng.random()
+    if deceased:
+        text = f"{text}(별세)"
+    elif roll < 0.05:
+        text = f"{text}X"
+    elif roll < 0.08 and alias_pool:
+        text = f"{text}({rng.choice(alias_pool)})"
+    elif roll < 0.10 and alias_pool:
+        text = f"{rng.choice(alias_pool)}X\n(없는사람)\n{text}"
+    elif roll < 0.12:
+        text = f"{text[0]} {text[1:]}"
+    elif roll < 0.13:
+        text = f"{text}?"
+    return text
+
+
+def generate_people(count: int, seed: int = 42) -> list[Person]:
+    rng = random.Random(seed)
+    used: set[str] = set()
+    people: list[Person] = []
+    base_birth = date(1935, 1, 1)
+
+    for idx in range(count):
+        name = random_name(rng, used)
+        deceased = rng.random() < 0.03
+        certs = []
+        for _ in range(rng.choices((0, 1, 2, 3, 4), weights=(25, 45, 18, 8, 4))[0]):
+            issued = base_birth + timedelta(days=rng.randint(24000, 28000))
+            certs.append(
+                {
+                    "no": random_cert_number(rng),
+                    "name": name,
+                    "date": issued.isoformat(),
+                    "price": str(rng.choice((30000000, 35000000, 40000000))),
+                }
+            )
+        person = Person(
+            idx=idx,
+            name=name,
+            raw_name=name,
+            phone=random_phone(rng) if rng.random() < 0.92 else "",
+            phone_secondary=random_phone(rng) if rng.random() < 0.15 else "",
+            member_number=f"{rng.randint(2003, 2012)}-{rng.randint(1, 12)}-{rng.randint(1, 999)}" if rng.random() < 0.6 else "",
+            address=f"{rng.choice(CITIES)} {rng.randint(1, 300)}길 {rng.randint(1, 99)} ({rng.randint(10000, 99999)})",
+            birth_date=(base_birth + timedelta(days=rng.randint(0, 18000))).isoformat(),
+            unit_group=rng.choice(UNIT_GROUPS),
+            certificates=certs,
+            is_registered=idx < REGISTERED_COUNT,
+            deceased=deceased,
+            member_id=str(uuid.UUID(int=rng.getrandbits(128))),
+            entity_id=str(uuid.UUID(int=rng.getrandbits(128))),
+        )
+        if rng.random() < 0.2:
+            person.proxy_name = random_name(rng, used)
+            person.proxy_phone = random_phone(rng)
+        people.append(person)
+
+    aliases = [p.name for p in people[: min(len(people), 500)]]
+    for person in people:
+        person.raw_name = noisy_name(rng, person.name, aliases, person.deceased)
+    return people
+
+
+def address_book_frame(people: list[Person], seed: int = 42) -> pd.DataFrame:
+    rng = random.Random(seed + 1)
+    rows: list[list[Any]] = []
+    for person in people:
+        no: Any = person.idx + 1 if person.is_registered else None
+        if not person.is_registered and rng.random() < 0.01:
+            rows.append(["번호", "조합원"] + [None] * (len(ADDRESS_BOOK_COLUMNS) - 2))
+        proxy_detail = f"{person.proxy_phone} 자녀" if person.proxy_name else None
+        rows.append(
+            [
+                no,
+                person.raw_name,
+                person.phone or None,
+                person.phone_secondary or None,
+                person.member_number or None,
+                person.address,
+                person.unit_group if person.is_registered else None,
+                person.proxy_name or None,
+                proxy_detail,
+                "진행" if rng.random() < 0.02 else None,
+                "신청" if rng.random() < 0.02 else None,
+                "탈퇴 문의" if rng.random() < 0.01 else None,
+                "우편물 반송" if rng.random() < 0.05 else None,
+                "참석" if rng.random() < 0.3 else None,
+                "위임" if rng.random() < 0.2 else None,
+                "응답" if rng.random() < 0.1 else None,
+                None,
+            ]
+        )
+    return pd.DataFrame(rows, columns=ADDRESS_BOOK_COLUMNS)
+
+
+def main_file_frame(people: list[Person]) -> pd.DataFrame:
+    records: list[dict[str, Any]] = []
+    for person in people:
+        if not person.certificates:
+            continue
+        row: dict[str, Any] = {"성명": person.name, "권리증수": len(person.certificates)}
+        contacts = [p for p in (person.phone, person.phone_secondary) if p]
+        for i in range(1, 5):
+            row[f"연락처_{i}"] = contacts[i - 1] if i <= len(contacts) else None
+        for i in range(1, 4):
+            row[f"주소_{i}"] = person.address if i == 1 else None
+        for i in range(1, 5):
+            cert = person.certificates[i - 1] if i <= len(person.certificates) else None
+            row[f"필증NO_{i}"] = cert["no"] if cert else None
+            row[f"필증성명_{i}"] = cert["name"] if cert else None
+            row[f"필증일자_{i}"] = pd.Timestamp(cert["date"]) if cert else None
+            row[f"가격_{i}"] = cert["price"] if cert else None
+        row["권리위임"] = "O" if person.proxy_name else None
+        row["서류제출"] = "O" if person.idx % 3 == 0 else None
+        row["모임참석"] = None
+        records.append(row)
+    return pd.DataFrame(records).sort_values("성명", kind="stable")
+
+
+def raw_sheet_frames(people: list[Person], seed: int = 42) -> dict[str, tuple[int, pd.DataFrame]]:
+    """시트명 -> (헤더 앞 제목행 수, DataFrame)."""
+    rng = random.Random(seed + 2)
+    sheets: dict[str, tuple[int, pd.DataFrame]] = {}
+    for sheet_idx, sheet in enumerate(RAW_SHEETS):
+        name_header = NAME_HEADERS[sheet_idx % len(NAME_HEADERS)]
+        rows: list[dict[str, Any]] = []
+        for person in people:
+            if rng.random() > 0.35:
+                continue
+            repeats = 2 if rng.random() < 0.03 else 1
+            for _ in range(repeats):
+                cert = rng.choice(person.certificates) if person.certificates else None
+                rows.append(
+                    {
+                        "순번": len(rows) + 1,
+                        name_header: person.raw_name.replace("\n", " ") if rng.random() < 0.1 else person.name,
+                        "연락처": person.phone or None,
+                        "주소": person.address,
+                        "권리증번호": cert["no"] if cert else None,
+                        "금액": int(cert["price"]) if cert else None,
+                        "일자": pd.Timestamp(cert["date"]) if cert else None,
+                        "비고": "X" if rng.random() < 0.02 else None,
+                    }
+                )
+        sheets[sheet] = (sheet_idx % 3, pd.DataFrame(rows))
+    return sheets
+
+
+def row_json(row: dict[str, Any]) -> dict[str, str]:
+    """MigrationManager._row_to_json 과 같은 규칙 (NaN 제외, 날짜는 YYYY-MM-DD, 나머지 str)."""
+    result: dict[str, str] = {}
+    for key, value in row.items():
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            continue
+        if isinstance(value, pd.Timestamp):
+            result[key] = value.strftime("%Y-%m-%d")
+        else:
+            result[key] = str(value)
+    return result
+
+
+def fixture_tables(
+    people: list[Person],
+    main_df: pd.DataFrame,
+    raw_sheets: dict[str, tuple[int, pd.DataFrame]],
+) -> dict[str, list[dict[str, Any]]]:
+    by_name = {p.name: p for p in people}
+    members: list[dict[str, Any]] = []
+    entities: list[dict[str, Any]] = []
+    registry: list[dict[str, Any]] = []
+    relationships: list[dict[str, Any]] = []
+    legacy: dict[str, dict[str, Any]] = {}
+
+    for person in people:
+        if person.is_registered or person.idx % 2 == 0:
+            members.append(
+                {
+                    "id": person.member_id,
+                    "name": person.name,
+                    "phone": person.phone or "미입력",
+                    "member_number": person.member_number,
+                    "tier": "1차" if person.is_registered else "예비",
+                    "is_registered": person.is_registered,
+                    "status": "정상",
+                    "memo": "",
+                    "unit_group": person.unit_group if person.is_registered else "",
+                    "address_legal": person.address,
+                    "address_mailing": person.address,
+                    "birth_date": person.birth_date,
+                }
+            )
+            if person.proxy_name and person.idx % 4 == 0:
+                relationships.append(
+                    {
+                        "id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"rel-{person.idx}")),
+                        "member_id": person.member_id,
+                        "name": person.proxy_name,
+                        "phone": person.proxy_phone,
+                        "relation": "자녀",
+                        "note": "",
+                    }
+                )
+        entities.append(
+            {
+                "id": person.entity_id,
+                "display_name": person.name,
+                "phone": person.phone or None,
+                "phone_secondary": person.phone_secondary or None,
+                "member_number": person.member_number or None,
+                "birth_date": person.birth_date,
+                "meta": {},
+            }
+        )
+        for cert in person.certificates:
+            registry.append(
+                {
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"cert-{person.idx}-{cert['no']}")),
+                    "entity_id": person.entity_id,
+                    "certificate_number_raw": cert["no"],
+                    "certificate_number_normalized": cert["no"].replace(".", "-").replace("/", "-"),
+                    "certificate_status": "confirmed",
+                    "is_confirmed_for_count": True,
+                    "is_active": True,
+                }
+            )
+
+    for row in main_df.to_dict("records"):
+        person = by_name[row["성명"]]
+        legacy[person.name] = {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"legacy-{person.idx}")),
+            "original_name": person.name,
+            "rights_count": len(person.certificates),
+            "contacts": [p for p in (person.phone, person.phone_secondary) if p],
+            "addresses": [person.address],
+            "certificates": person.certificates,
+            "status_flags": {},
+            "raw_data": {"MainSource": row_json(row)},
+            "source_file": "권리증_최종정리_완전판",
+            "is_refunded": not person.is_registered,
+            "member_id": person.member_id if person.is_registered else None,
+            "birth_date": person.birth_date,
+            "memo": None,
+        }
+
+    for sheet, (_, df) in raw_sheets.items():
+        name_col = next(c for c in df.columns if c in NAME_HEADERS)
+        for row in df.to_dict("records"):
+            name = str(row[name_col]).strip().replace(" ", "")
+            record = legacy.setdefault(
+                name,
+                {
+                    "id": str(uuid.uuid5(uuid.NAMESPACE_OID, f"legacy-raw-{name}")),
+                    "original_name": name,
+                    "rights_count": 0,
+                    "certificates": [],
+                    "raw_data": {},
+                    "is_refunded": True,
+                    "member_id": None,
+                },
+            )
+            converted = row_json(row)
+            existing = record["raw_data"].get(sheet)
+            if existing is None:
+                record["raw_data"][sheet] = converted
+            elif isinstance(existing, list):
+                existing.append(converted)
+            else:
+                record["raw_data"][sheet] = [existing, converted]
+
+    return {
+        "members": members,
+        "relationships": relationships,
+        "legacy_records": list(legacy.values()),
+        "account_entities": entities,
+        "certificate_registry": registry,
+    }
+
+
+def write_address_book(path: str, df: pd.DataFrame) -> None:
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        df.to_excel(writer, sheet_name=ADDRESS_BOOK_SHEET, startrow=1, index=False)
+        writer.sheets[ADDRESS_BOOK_SHEET].cell(row=1, column=1, value="최신 주소록 (합성 데이터)")
+
+
+def write_raw_workbook(path: str, sheets: dict[str, tuple[int, pd.DataFrame]]) -> None:
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for sheet, (title_rows, df) in sheets.items():
+            df.to_excel(writer, sheet_name=sheet, startrow=title_rows, index=False)
+            for i in range(title_rows):
+                writer.sheets[sheet].cell(row=i + 1, column=1, value=f"{sheet} 현황 ({i + 1})")
+
+
+def generate(out_dir: str, people_count: int, seed: int, write_excel: bool = True) -> dict[str, str]:
+    if people_count < REGISTERED_COUNT:
+        raise ValueError(f"--people 는 최소 {REGISTERED_COUNT} 이상이어야 합니다.")
+    os.makedirs(out_dir, exist_ok=True)
+
+    people = generate_people(people_count, seed)
+    address_df = address_book_frame(people, seed)
+    main_df = main_file_frame(people)
+    raw_sheets = raw_sheet_frames(people, seed)
+
+    paths = {
+        "address_book": os.path.join(out_dir, ADDRESS_BOOK_FILE),
+        "main_file": os.path.join(out_dir, MAIN_FILE),
+        "raw_file": os.path.join(out_dir, RAW_FILE),
+        "fixture": os.path.join(out_dir, FIXTURE_FILE),
+    }
+    if write_excel:
+        write_address_book(paths["address_book"], address_df)
+        main_df.to_excel(paths["main_file"], index=False)
+        write_raw_workbook(paths["raw_file"], raw_sheets)
+
+    with open(paths["fixture"], "w", encoding="utf-8") as f:
+        json.dump(fixture_tables(people, main_df, raw_sheets), f, ensure_ascii=False)
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="성능 측정용 합성 명부/권리증 데이터 생성")
+    parser.add_argument("--people", type=int, default=1000, help="생성할 인원 수 (기본 1000)")
+    parser.add_argument("--out", default="data/synthetic", help="출력 디렉터리 (기본 data/synthetic)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본 42)")
+    parser.add_argument("--no-excel", action="store_true", help="엑셀은 만들지 않고 fixture.json 만 생성")
+    args = parser.parse_args()
+
+    paths = generate(args.out, args.people, args.seed, write_excel=not args.no_excel)
+    print(f"\n=== 합성 데이터 생성 완료 ({args.people:,}명, seed={args.seed}) ===")
+    for key, path in paths.items():
+        if os.path.exists(path):
+            print(f"- {key}: {path} ({os.path.getsize(path):,}B)")
+
+
+if __name__ == "__main__":
+    main()
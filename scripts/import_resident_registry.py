@@ -0,0 +1,352 @@
+"""
+주민등록번호 엑셀 -> secure_resident_registry / secure_resident_registry_history 일괄 반영.
+
+src/lib/server/residentRegistryImport.ts 의 대량 처리용이지만 동작이 같지는 않다:
+- 매칭 대상이 등기조합원(is_registered)만이 아니라 account_entities 전체다
+- 한 entity 에 두 행이 매칭되면 entity_already_matched 로 둔다 (TS 에는 없는 상태)
+- entity_private_info 는 갱신하지 않으므로 synced_to_private_info_at 도 채우지 않는다.
+  앱 화면의 주민등록번호까지 맞추려면 웹의 가져오기 기능을 쓴다
+
+1) 엑셀을 한 번만 읽어 (성명/이름, 주민등록번호) 행 목록을 만든다
+2) account_entities 를 한 번 내려받아 sync 스크립트와 같은 이름 색인
+   (lib.normalize 의 normalize_name_key / simple_name_key)으로 source_name 을 매칭한다
+3) 배치(batch_id) 단위로 history / registry 행을 chunk 크기만큼 묶어 upsert 한다
+   - history id 는 (batch_id, 행 번호, entity_id) 로 정해지므로 재실행/--resume 해도 중복되지 않는다
+   - batch_id 는 기본적으로 파일 내용으로 정해진다 (같은 파일 = 같은 배치)
+4) match_status 별 건수와 단계별 시간을 출력한다
+
+match_status:
+- matched: 이름이 account_entities 한 명과 일치
+- duplicate_source_name: 엑셀에 같은 이름이 여러 행
+- duplicate_member_name: 같은 이름의 account_entities 가 여러 명
+- member_not_found: 일치하는 account_entities 없음
+- entity_already_matched: 다른 행이 이미 같은 entity 로 매칭됨
+
+기본은 Dry-run이며, 실제 반영은 --apply 옵션 사용. 주민등록번호는 화면에 마스킹해서만 출력한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.checkpoint import Journal, default_journal_path  # noqa: E402
+from lib.instrumentation import Instrumentation  # noqa: E402
+from lib.normalize import as_text, normalize_name_key, simple_name_key  # noqa: E402
+from lib.profiling import add_profile_arguments, profile_from_args  # noqa: E402
+from lib.queries import fetch_all_rows  # noqa: E402
+from lib.supabase_client import get_client, print_request_stats  # noqa: E402
+
+DEFAULT_FILE = os.environ.get("RESIDENT_REGISTRY_IMPORT_PATH", "data/주민등록번호.xlsx")
+NAME_COLUMNS = ("성명", "이름")
+RRN_COLUMN = "주민등록번호"
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_ACTOR = "scripts/import_resident_registry.py"
+REGISTRY_TABLE = "secure_resident_registry"
+HISTORY_TABLE = "secure_resident_registry_history"
+MATCH_STATUSES = (
+    "matched",
+    "duplicate_source_name",
+    "duplicate_member_name",
+    "member_not_found",
+    "entity_already_matched",
+)
+
+
+@dataclass
+class ResidentRow:
+    row_number: int
+    source_name: str
+    normalized_name: str
+    resident_registration_number: str
+
+
+@dataclass
+class MatchResult:
+    row: ResidentRow
+    status: str
+    entity: dict[str, Any] | None = None
+    candidates: list[str] = field(default_factory=list)
+
+
+def format_rrn(value: Any) -> str:
+    raw = as_text(value)
+    digits = re.sub(r"\D", "", raw)
+    if len(digits) == 13:
+        return f"{digits[:6]}-{digits[6:]}"
+    return raw
+
+
+def mask_rrn(value: str) -> str:
+    return f"{value[:8]}******" if len(value) >= 8 else value
+
+
+def read_registry_rows(path: str, sheet: str | None = None) -> list[ResidentRow]:
+    if not os.path.exists(path):
+        raise RuntimeError(f"주민등록번호 파일을 찾을 수 없습니다: {path}")
+    # 앞자리 0 이 사라지지 않도록 문자열로 읽는다
+    df = pd.read_excel(path, sheet_name=sheet if sheet else 0, dtype=str)
+    name_column = next((c for c in NAME_COLUMNS if c in df.columns), None)
+    if name_column is None or RRN_COLUMN not in df.columns:
+        raise RuntimeError(f"'{'/'.join(NAME_COLUMNS)}' 또는 '{RRN_COLUMN}' 컬럼이 없습니다: {list(df.columns)}")
+
+    rows: list[ResidentRow] = []
+    # 헤더가 1행이므로 엑셀 행 번호는 index + 2
+    for index, (name, rrn) in enumerate(zip(df[name_column].tolist(), df[RRN_COLUMN].tolist())):
+        source_name = as_text(name)
+        number = format_rrn(rrn)
+        if source_name and number:
+            rows.append(ResidentRow(index + 2, source_name, simple_name_key(source_name), number))
+    return rows
+
+
+def build_entity_indexes(entities: list[dict[str, Any]]) -> dict[str, dict[str, list[dict[str, Any]]]]:
+    by_exact: dict[str, list[dict[str, Any]]] = {}
+    by_simple: dict[str, list[dict[str, Any]]] = {}
+    for entity in entities:
+        name = as_text(entity.get("display_name"))
+        exact = normalize_name_key(name)
+        simple = simple_name_key(name)
+        if exact:
+            by_exact.setdefault(exact, []).append(entity)
+        if simple:
+            by_simple.setdefault(simple, []).append(entity)
+    return {"by_exact": by_exact, "by_simple": by_simple}
+
+
+def match_rows(rows: list[ResidentRow], indexes: dict[str, dict[str, list[dict[str, Any]]]]) -> list[MatchResult]:
+    source_counts = Counter(row.normalized_name for row in rows)
+    claimed: set[str] = set()
+    results: list[MatchResult] = []
+
+    for row in rows:
+        if source_counts[row.normalized_name] > 1:
+            results.append(MatchResult(row, "duplicate_source_name"))
+            continue
+
+        candidates = indexes["by_exact"].get(normalize_name_key(row.source_name)) or indexes["by_simple"].get(
+            row.normalized_name, []
+        )
+        candidate_ids = sorted({str(c["id"]) for c in candidates})
+        if not candidate_ids:
+            results.append(MatchResult(row, "member_not_found"))
+        elif len(candidate_ids) > 1:
+            results.append(MatchResult(row, "duplicate_member_name", candidates=candidate_ids))
+        elif candidate_ids[0] in claimed:
+            results.append(MatchResult(row, "entity_already_matched", candidates=candidate_ids))
+        else:
+            claimed.add(candidate_ids[0])
+            results.append(MatchResult(row, "matched", candidates[0], candidate_ids))
+    return results
+
+
+def file_batch_id(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"resident-registry:{digest.hexdigest()}"))
+
+
+def batch_id_arg(value: str) -> str:
+    """--batch-id 검증 (batch_id 컬럼은 UUID)."""
+    try:
+        return str(uuid.UUID(value))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"UUID 형식이 아닙니다: {value}") from None
+
+
+def build_payloads(
+    results: list[MatchResult],
+    batch_id: str,
+    file_name: str,
+    imported_by: str | None,
+    imported_at: str,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    history: list[dict[str, Any]] = []
+    registry: list[dict[str, Any]] = []
+    batch_uuid = uuid.UUID(batch_id)
+
+    for result in results:
+        row = result.row
+        entity_id = str(result.entity["id"]) if result.entity else None
+        history.append(
+            {
+                "id": str(uuid.uuid5(batch_uuid, f"{row.row_number}:{entity_id or ''}")),
+                "batch_id": batch_id,
+                "entity_id": entity_id,
+                "source_name": row.source_name,
+                "normalized_name": row.normalized_name,
+                "resident_registration_number": row.resident_registration_number,
+                "source_file_name": file_name,
+                "source_row_number": row.row_number,
+                "match_status": result.status,
+                "matched_entity_name": as_text(result.entity.get("display_name")) if result.entity else None,
+                "imported_by_email": imported_by,
+                "note": {"target_entity_ids": result.candidates},
+            }
+        )
+        if result.entity is None:
+            continue
+        registry.append(
+            {
+                "entity_id": entity_id,
+                "resident_registration_number": row.resident_registration_number,
+                "source_name": row.source_name,
+                "source_file_name": file_name,
+                "source_row_number": row.row_number,
+                "batch_id": batch_id,
+                "imported_by_email": imported_by,
+                "imported_at": imported_at,
+                "last_verified_at": imported_at,
+                "note": {"unified_name": as_text(result.entity.get("display_name"))},
+            }
+        )
+    return history, registry
+
+
+def upsert_chunks(
+    supabase: Any,
+    table: str,
+    rows: list[dict[str, Any]],
+    on_conflict: str,
+    chunk_size: int,
+    journal: Journal,
+    batch_id: str,
+) -> tuple[int, int]:
+    """(반영 행 수, 실패 행 수). 완료한 chunk 는 저널에 기록해 --resume 시 건너뛴다."""
+    written = failed = 0
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        key = f"{table}:{batch_id}:{start // chunk_size}"
+        if journal.done(key):
+            continue
+        try:
+            supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+            journal.mark(key)
+            written += len(chunk)
+            print(f"  {table}: {start + len(chunk)} / {len(rows)}")
+        except Exception as e:
+            failed += len(chunk)
+            print(f"  ❌ {table} chunk {start // chunk_size}: {e}")
+    return written, failed
+
+
+def run_import(args: argparse.Namespace, dry_run: bool, journal: Journal, metrics: Instrumentation) -> None:
+    supabase = get_client()
+
+    with metrics.phase("excel_parse"):
+        rows = read_registry_rows(args.file, args.sheet)
+    print(f"엑셀 행: {len(rows)}건 ({args.file})")
+
+    with metrics.phase("download"):
+        entities = fetch_all_rows(supabase, "account_entities", "id, display_name")
+    print(f"account_entities: {len(entities)}명")
+
+    with metrics.phase("match"):
+        indexes = build_entity_indexes(entities)
+        results = match_rows(rows, indexes)
+
+    status_counts = Counter(result.status for result in results)
+    metrics.update_counters({f"status.{status}": status_counts.get(status, 0) for status in MATCH_STATUSES})
+
+    batch_id = args.batch_id or file_batch_id(args.file)
+    imported_at = datetime.now(timezone.utc).isoformat()
+    history, registry = build_payloads(results, batch_id, os.path.basename(args.file), args.imported_by, imported_at)
+
+    print(f"\n[매칭 결과] batch_id={batch_id}")
+    for status in MATCH_STATUSES:
+        print(f"- {status}: {status_counts.get(status, 0)}건")
+
+    unmatched = [r for r in results if r.status != "matched"]
+    if unmatched:
+        print("\n[미매칭 샘플 15건]")
+        for result in unmatched[:15]:
+            row = result.row
+            print(
+                f"- {row.row_number}행 {row.source_name} ({mask_rrn(row.resident_registration_number)}): "
+                f"{result.status} {', '.join(result.candidates)}"
+            )
+
+    if dry_run:
+        print(f"\nDry-run: history {len(history)}건, registry {len(registry)}건 반영 예정 (--apply 로 실행)")
+    else:
+        # history 를 먼저 남겨야 registry 반영이 실패해도 어떤 배치였는지 추적할 수 있다
+        with metrics.phase("history_writes"):
+            history_written, history_failed = upsert_chunks(
+                supabase, HISTORY_TABLE, history, "id", args.chunk_size, journal, batch_id
+            )
+        with metrics.phase("registry_writes"):
+            registry_written, registry_failed = upsert_chunks(
+                supabase, REGISTRY_TABLE, registry, "entity_id", args.chunk_size, journal, batch_id
+            )
+        if journal.skipped:
+            print(f"  재개: 완료된 chunk {journal.skipped}개 건너뜀")
+        metrics.update_counters(
+            {
+                "history_written": history_written,
+                "history_failed": history_failed,
+                "registry_written": registry_written,
+                "registry_failed": registry_failed,
+            }
+        )
+        supabase.table("system_audit_logs").insert(
+            {
+                "actor_email": args.imported_by or DEFAULT_ACTOR,
+                "action_type": "BULK_IMPORT_RESIDENT_REGISTRY",
+                "details": {
+                    "batch_id": batch_id,
+                    "file_name": os.path.basename(args.file),
+                    "history_rows": history_written,
+                    "registry_rows": registry_written,
+                    **{f"{status}_rows": status_counts.get(status, 0) for status in MATCH_STATUSES},
+                },
+            }
+        ).execute()
+        print(f"\n반영 완료: history {history_written}건, registry {registry_written}건")
+
+    print_request_stats()
+    metrics.print_report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="주민등록번호 엑셀 -> secure_resident_registry 일괄 반영")
+    parser.add_argument("--file", default=DEFAULT_FILE, help=f"엑셀 경로 (기본 {DEFAULT_FILE}, RESIDENT_REGISTRY_IMPORT_PATH)")
+    parser.add_argument("--sheet", help="시트 이름 (기본: 첫 시트)")
+    parser.add_argument("--apply", action="store_true", help="실제 DB 반영")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"upsert 1회당 행 수 (기본 {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--batch-id", type=batch_id_arg, help="batch_id(UUID) 지정 (기본: 파일 내용으로 결정)")
+    parser.add_argument("--imported-by", help="imported_by_email 에 기록할 이메일")
+    parser.add_argument("--resume", action="store_true", help="저널에 기록된 완료 chunk 는 건너뛰고 이어서 반영")
+    parser.add_argument("--journal", default=default_journal_path("import_resident_registry"), help="작업 저널 경로")
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    dry_run = not args.apply
+    journal = Journal(args.journal, resume=args.resume) if not dry_run else Journal.disabled()
+    metrics = Instrumentation("import_resident_registry")
+    try:
+        with profile_from_args(args):
+            run_import(args, dry_run, journal, metrics)
+    finally:
+        journal.close()
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""scripts/ 공용 모듈."""
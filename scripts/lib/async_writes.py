@@ -0,0 +1,271 @@
+"""
+행마다 payload 가 다른 update 를 asyncio 로 병렬 전송하는 실행기.
+
+PostgREST 는 서로 다른 body 의 update 를 한 요청으로 묶을 수 없으므로
+`.update(payload).eq("id", ...)` 요청을 semaphore 로 동시성을 제한해 보낸다.
+429 / 5xx / 네트워크 오류는 지수 backoff 로 재시도한다.
+status 는 예외가 아니라 httpx 응답 hook 이 기록한 값으로 판단한다.
+(postgrest 의 APIError 는 JSON 본문이면 code 에 PGRST000 같은 PostgREST 코드만 담는다)
+
+공용 클라이언트(get_client)의 httpx 풀을 그대로 쓰기 위해 요청 자체는 전용 스레드 풀에서 실행한다.
+
+낙관적 동시성(run_guarded_updates):
+- UpdateOp.expected 에 읽을 때의 updated_at 을 넣으면 `.eq("updated_at", ...)` 조건이 붙어,
+  그 사이 웹에서 고친 행은 0건 update 가 되고 conflict 로 돌아온다
+- conflict 행만 다시 읽어, 보내려는 컬럼이 읽을 때 값(base) 그대로면(다른 컬럼만 바뀐 경우)
+  새 updated_at 으로 다시 보내고, 같은 컬럼이 바뀌었으면 덮어쓰지 않고 conflict 로 보고한다
+- payload 가 다른 컬럼에서 계산한 값이면(예: certificates -> rights_count) 그 컬럼들의 읽을 때 값을
+  sources 에 넣는다. sources 가 바뀌었으면 payload 가 이미 틀린 값이므로 재시도하지 않고 conflict 로 보고한다
+- updated_at 컬럼은 sync_updated_at_columns.sql 로 만든다. 컬럼이 없으면 조건 없이 기존처럼 쓴다
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable
+
+from lib.supabase_client import request_stats
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+BASE_BACKOFF_SECONDS = 0.5
+MAX_BACKOFF_SECONDS = 8.0
+VERSION_COLUMN = "updated_at"
+DEFAULT_CONFLICT_ROUNDS = 2
+REFETCH_CHUNK_SIZE = 200
+
+
+@dataclass
+class UpdateOp:
+    table: str
+    row_id: str
+    payload: dict[str, Any]
+    label: str = ""
+    match_column: str = "id"
+    key: str = ""
+    # 낙관적 동시성: expected 는 update 조건(예: {"updated_at": 읽은 값}),
+    # base 는 payload 컬럼들의 읽을 때 값, sources 는 payload 를 계산할 때 읽은 다른 컬럼들의 값
+    # (conflict 후 선택적 재시도 판단용)
+    expected: dict[str, Any] = field(default_factory=dict)
+    base: dict[str, Any] = field(default_factory=dict)
+    sources: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def journal_key(self) -> str:
+        return self.key or f"{self.table}:{self.row_id}"
+
+
+@dataclass
+class UpdateResult:
+    op: UpdateOp
+    ok: bool
+    attempts: int
+    error: str = ""
+    data: list[dict[str, Any]] = field(default_factory=list)
+    conflict: bool = False
+
+
+def precondition(row: dict[str, Any], column: str = VERSION_COLUMN) -> dict[str, Any]:
+    """읽은 행의 버전 컬럼으로 만든 update 조건. 컬럼이 없으면 빈 조건 (기존처럼 무조건 쓰기)."""
+    value = row.get(column)
+    return {column: value} if value is not None else {}
+
+
+def supports_preconditions(client: Any, table: str, column: str = VERSION_COLUMN) -> bool:
+    """테이블에 버전 컬럼이 있는지 1건 조회로 확인."""
+    try:
+        client.table(table).select(column).limit(1).execute()
+    except Exception:  # noqa: BLE001 - 컬럼이 없으면 PostgREST 가 400 을 돌려준다
+        return False
+    return True
+
+
+def response_status(exc: BaseException) -> int | None:
+    """예외에 붙은 HTTP status. postgrest 의 APIError 는 JSON 본문이면 code 가 PGRST/SQLSTATE 코드라 None."""
+    status: Any = None
+    response = getattr(exc, "response", None)
+    if response is not None:
+        status = getattr(response, "status_code", None)
+    if status is None:
+        status = getattr(exc, "code", None)
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+
+def retryable_status(exc: BaseException, status: int | None = None) -> bool:
+    """status 는 httpx 응답 hook 이 기록한 실제 HTTP status (request_stats.last_status)."""
+    if status is None:
+        status = response_status(exc)
+    if status is not None:
+        return status == 429 or 500 <= status < 600
+    import httpx
+
+    return isinstance(exc, (httpx.TransportError, httpx.TimeoutException))
+
+
+def backoff_delay(attempt: int) -> float:
+    delay = min(MAX_BACKOFF_SECONDS, BASE_BACKOFF_SECONDS * (2 ** (attempt - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+
+def execute_update(client: Any, op: UpdateOp) -> list[dict[str, Any]]:
+    query = client.table(op.table).update(op.payload).eq(op.match_column, op.row_id)
+    for column, value in op.expected.items():
+        query = query.eq(column, value)
+    result = query.execute()
+    return result.data or []
+
+
+def run_with_retry(client: Any, op: UpdateOp, max_retries: int) -> UpdateResult:
+    attempt = 0
+    while True:
+        attempt += 1
+        request_stats.clear_last_status()
+        try:
+            data = execute_update(client, op)
+            if op.expected and not data:
+                return UpdateResult(op=op, ok=False, attempts=attempt, error="다른 곳에서 먼저 수정됨", conflict=True)
+            return UpdateResult(op=op, ok=True, attempts=attempt, data=data)
+        except Exception as exc:  # noqa: BLE001 - 실패는 결과로 보고
+            if attempt > max_retries or not retryable_status(exc, request_stats.last_status()):
+                return UpdateResult(op=op, ok=False, attempts=attempt, error=str(exc))
+            request_stats.record_retry(op.table)
+            time.sleep(backoff_delay(attempt))
+
+
+async def run_updates_async(
+    client: Any,
+    ops: list[UpdateOp],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    on_result: Callable[[UpdateResult], None] | None = None,
+) -> list[UpdateResult]:
+    if not ops:
+        return []
+    concurrency = max(1, concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    # 같은 행에 대한 update 는 입력 순서대로 적용되도록 행 단위로 직렬화
+    row_locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="postgrest-write") as executor:
+
+        async def run_one(op: UpdateOp) -> UpdateResult:
+            row_lock = row_locks.setdefault((op.table, op.row_id), asyncio.Lock())
+            async with row_lock, semaphore:
+                result = await loop.run_in_executor(executor, run_with_retry, client, op, max_retries)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        return list(await asyncio.gather(*(run_one(op) for op in ops)))
+
+
+def run_updates(
+    client: Any,
+    ops: list[UpdateOp],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    on_result: Callable[[UpdateResult], None] | None = None,
+) -> list[UpdateResult]:
+    """ops 순서대로 결과를 돌려준다. concurrency=1 이면 기존처럼 한 건씩 순차 전송.
+
+    on_result 는 각 요청이 끝나는 즉시(이벤트 루프 스레드에서) 호출된다.
+    """
+    return asyncio.run(run_updates_async(client, ops, concurrency, max_retries, on_result))
+
+
+def refetch_rows(client: Any, table: str, row_ids: list[str], columns: set[str]) -> dict[str, dict[str, Any]]:
+    select = ", ".join(["id", *sorted(columns - {"id"})])
+    rows: dict[str, dict[str, Any]] = {}
+    for start in range(0, len(row_ids), REFETCH_CHUNK_SIZE):
+        chunk = row_ids[start : start + REFETCH_CHUNK_SIZE]
+        for row in client.table(table).select(select).in_("id", chunk).execute().data or []:
+            rows[str(row["id"])] = row
+    return rows
+
+
+def rebase_conflicts(client: Any, conflicts: list[UpdateResult]) -> list[UpdateOp | UpdateResult]:
+    """conflict 난 op 마다 현재 행과 비교해 다시 보낼 op 또는 확정 결과를 (입력 순서대로) 돌려준다.
+
+    - sources 컬럼이 바뀌었으면 payload 를 다시 계산해야 하므로 conflict 로 남긴다
+    - 현재 값이 이미 payload 와 같으면 성공으로 본다 (쓸 필요 없음)
+    - payload 컬럼이 base 그대로면 다른 컬럼만 바뀐 것이므로 새 버전 조건으로 다시 보낸다
+    - 그 밖(같은 컬럼을 다른 값으로 고쳤거나 행이 사라짐)은 conflict 로 남긴다
+    """
+    current: dict[str, dict[str, dict[str, Any]]] = {}
+    for table in {r.op.table for r in conflicts}:
+        results = [r for r in conflicts if r.op.table == table]
+        columns: set[str] = set()
+        for result in results:
+            columns.update(result.op.payload, result.op.expected, result.op.sources)
+        current[table] = refetch_rows(client, table, [str(r.op.row_id) for r in results], columns)
+
+    outcomes: list[UpdateOp | UpdateResult] = []
+    for result in conflicts:
+        op = result.op
+        row = current[op.table].get(str(op.row_id))
+        if row is None or any(row.get(c) != v for c, v in op.sources.items()):
+            outcomes.append(result)
+        elif all(row.get(c) == v for c, v in op.payload.items()):
+            outcomes.append(UpdateResult(op=op, ok=True, attempts=result.attempts, data=[row]))
+        elif op.base and all(row.get(c) == op.base.get(c) for c in op.payload):
+            expected = {column: row.get(column) for column in op.expected}
+            outcomes.append(replace(op, expected=expected))
+        else:
+            outcomes.append(result)
+    return outcomes
+
+
+def run_guarded_updates(
+    client: Any,
+    ops: list[UpdateOp],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    on_result: Callable[[UpdateResult], None] | None = None,
+    conflict_rounds: int = DEFAULT_CONFLICT_ROUNDS,
+) -> list[UpdateResult]:
+    """run_updates + conflict 난 행만 선택적으로 재시도. 결과는 ops 순서대로."""
+    results = run_updates(client, ops, concurrency, max_retries, on_result)
+
+    for _ in range(conflict_rounds):
+        pending = [index for index, result in enumerate(results) if result.conflict]
+        if not pending:
+            break
+        retry: list[tuple[int, UpdateOp]] = []
+        for index, outcome in zip(pending, rebase_conflicts(client, [results[i] for i in pending])):
+            if isinstance(outcome, UpdateOp):
+                retry.append((index, outcome))
+            elif outcome is not results[index]:
+                results[index] = outcome
+                if on_result is not None:
+                    on_result(outcome)
+        if not retry:
+            break
+        retried = run_updates(client, [op for _, op in retry], concurrency, max_retries, on_result)
+        for (index, _), result in zip(retry, retried):
+            results[index] = result
+    return results
+
+
+def print_failures(results: list[UpdateResult], limit: int = 20) -> None:
+    conflicts = [r for r in results if r.conflict]
+    failures = [r for r in results if not r.ok and not r.conflict]
+    if conflicts:
+        print(f"\n[충돌] 동기화 중 다른 곳에서 보낼 컬럼이나 그 원본 컬럼을 고친 행 {len(conflicts)}건 (덮어쓰지 않음)")
+        for r in conflicts[:limit]:
+            label = r.op.label or r.op.row_id
+            print(f"- {r.op.table} {label} ({r.op.row_id}): {', '.join(sorted(r.op.payload))}")
+    if not failures:
+        return
+    print(f"\n[실패] update {len(failures)}건")
+    for r in failures[:limit]:
+        label = r.op.label or r.op.row_id
+        print(f"- {r.op.table} {label} ({r.op.row_id}) / 시도 {r.attempts}회: {r.error}")
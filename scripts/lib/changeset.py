@@ -0,0 +1,342 @@
+"""
+동기화 스크립트의 변경분(changeset) 도구.
+
+- diff_payload: 계산한 payload 를 이미 내려받은 DB 행과 비교해 바뀐 컬럼만 남긴다.
+  정기 재동기화에서는 대부분 DB 값과 같으므로, 바뀐 것이 없으면 요청 자체를 만들지 않는다.
+- Changeset: dry-run 에서 나온 변경분을 NDJSON 계획 파일로 저장/로드한다.
+  첫 줄은 header(스크립트 이름, 원본 상태 fingerprint), 이후 한 줄에 변경 하나
+  {"table", "action", "key", "old", "new", "sources", "label"}.
+  sources 는 new 를 계산할 때 읽은 다른 컬럼 값 (예: rights_count 의 raw_data / certificates).
+- apply_changeset: --apply-plan 실행. 엑셀 파싱/전체 다운로드/매칭을 다시 하지 않고
+  fingerprint(파일 해시 + 테이블 건수)와 대상 행의 old 값만 확인한 뒤 변경분을 그대로 보낸다.
+  old / sources 값이 달라진 행(계획 이후 누가 고친 행)은 보내지 않고 stale 로 보고한다.
+  확인할 때 읽은 updated_at 을 update 조건으로 붙여, 확인과 쓰기 사이의 수정도 덮어쓰지 않는다.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from lib.async_writes import (
+    VERSION_COLUMN,
+    UpdateOp,
+    UpdateResult,
+    run_guarded_updates,
+    supports_preconditions,
+)
+from lib.checkpoint import Journal
+from lib.export_writers import ensure_parent
+
+PLAN_VERSION = 2
+DEFAULT_PLAN_DIR = "data/plans"
+VERIFY_CHUNK_SIZE = 200
+INSERT_CHUNK_SIZE = 500
+
+Row = dict[str, Any]
+
+
+def diff_payload(current: dict[str, Any] | None, payload: dict[str, Any]) -> dict[str, Any]:
+    """payload 중 current 행과 값이 다른 컬럼만. current 가 없으면 payload 전체."""
+    if current is None:
+        return dict(payload)
+    return {column: value for column, value in payload.items() if column not in current or current[column] != value}
+
+
+@dataclass
+class DiffStats:
+    changed: int = 0
+    unchanged: int = 0
+    columns: int = 0
+
+    def record(self, changes: dict[str, Any]) -> None:
+        if changes:
+            self.changed += 1
+            self.columns += len(changes)
+        else:
+            self.unchanged += 1
+
+
+def default_plan_path(name: str) -> str:
+    return os.path.join(DEFAULT_PLAN_DIR, f"{name}.ndjson")
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def table_counts(supabase: Any, tables: list[str]) -> dict[str, int | None]:
+    """테이블별 전체 행 수 (count=exact, 행은 1건만 받는다)."""
+    counts: dict[str, int | None] = {}
+    for table in tables:
+        res = supabase.table(table).select("id", count="exact").limit(1).execute()
+        counts[table] = res.count
+    return counts
+
+
+def source_fingerprint(supabase: Any, tables: list[str], files: list[str] | None = None) -> dict[str, Any]:
+    return {
+        "files": {path: file_sha256(path) for path in files or []},
+        "tables": table_counts(supabase, tables),
+    }
+
+
+@dataclass
+class Change:
+    table: str
+    key: str | None
+    old: Row
+    new: Row
+    label: str = ""
+    sources: Row = field(default_factory=dict)
+
+    @property
+    def action(self) -> str:
+        return "insert" if self.key is None else "update"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "table": self.table,
+            "action": self.action,
+            "key": self.key,
+            "old": self.old,
+            "new": self.new,
+            "sources": self.sources,
+            "label": self.label,
+        }
+
+
+@dataclass
+class Changeset:
+    script: str
+    fingerprint: dict[str, Any] = field(default_factory=dict)
+    changes: list[Change] = field(default_factory=list)
+    created_at: str = ""
+    _pending: dict[tuple[str, str], Change] = field(default_factory=dict, repr=False)
+
+    def update(
+        self, table: str, key: str, current: Row, changes: Row, label: str = "", sources: Row | None = None
+    ) -> None:
+        """changes 는 diff_payload 결과. old 는 current 에서 같은 컬럼만 남긴다.
+
+        같은 행을 여러 번 바꾸면 한 변경으로 합친다 (old / sources 는 처음 본 DB 값을 유지).
+        """
+        if not changes:
+            return
+        previous = self._pending.get((table, str(key)))
+        if previous is not None:
+            for column, value in changes.items():
+                previous.old.setdefault(column, current.get(column))
+                previous.new[column] = value
+            for column, value in (sources or {}).items():
+                if column not in previous.old:
+                    previous.sources.setdefault(column, value)
+            return
+        old = {c: current.get(c) for c in changes}
+        extra = {c: v for c, v in (sources or {}).items() if c not in old}
+        change = Change(table, str(key), old, dict(changes), label, extra)
+        self._pending[(table, str(key))] = change
+        self.changes.append(change)
+
+    def insert(self, table: str, row: Row, label: str = "") -> None:
+        self.changes.append(Change(table, None, {}, dict(row), label))
+
+    def summary(self) -> Counter[str]:
+        return Counter(f"{c.table}.{c.action}" for c in self.changes)
+
+    def write(self, path: str) -> None:
+        ensure_parent(path)
+        header = {
+            "type": "header",
+            "version": PLAN_VERSION,
+            "script": self.script,
+            "created_at": self.created_at or datetime.now(timezone.utc).isoformat(),
+            "fingerprint": self.fingerprint,
+            "changes": len(self.changes),
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(header, ensure_ascii=False, default=str) + "\n")
+            for change in self.changes:
+                f.write(json.dumps(change.as_dict(), ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "Changeset":
+        with open(path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("type") != "header" or header.get("version") != PLAN_VERSION:
+                raise RuntimeError(f"계획 파일 형식이 아닙니다: {path}")
+            changes = []
+            for line in f:
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                changes.append(
+                    Change(
+                        item["table"],
+                        item.get("key"),
+                        item.get("old") or {},
+                        item["new"],
+                        item.get("label", ""),
+                        item.get("sources") or {},
+                    )
+                )
+        if len(changes) != header.get("changes"):
+            raise RuntimeError(f"계획 파일이 잘렸습니다: header {header.get('changes')}건 / 실제 {len(changes)}건")
+        return cls(header["script"], header.get("fingerprint", {}), changes, header.get("created_at", ""))
+
+
+def load_plan(path: str, script: str) -> Changeset:
+    plan = Changeset.load(path)
+    if plan.script != script:
+        raise RuntimeError(f"{script} 의 계획 파일이 아닙니다: {path} ({plan.script})")
+    return plan
+
+
+def fingerprint_mismatches(
+    expected: dict[str, Any], current: dict[str, Any], ignore_tables: set[str] | None = None
+) -> list[str]:
+    mismatches = []
+    for section in ("files", "tables"):
+        before = expected.get(section, {})
+        after = current.get(section, {})
+        for name in sorted(set(before) | set(after)):
+            if section == "tables" and name in (ignore_tables or set()):
+                continue
+            if before.get(name) != after.get(name):
+                mismatches.append(f"{section}/{name}: {before.get(name)} -> {after.get(name)}")
+    return mismatches
+
+
+def find_stale(supabase: Any, changes: list[Change]) -> tuple[list[Change], dict[tuple[str, str], Any]]:
+    """update 대상 행을 id 로만 다시 읽어 old / sources 값과 다른 변경과, 행별 updated_at 을 돌려준다."""
+    by_table: dict[str, list[Change]] = {}
+    for change in changes:
+        if change.key is not None:
+            by_table.setdefault(change.table, []).append(change)
+
+    stale: list[Change] = []
+    versions: dict[tuple[str, str], Any] = {}
+    for table, table_changes in by_table.items():
+        columns = sorted(
+            {column for change in table_changes for column in (*change.old, *change.sources)} - {VERSION_COLUMN}
+        )
+        if supports_preconditions(supabase, table):
+            columns.append(VERSION_COLUMN)
+        select = ", ".join(["id", *columns])
+        for start in range(0, len(table_changes), VERIFY_CHUNK_SIZE):
+            chunk = table_changes[start : start + VERIFY_CHUNK_SIZE]
+            rows = supabase.table(table).select(select).in_("id", [c.key for c in chunk]).execute().data or []
+            current = {str(row["id"]): row for row in rows}
+            for change in chunk:
+                row = current.get(change.key)
+                expected = {**change.sources, **change.old}
+                if row is None or any(row.get(column) != value for column, value in expected.items()):
+                    stale.append(change)
+                elif row.get(VERSION_COLUMN) is not None:
+                    versions[(table, change.key)] = row[VERSION_COLUMN]
+    return stale, versions
+
+
+@dataclass
+class PlanResult:
+    updated: int = 0
+    inserted: int = 0
+    stale: list[Change] = field(default_factory=list)
+    resumed: int = 0
+    failures: list[UpdateResult] = field(default_factory=list)
+    conflicts: int = 0
+    insert_errors: list[str] = field(default_factory=list)
+
+
+def apply_changeset(
+    supabase: Any,
+    plan: Changeset,
+    current_fingerprint: dict[str, Any],
+    concurrency: int = 1,
+    journal: Journal | None = None,
+) -> PlanResult:
+    journal = journal or Journal.disabled()
+    # 이어서 실행(--resume)하면 앞선 실행의 insert 가 테이블 건수를 바꿨으므로 그 테이블 건수는 비교하지 않는다
+    # (fingerprint 는 첫 실행에서 쓰기 전에 이미 확인했다)
+    inserted_tables = {change.table for change in plan.changes if change.key is None} if journal.completed else set()
+    mismatches = fingerprint_mismatches(plan.fingerprint, current_fingerprint, inserted_tables)
+    if mismatches:
+        detail = "\n".join(f"- {m}" for m in mismatches)
+        raise RuntimeError(f"계획 이후 원본 상태가 바뀌었습니다. dry-run 을 다시 실행하세요.\n{detail}")
+
+    # 이미 반영한 update 는 old 값이 new 로 바뀌어 있으므로 stale 확인 전에 건너뛴다
+    updates = [change for change in plan.changes if change.key is not None]
+    pending = [change for change in updates if not journal.done(f"{change.table}:{change.key}")]
+    stale, versions = find_stale(supabase, pending)
+    result = PlanResult(stale=stale, resumed=len(updates) - len(pending))
+    stale_ids = {id(change) for change in stale}
+
+    ops = []
+    for change in pending:
+        if id(change) in stale_ids:
+            continue
+        version = versions.get((change.table, change.key))
+        expected = {VERSION_COLUMN: version} if version is not None else {}
+        ops.append(
+            UpdateOp(
+                change.table,
+                change.key,
+                change.new,
+                label=change.label,
+                expected=expected,
+                base=change.old,
+                sources=change.sources,
+            )
+        )
+
+    def on_result(update: UpdateResult) -> None:
+        if update.ok:
+            journal.mark(update.op.journal_key)
+
+    results = run_guarded_updates(supabase, ops, concurrency, on_result=on_result)
+    result.updated = sum(1 for r in results if r.ok)
+    result.failures = [r for r in results if not r.ok]
+    result.conflicts = sum(1 for r in results if r.conflict)
+
+    inserts: dict[str, list[Row]] = {}
+    for change in plan.changes:
+        if change.key is None:
+            inserts.setdefault(change.table, []).append(change.new)
+    for table, rows in inserts.items():
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            journal_key = f"plan_insert:{table}:{start}"
+            if journal.done(journal_key):
+                continue
+            chunk = rows[start : start + INSERT_CHUNK_SIZE]
+            try:
+                supabase.table(table).insert(chunk).execute()
+            except Exception as exc:  # noqa: BLE001 - 실패는 결과로 보고
+                result.insert_errors.append(f"{table} {start}~{start + len(chunk) - 1}: {exc}")
+                continue
+            journal.mark(journal_key)
+            result.inserted += len(chunk)
+    return result
+
+
+def print_plan_result(result: PlanResult, limit: int = 20) -> None:
+    print(
+        f"update {result.updated}건 / insert {result.inserted}건 / stale {len(result.stale)}건 / 충돌 {result.conflicts}건"
+        f" / 이미 반영(--resume) {result.resumed}건"
+    )
+    if result.stale:
+        print("\n[건너뜀] 계획 이후 값이 바뀐 행 (dry-run 을 다시 실행하면 반영됩니다)")
+        for change in result.stale[:limit]:
+            print(f"- {change.table} {change.label or change.key} ({change.key})")
+    for error in result.insert_errors:
+        print(f"[실패] insert {error}")
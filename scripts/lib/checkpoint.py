@@ -0,0 +1,81 @@
+"""
+--apply 실행 재개용 작업 저널.
+
+완료된 작업 키(예: members:<id>, relationships:<member_id>:<이름>, legacy_records:<id>,
+upload_batch:<index>)를 한 줄씩 기록하고 일정 건수마다 디스크에 flush 한다.
+--resume 으로 다시 실행하면 저널에 있는 키는 건너뛰어 남은 작업만 수행한다.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import IO
+
+DEFAULT_DIR = "data/checkpoints"
+DEFAULT_FLUSH_EVERY = 50
+
+
+def default_journal_path(name: str) -> str:
+    return os.path.join(DEFAULT_DIR, f"{name}.journal")
+
+
+class Journal:
+    def __init__(self, path: str | None, resume: bool = False, flush_every: int = DEFAULT_FLUSH_EVERY) -> None:
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.completed: set[str] = set()
+        self.skipped = 0
+        self._pending = 0
+        self._file: IO[str] | None = None
+
+        if path is None:
+            return
+        if resume and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.completed = {line.rstrip("\n") for line in f if line.strip()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+
+    @classmethod
+    def disabled(cls) -> "Journal":
+        return cls(None)
+
+    def done(self, key: str) -> bool:
+        """이미 완료된 키면 True (건너뛴 수를 함께 센다)."""
+        if key in self.completed:
+            self.skipped += 1
+            return True
+        return False
+
+    def mark(self, key: str) -> None:
+        if key in self.completed:
+            return
+        self.completed.add(key)
+        if self._file is None:
+            return
+        self._file.write(key + "\n")
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._file is None or self._pending == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.flush()
+        self._file.close()
+        self._file = None
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
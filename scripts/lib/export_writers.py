@@ -0,0 +1,181 @@
+"""
+행 단위 스트리밍 파일 작성기 (xlsx / csv / parquet).
+
+DataFrame 을 만들지 않고 받은 행을 바로 파일에 쓰므로 메모리 사용량이 행 수와 무관하다.
+- xlsx   : xlsxwriter constant_memory 모드 (없으면 openpyxl write_only 모드)
+- csv    : 표준 csv 모듈 (엑셀에서 바로 열리도록 utf-8-sig)
+- parquet: pyarrow ParquetWriter 로 batch 단위 기록
+
+xlsx 는 시트를 여러 개 만들 수 있지만, constant_memory 특성상 시트는 순서대로 하나씩 채워야 한다.
+
+사용:
+    with open_writer("out.xlsx", ["성명", "권리증수"]) as writer:
+        writer.write_row(["홍길동", 2])
+"""
+
+from __future__ import annotations
+
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import IO, Any, Iterable, Sequence
+
+FORMATS = ("xlsx", "csv", "parquet")
+PARQUET_BATCH_ROWS = 5000
+DEFAULT_SHEET = "Sheet1"
+
+
+def detect_format(path: str, fmt: str | None = None) -> str:
+    if fmt:
+        return fmt
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    if ext not in FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {path} (xlsx/csv/parquet)")
+    return ext
+
+
+def ensure_parent(path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+def cell_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class TableWriter(ABC):
+    rows_written: int
+
+    @abstractmethod
+    def write_row(self, row: Sequence[Any]) -> None: ...
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    def __enter__(self) -> "TableWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class XlsxWriter(TableWriter):
+    """시트 여러 개를 순서대로 채우는 xlsx 작성기."""
+
+    def __init__(self, path: str) -> None:
+        ensure_parent(path)
+        self.rows_written = 0
+        self._row_index = 0
+        self._sheet: Any = None
+        try:
+            import xlsxwriter
+        except ImportError:
+            from openpyxl import Workbook
+
+            self._engine = "openpyxl"
+            self._path = path
+            self._book = Workbook(write_only=True)
+        else:
+            self._engine = "xlsxwriter"
+            self._book = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_numbers": False})
+
+    def add_sheet(self, name: str, columns: Sequence[str]) -> None:
+        # 엑셀 시트 이름은 31자 제한
+        if self._engine == "xlsxwriter":
+            self._sheet = self._book.add_worksheet(name[:31])
+        else:
+            self._sheet = self._book.create_sheet(name[:31])
+        self._row_index = 0
+        self._append(list(columns))
+
+    def _append(self, values: list[Any]) -> None:
+        if self._engine == "xlsxwriter":
+            self._sheet.write_row(self._row_index, 0, values)
+        else:
+            self._sheet.append(values)
+        self._row_index += 1
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        self._append([cell_value(v) for v in row])
+        self.rows_written += 1
+
+    def close(self) -> None:
+        if self._engine == "xlsxwriter":
+            self._book.close()
+        else:
+            self._book.save(self._path)
+
+
+class CsvWriter(TableWriter):
+    def __init__(self, path: str, columns: Sequence[str]) -> None:
+        ensure_parent(path)
+        self.rows_written = 0
+        self._file: IO[str] = open(path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        self._writer.writerow(["" if v is None else v for v in row])
+        self.rows_written += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter(TableWriter):
+    """모든 컬럼을 문자열로 기록 (엑셀/CSV 출력과 같은 값)."""
+
+    def __init__(self, path: str, columns: Sequence[str], batch_rows: int = PARQUET_BATCH_ROWS) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("parquet 출력에는 pyarrow 가 필요합니다. (pip install pyarrow)") from exc
+
+        ensure_parent(path)
+        self.rows_written = 0
+        self._pa = pa
+        self._columns = list(columns)
+        self._schema = pa.schema([(c, pa.string()) for c in self._columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+        self._batch: list[Sequence[Any]] = []
+        self._batch_rows = batch_rows
+
+    def write_row(self, row: Sequence[Any]) -> None:
+        self._batch.append(row)
+        self.rows_written += 1
+        if len(self._batch) >= self._batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._batch:
+            return
+        arrays = [
+            self._pa.array([None if r[i] is None else str(r[i]) for r in self._batch], type=self._pa.string())
+            for i in range(len(self._columns))
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+        self._batch = []
+
+    def close(self) -> None:
+        self._flush()
+        self._writer.close()
+
+
+def open_writer(path: str, columns: Sequence[str], fmt: str | None = None, sheet: str = DEFAULT_SHEET) -> TableWriter:
+    """단일 표 출력용 작성기."""
+    fmt = detect_format(path, fmt)
+    if fmt == "csv":
+        return CsvWriter(path, columns)
+    if fmt == "parquet":
+        return ParquetWriter(path, columns)
+    writer = XlsxWriter(path)
+    writer.add_sheet(sheet, columns)
+    return writer
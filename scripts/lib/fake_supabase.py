@@ -0,0 +1,364 @@
+"""
+오프라인 벤치마크용 인메모리 Supabase/PostgREST 대역(stand-in).
+
+스크립트가 쓰는 supabase-py table API 부분집합만 구현한다.
+- 조회: select, eq, neq, gt, gte, lt, lte, ilike, like, in_, is_, or_, order, limit, range
+- 쓰기: insert, update, upsert(on_conflict), delete
+
+요청마다 latency(초)를 주입할 수 있어 실제 왕복 비용을 흉내낼 수 있고,
+요청 수/바이트/지연은 lib.supabase_client.request_stats 에 그대로 기록된다.
+
+사용:
+    from lib.fake_supabase import FakeSupabase
+    from lib.supabase_client import use_client
+
+    fake = FakeSupabase({"members": [...], "legacy_records": [...]}, latency=0.03)
+    use_client(fake)
+    sync_latest_address_book.main()
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from lib.supabase_client import request_stats
+
+Row = dict[str, Any]
+Predicate = Callable[[Row], bool]
+
+
+@dataclass
+class FakeResponse:
+    data: list[Row]
+    count: int | None = None
+
+
+def filter_text(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def like_to_regex(pattern: str, case_insensitive: bool) -> re.Pattern[str]:
+    parts = []
+    for ch in pattern:
+        if ch in "%*":
+            parts.append(".*")
+        elif ch == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(ch))
+    return re.compile("^" + "".join(parts) + "$", re.IGNORECASE | re.DOTALL if case_insensitive else re.DOTALL)
+
+
+def compare(stored: Any, value: Any) -> int:
+    if stored is None:
+        return -1
+    try:
+        left, right = float(stored), float(value)
+    except (TypeError, ValueError):
+        left, right = filter_text(stored), filter_text(value)
+    return (left > right) - (left < right)
+
+
+def make_predicate(column: str, op: str, value: Any) -> Predicate:
+    if op == "eq":
+        text = filter_text(value)
+        return lambda row: filter_text(row.get(column)) == text
+    if op == "neq":
+        text = filter_text(value)
+        return lambda row: filter_text(row.get(column)) != text
+    if op in ("gt", "gte", "lt", "lte"):
+        checks = {
+            "gt": lambda c: c > 0,
+            "gte": lambda c: c >= 0,
+            "lt": lambda c: c < 0,
+            "lte": lambda c: c <= 0,
+        }
+        check = checks[op]
+        return lambda row: row.get(column) is not None and check(compare(row.get(column), value))
+    if op in ("like", "ilike"):
+        regex = like_to_regex(str(value), op == "ilike")
+        return lambda row: row.get(column) is not None and bool(regex.match(str(row.get(column))))
+    if op == "in":
+        texts = {filter_text(v) for v in value}
+        return lambda row: filter_text(row.get(column)) in texts
+    if op == "is":
+        text = filter_text(value).lower()
+        return lambda row: filter_text(row.get(column)).lower() == text
+    raise ValueError(f"FakeSupabase: 지원하지 않는 필터 연산자 {op}")
+
+
+def split_top_level(expression: str) -> list[str]:
+    """괄호 / 큰따옴표 안의 쉼표는 건너뛰고 나눈다."""
+    parts: list[str] = []
+    depth = 0
+    quoted = False
+    start = 0
+    for index, ch in enumerate(expression):
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        elif not quoted and depth == 0 and ch == ",":
+            parts.append(expression[start:index])
+            start = index + 1
+    parts.append(expression[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_condition(part: str) -> Predicate:
+    for group, combine in (("and(", all), ("or(", any)):
+        if part.startswith(group) and part.endswith(")"):
+            predicates = [parse_condition(p) for p in split_top_level(part[len(group) : -1])]
+            return lambda row, ps=predicates, combine=combine: combine(p(row) for p in ps)
+    column, op, value = part.split(".", 2)
+    if op == "in":
+        return make_predicate(column, op, [v.strip('"') for v in split_top_level(value.strip("()"))])
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1]
+    return make_predicate(column, op, value)
+
+
+def parse_or_filter(expression: str) -> Predicate:
+    """PostgREST or 필터 문자열 (예: "name.eq.홍길동,memo.ilike.%05-1-6%", "a.gt.1,and(a.eq.1,id.gt.x)")."""
+    return parse_condition(f"or({expression})")
+
+
+def parse_columns(columns: str) -> list[str] | None:
+    names = [c.strip() for c in columns.split(",") if c.strip()]
+    if not names or "*" in names:
+        return None
+    # 임베드(관계) 컬럼 "table(col)" 은 무시
+    return [c for c in names if "(" not in c]
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeSupabase", table: str) -> None:
+        self.db = db
+        self.table_name = table
+        self.action = "select"
+        self.columns: list[str] | None = None
+        self.payload: Any = None
+        self.on_conflict = "id"
+        self.predicates: list[Predicate] = []
+        self.order_by: list[tuple[str, bool]] = []
+        self.offset = 0
+        self.row_limit: int | None = None
+        self.count_mode: str | None = None
+        # count 를 요청한 select 에서 offset / limit 적용 전 조건에 맞은 행 수
+        self.matched_count: int | None = None
+
+    # --- actions ---
+    def select(self, columns: str = "*", count: str | None = None) -> "FakeQuery":
+        self.count_mode = count
+        self.action = "select"
+        self.columns = parse_columns(columns)
+        return self
+
+    def insert(self, rows: Row | list[Row]) -> "FakeQuery":
+        self.action = "insert"
+        self.payload = rows
+        return self
+
+    def update(self, values: Row) -> "FakeQuery":
+        self.action = "update"
+        self.payload = values
+        return self
+
+    def upsert(self, rows: Row | list[Row], on_conflict: str = "id") -> "FakeQuery":
+        self.action = "upsert"
+        self.payload = rows
+        self.on_conflict = on_conflict
+        return self
+
+    def delete(self) -> "FakeQuery":
+        self.action = "delete"
+        return self
+
+    # --- filters ---
+    def _filter(self, column: str, op: str, value: Any) -> "FakeQuery":
+        self.predicates.append(make_predicate(column, op, value))
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "FakeQuery":
+        return self._filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "FakeQuery":
+        return self._filter(column, "ilike", pattern)
+
+    def in_(self, column: str, values: list[Any]) -> "FakeQuery":
+        return self._filter(column, "in", values)
+
+    def is_(self, column: str, value: Any) -> "FakeQuery":
+        return self._filter(column, "is", value)
+
+    def or_(self, expression: str) -> "FakeQuery":
+        self.predicates.append(parse_or_filter(expression))
+        return self
+
+    # --- modifiers ---
+    def order(self, column: str, desc: bool = False) -> "FakeQuery":
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "FakeQuery":
+        self.row_limit = size
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def execute(self) -> FakeResponse:
+        return self.db.execute(self)
+
+
+class FakeSupabase:
+    """supabase.Client 의 table() 부분만 흉내내는 인메모리 DB."""
+
+    def __init__(
+        self,
+        tables: dict[str, list[Row]] | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        max_rows: int | None = None,
+    ) -> None:
+        self.tables: dict[str, list[Row]] = {name: [dict(r) for r in rows] for name, rows in (tables or {}).items()}
+        self.latency = latency
+        self.jitter = jitter
+        # PostgREST db-max-rows 흉내 (range/limit 없이 select 하면 잘림)
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_json(cls, path: str, **kwargs: Any) -> "FakeSupabase":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self, name)
+
+    def rows(self, name: str) -> list[Row]:
+        return self.tables.setdefault(name, [])
+
+    def execute(self, query: FakeQuery) -> FakeResponse:
+        started = time.perf_counter()
+        sent = len(json.dumps(query.payload, ensure_ascii=False, default=str)) if query.payload is not None else 0
+
+        with self._lock:
+            data = self._run(query)
+            body = json.dumps(data, ensure_ascii=False, default=str)
+
+        delay = self.latency + (random.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        request_stats.record(
+            query.table_name,
+            bytes_sent=sent,
+            bytes_received=len(body),
+            elapsed=time.perf_counter() - started,
+        )
+        # 직렬화 왕복으로 호출자와 저장소가 객체를 공유하지 않게 한다.
+        # PostgREST 처럼 count 를 요청했을 때만 (offset / limit 전) 전체 건수, 아니면 None
+        count = query.matched_count if query.count_mode else None
+        return FakeResponse(data=json.loads(body), count=count)
+
+    def _run(self, query: FakeQuery) -> list[Row]:
+        rows = self.rows(query.table_name)
+
+        if query.action == "insert":
+            inserted = [self._new_row(r) for r in as_list(query.payload)]
+            rows.extend(inserted)
+            return inserted
+
+        if query.action == "upsert":
+            keys = [c.strip() for c in query.on_conflict.split(",")]
+            index = {tuple(filter_text(r.get(k)) for k in keys): r for r in rows}
+            result = []
+            for payload in as_list(query.payload):
+                existing = index.get(tuple(filter_text(payload.get(k)) for k in keys))
+                if existing is None:
+                    existing = self._new_row(payload)
+                    rows.append(existing)
+                    index[tuple(filter_text(existing.get(k)) for k in keys)] = existing
+                else:
+                    existing.update(copy.deepcopy(payload))
+                result.append(existing)
+            return result
+
+        matched = [r for r in rows if all(p(r) for p in query.predicates)]
+
+        if query.action == "update":
+            for row in matched:
+                row.update(copy.deepcopy(query.payload))
+            return matched
+
+        if query.action == "delete":
+            remaining = [r for r in rows if not all(p(r) for p in query.predicates)]
+            self.tables[query.table_name] = remaining
+            return matched
+
+        query.matched_count = len(matched)
+        for column, desc in reversed(query.order_by):
+            matched.sort(key=lambda r, c=column: sort_value(r.get(c)), reverse=desc)
+
+        limit = query.row_limit
+        if limit is None and self.max_rows is not None:
+            limit = self.max_rows
+        end = None if limit is None else query.offset + limit
+        page = matched[query.offset:end]
+
+        if query.columns is None:
+            return page
+        return [{c: r.get(c) for c in query.columns} for r in page]
+
+    @staticmethod
+    def _new_row(payload: Row) -> Row:
+        row = copy.deepcopy(payload)
+        row.setdefault("id", str(uuid.uuid4()))
+        return row
+
+
+def sort_value(value: Any) -> tuple[int, float, str]:
+    if value is None:
+        return (2, 0.0, "")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, float(value), "")
+    return (1, 0.0, filter_text(value))
+
+
+def as_list(rows: Row | list[Row]) -> list[Row]:
+    return rows if isinstance(rows, list) else [rows]
@@ -0,0 +1,158 @@
+"""
+단계(phase)별 시간/요청 계측.
+
+도메인 카운터(registered_matched 등)만으로는 느린 실행이 엑셀 파싱, 테이블 다운로드,
+매칭, 행 단위 쓰기 중 어디에서 시간을 썼는지 알 수 없다.
+phase() 컨텍스트 매니저로 구간을 감싸면 구간별 소요 시간과
+해당 구간에서 발생한 테이블별 HTTP 요청/바이트/재시도 수(request_stats 차이)를 모은다.
+
+사용:
+    metrics = Instrumentation("sync_latest_address_book")
+    with metrics.phase("excel_parse"):
+        rows = read_excel_rows()
+    metrics.count("rows", len(rows))
+    metrics.print_report()
+    metrics.write_json("data/metrics/sync.json")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, ContextManager, Iterator
+
+from lib.supabase_client import RequestStats, TableStats, request_stats
+
+PhaseHook = Callable[[str], ContextManager[Any]]
+# phase 진입 시 함께 들어갈 컨텍스트 (예: lib.profiling 의 phase 단위 프로파일러)
+_phase_hooks: list[PhaseHook] = []
+
+
+def register_phase_hook(hook: PhaseHook) -> None:
+    _phase_hooks.append(hook)
+
+
+def unregister_phase_hook(hook: PhaseHook) -> None:
+    if hook in _phase_hooks:
+        _phase_hooks.remove(hook)
+
+
+@dataclass
+class PhaseRecord:
+    name: str
+    calls: int = 0
+    elapsed: float = 0.0
+    tables: dict[str, TableStats] = field(default_factory=dict)
+
+    def add_requests(self, before: dict[str, TableStats], after: dict[str, TableStats]) -> None:
+        for table, now in after.items():
+            prev = before.get(table, TableStats())
+            delta = TableStats(
+                requests=now.requests - prev.requests,
+                errors=now.errors - prev.errors,
+                retries=now.retries - prev.retries,
+                bytes_sent=now.bytes_sent - prev.bytes_sent,
+                bytes_received=now.bytes_received - prev.bytes_received,
+                elapsed=now.elapsed - prev.elapsed,
+            )
+            if delta.requests == 0 and delta.retries == 0:
+                continue
+            entry = self.tables.setdefault(table, TableStats())
+            entry.requests += delta.requests
+            entry.errors += delta.errors
+            entry.retries += delta.retries
+            entry.bytes_sent += delta.bytes_sent
+            entry.bytes_received += delta.bytes_received
+            entry.elapsed += delta.elapsed
+
+    @property
+    def requests(self) -> int:
+        return sum(entry.requests for entry in self.tables.values())
+
+
+class Instrumentation:
+    """실행 하나의 단계별 계측 결과."""
+
+    def __init__(self, name: str, stats: RequestStats = request_stats) -> None:
+        self.name = name
+        self.stats = stats
+        self.phases: dict[str, PhaseRecord] = {}
+        self.counters: dict[str, int] = {}
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[PhaseRecord]:
+        """구간 계측. 같은 이름으로 여러 번 들어오면 누적한다."""
+        record = self.phases.setdefault(name, PhaseRecord(name))
+        before = self.stats.snapshot()
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for hook in list(_phase_hooks):
+                    stack.enter_context(hook(name))
+                yield record
+        finally:
+            record.elapsed += time.perf_counter() - started
+            record.calls += 1
+            record.add_requests(before, self.stats.snapshot())
+
+    def count(self, key: str, value: int = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def update_counters(self, values: dict[str, int]) -> None:
+        for key, value in values.items():
+            self.counters[key] = value
+
+    @property
+    def total_elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "total_elapsed": round(self.total_elapsed, 4),
+            "phases": [
+                {
+                    "name": record.name,
+                    "calls": record.calls,
+                    "elapsed": round(record.elapsed, 4),
+                    "requests": record.requests,
+                    "tables": {table: vars(entry).copy() for table, entry in sorted(record.tables.items())},
+                }
+                for record in self.phases.values()
+            ],
+            "counters": dict(self.counters),
+            "request_totals": vars(self.stats.totals()).copy(),
+        }
+
+    def print_report(self) -> None:
+        if not self.phases:
+            return
+        total = self.total_elapsed
+        print(f"\n=== 단계별 소요 ({self.name}) ===")
+        for record in self.phases.values():
+            share = record.elapsed / total if total > 0 else 0.0
+            line = f"- {record.name}: {record.elapsed:.2f}s ({share:.0%})"
+            if record.calls > 1:
+                line += f" x{record.calls}"
+            if record.tables:
+                detail = ", ".join(
+                    f"{table} {entry.requests}건" + (f"/재시도 {entry.retries}" if entry.retries else "")
+                    for table, entry in sorted(record.tables.items())
+                )
+                line += f" | {detail}"
+            print(line)
+        print(f"전체: {total:.2f}s")
+
+    def write_json(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, ensure_ascii=False, indent=2)
+        print(f"계측 결과 저장: {path}")
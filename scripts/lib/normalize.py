@@ -0,0 +1,114 @@
+"""
+이름/전화번호 정규화 공용 모듈.
+
+sync_latest_address_book.py, sync_member_number_to_legacy_cert.py, migrate_rights_data.py 에
+조금씩 다르게 흩어져 있던 정규화를 한 곳에 모았다. 기존 동작은 그대로 유지하며
+(lib/test_normalize.py 의 기존 구현 대조 테스트), 정규식은 미리 컴파일하고
+같은 이름은 lru_cache 로 한 번만 계산한다.
+
+- normalize_name_key: 공백만 제거한 이름 키 (sync_latest_address_book 의 exact 키)
+- simple_name_key: 주석(별세/?/X 등)과 빈 괄호까지 뗀 이름 키
+  (sync_member_number_to_legacy_cert.normalize_name_key, 조회 스크립트들의 이름 비교 키)
+- name_without_spaces: MigrationManager.normalize_name (ASCII 공백만 제거, 값 없으면 None)
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from functools import lru_cache
+from typing import Any
+
+# account_entities + members + legacy_records 이름 수(수천 명)를 넉넉히 담는 크기
+NAME_CACHE_SIZE = 16384
+PHONE_CACHE_SIZE = 8192
+
+ANNOTATION_WORDS = ("별세", "시동생", "없는사람")
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+EMPTY_PAREN_PATTERN = re.compile(r"\(\s*\)")
+NON_DIGIT_PATTERN = re.compile(r"\D")
+MIN_PHONE_DIGITS = 8
+
+
+def is_nan_like(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    text = str(value).strip()
+    return text == "" or text.lower() == "nan"
+
+
+def as_text(value: Any) -> str:
+    if is_nan_like(value):
+        return ""
+    return str(value).strip()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_spaces(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def clean_name_for_display(raw_name: str) -> str:
+    text = raw_name.replace("\r", " ").replace("\n", " ")
+    text = text.replace("?", "")
+    return WHITESPACE_PATTERN.sub(" ", text.strip())
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name_key(text: str) -> str:
+    return WHITESPACE_PATTERN.sub("", text).strip()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def strip_annotations(name: str) -> str:
+    text = name.replace("?", "").replace("X", "")
+    text = text.replace("\r", " ").replace("\n", " ")
+    for word in ANNOTATION_WORDS:
+        text = text.replace(word, "")
+    text = EMPTY_PAREN_PATTERN.sub("", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def _simple_name_key(text: str) -> str:
+    return normalize_name_key(strip_annotations(text))
+
+
+def simple_name_key(name: Any) -> str:
+    return _simple_name_key(as_text(name))
+
+
+@lru_cache(maxsize=PHONE_CACHE_SIZE)
+def normalize_phone(value: str) -> str:
+    if not value:
+        return ""
+    digits = NON_DIGIT_PATTERN.sub("", value)
+    return digits if len(digits) >= MIN_PHONE_DIGITS else ""
+
+
+def is_missing(value: Any) -> bool:
+    """pd.isna 와 같은 스칼라 판별 (None / NaN / NaT / NA). pandas 를 import 하지 않는다."""
+    if value is None:
+        return True
+    try:
+        # NaN, NaT 는 자기 자신과 같지 않고, pd.NA 는 bool 변환이 안 된다
+        return bool(value != value)
+    except (TypeError, ValueError):
+        return True
+
+
+def name_without_spaces(name: Any) -> str | None:
+    if is_missing(name):
+        return None
+    return str(name).strip().replace(" ", "")
+
+
+def cache_info() -> dict[str, Any]:
+    return {
+        fn.__name__.lstrip("_"): fn.cache_info()
+        for fn in (normalize_spaces, clean_name_for_display, normalize_name_key, strip_annotations, _simple_name_key, normalize_phone)
+    }
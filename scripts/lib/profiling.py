@@ -0,0 +1,167 @@
+"""
+스크립트 공통 --profile 스위치.
+
+- 출력 경로가 .prof 이면 cProfile 통계 (snakeviz / pstats 로 열람)
+- .collapsed / .folded 이면 샘플링 프로파일러의 collapsed stack
+  (flamegraph.pl, speedscope 에서 바로 열 수 있는 "a;b;c 횟수" 형식)
+- --profile-phase 를 주면 lib.instrumentation 의 해당 이름 phase 구간만 프로파일링
+
+사용:
+    parser = argparse.ArgumentParser(...)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    with profile_from_args(args):
+        run(...)
+
+    python scripts/sync_latest_address_book.py --profile data/profiles/sync.prof
+    python scripts/sync_latest_address_book.py --profile sync.collapsed --profile-phase registered_rows
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from typing import ContextManager, Iterator
+
+from lib.instrumentation import register_phase_hook, unregister_phase_hook
+
+COLLAPSED_SUFFIXES = (".collapsed", ".folded")
+DEFAULT_SAMPLE_INTERVAL = 0.005
+SUMMARY_LINES = 15
+
+
+class StackSampler:
+    """대상 스레드의 호출 스택을 주기적으로 샘플링해 collapsed stack 으로 모은다."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: Counter[str] = Counter()
+        self._target_id = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._target_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self.samples[";".join(reversed(stack))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    def __init__(self, output: str, phase: str | None = None, interval: float = DEFAULT_SAMPLE_INTERVAL) -> None:
+        self.output = output
+        self.phase = phase
+        self.collapsed = output.endswith(COLLAPSED_SUFFIXES)
+        self.sampler = StackSampler(interval) if self.collapsed else None
+        self.profile = None if self.collapsed else cProfile.Profile()
+        self.captures = 0
+
+    @contextmanager
+    def capture(self) -> Iterator[None]:
+        """프로파일링 구간. 여러 번 호출되면 결과를 누적한다."""
+        self.captures += 1
+        if self.sampler is not None:
+            self.sampler.start()
+        else:
+            self.profile.enable()
+        try:
+            yield
+        finally:
+            if self.sampler is not None:
+                self.sampler.stop()
+            else:
+                self.profile.disable()
+
+    def phase_hook(self, name: str) -> ContextManager[None]:
+        return self.capture() if name == self.phase else nullcontext()
+
+    @contextmanager
+    def running(self) -> Iterator[None]:
+        """phase 지정 시 해당 phase 만, 아니면 전체 구간을 프로파일링한 뒤 파일로 저장."""
+        started = time.perf_counter()
+        try:
+            if self.phase:
+                register_phase_hook(self.phase_hook)
+                try:
+                    yield
+                finally:
+                    unregister_phase_hook(self.phase_hook)
+            else:
+                with self.capture():
+                    yield
+        finally:
+            self.save(time.perf_counter() - started)
+
+    def save(self, elapsed: float) -> None:
+        directory = os.path.dirname(self.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        target = f"phase '{self.phase}'" if self.phase else "전체"
+        if self.phase and self.captures == 0:
+            print(f"\n[프로파일] phase '{self.phase}' 가 실행되지 않아 결과가 비어 있습니다.")
+
+        if self.sampler is not None:
+            self.sampler.write(self.output)
+            total = sum(self.sampler.samples.values())
+            print(f"\n[프로파일] {target} collapsed stack 저장: {self.output} (샘플 {total}개, {elapsed:.2f}s)")
+            return
+
+        self.profile.dump_stats(self.output)
+        print(f"\n[프로파일] {target} cProfile 저장: {self.output} ({elapsed:.2f}s)")
+        if self.captures:
+            buffer = io.StringIO()
+            pstats.Stats(self.profile, stream=buffer).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+            print(buffer.getvalue().rstrip())
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="프로파일 결과 저장 (.prof = cProfile, .collapsed/.folded = flamegraph 용 collapsed stack)",
+    )
+    parser.add_argument("--profile-phase", metavar="NAME", help="지정한 phase 구간만 프로파일링")
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=DEFAULT_SAMPLE_INTERVAL,
+        help=f"collapsed stack 샘플링 간격(초, 기본 {DEFAULT_SAMPLE_INTERVAL})",
+    )
+
+
+def profile_from_args(args: argparse.Namespace) -> ContextManager[None]:
+    if not getattr(args, "profile", None):
+        return nullcontext()
+    return Profiler(args.profile, args.profile_phase, args.profile_interval).running()
@@ -0,0 +1,248 @@
+"""
+조회 공용 유틸: 페이지네이션, 프로세스 단위 쿼리 캐시, 테이블 스냅샷.
+
+- fetch_all_rows / iter_pages: PostgREST range 페이지 단위 전체 조회
+- iter_keyset: (정렬 컬럼, id) keyset 페이지 조회. 읽는 도중 정렬 컬럼이 바뀌는 증분 조회용
+- cached_rows: 같은 (테이블, 컬럼, 필터) 조회는 프로세스 안에서 한 번만 내려받는다.
+  peopleon 에서 여러 하위 명령을 이어 실행할 때 같은 테이블을 다시 받지 않기 위함.
+- save_snapshot / load_snapshot: 내려받은 테이블을 JSON 으로 저장하고 다시 캐시에 올린다.
+  (FakeSupabase.from_json 과 같은 {테이블: [행...]} 형식)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from lib.supabase_client import get_client
+
+PAGE_SIZE = 1000
+# 정렬 없는 range 페이지는 행 순서가 보장되지 않아 누락/중복이 날 수 있다
+ID_ORDER: list[tuple[str, bool]] = [("id", False)]
+SNAPSHOT_DIR = "data/snapshots"
+
+Row = dict[str, Any]
+CacheKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+def iter_pages(
+    supabase: Any,
+    table: str,
+    columns: str,
+    filters: dict[str, Any] | None = None,
+    page_size: int = PAGE_SIZE,
+    order: list[tuple[str, bool]] | None = None,
+    since: dict[str, Any] | None = None,
+) -> Iterator[list[Row]]:
+    """range 페이지 단위로 yield. order=[(컬럼, desc)] 를 주면 페이지 경계가 안정적이다.
+
+    since={컬럼: 값} 은 gte 조건 (증분 조회용 워터마크).
+    """
+    offset = 0
+    while True:
+        query = supabase.table(table).select(columns)
+        for column, value in (filters or {}).items():
+            query = query.eq(column, value)
+        for column, value in (since or {}).items():
+            query = query.gte(column, value)
+        for column, desc in order or []:
+            query = query.order(column, desc=desc)
+        batch = query.range(offset, offset + page_size - 1).execute().data or []
+        if batch:
+            yield batch
+        if len(batch) < page_size:
+            break
+        offset += page_size
+
+
+def iter_keyset(
+    supabase: Any,
+    table: str,
+    columns: str,
+    order_column: str = "id",
+    since: Any = None,
+    page_size: int = PAGE_SIZE,
+) -> Iterator[list[Row]]:
+    """(order_column, id) 순서로 마지막 행 뒤부터 다음 페이지를 받는다. columns 에 두 컬럼이 있어야 한다.
+
+    offset 페이지는 읽는 도중 앞쪽 행의 updated_at 이 바뀌어 뒤로 옮겨 가면 나머지 행이 당겨져 건너뛴다.
+    keyset 은 이미 읽은 위치 뒤만 보므로 그런 행은 뒤에서 (또는 다음 실행에서) 다시 읽힌다.
+    since 는 order_column 의 gte 조건. NULL 은 keyset 으로 이어 받을 수 없으므로 NULL 이 없는 컬럼이나 since 와 함께 쓴다.
+    """
+    last: Row | None = None
+    while True:
+        query = supabase.table(table).select(columns)
+        if since is not None:
+            query = query.gte(order_column, since)
+        if last is not None and order_column == "id":
+            query = query.gt("id", last["id"])
+        elif last is not None:
+            value = f'"{last[order_column]}"'
+            query = query.or_(f'{order_column}.gt.{value},and({order_column}.eq.{value},id.gt."{last["id"]}")')
+        query = query.order(order_column)
+        if order_column != "id":
+            query = query.order("id")
+        batch = query.limit(page_size).execute().data or []
+        if batch:
+            yield batch
+            last = batch[-1]
+        if len(batch) < page_size:
+            break
+
+
+def fetch_all_rows(
+    supabase: Any,
+    table: str,
+    columns: str,
+    filters: dict[str, Any] | None = None,
+    page_size: int = PAGE_SIZE,
+    order: list[tuple[str, bool]] | None = None,
+) -> list[Row]:
+    """전체 행 조회. order 를 주지 않으면 id 순으로 페이지를 나눈다."""
+    rows: list[Row] = []
+    for batch in iter_pages(supabase, table, columns, filters, page_size, order or ID_ORDER):
+        rows.extend(batch)
+    return rows
+
+
+def normalize_columns(columns: str) -> str:
+    names = [c.strip() for c in columns.split(",") if c.strip()]
+    return "*" if "*" in names else ",".join(names)
+
+
+def cache_key(table: str, columns: str, filters: dict[str, Any] | None) -> CacheKey:
+    return (
+        table,
+        normalize_columns(columns),
+        tuple(sorted((column, json.dumps(value, ensure_ascii=False)) for column, value in (filters or {}).items())),
+    )
+
+
+def same_value(stored: Any, wanted: Any) -> bool:
+    """PostgREST eq 와 같은 방식(문자열 비교, bool 은 true/false)으로 비교."""
+
+    def text(value: Any) -> str:
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        return "null" if value is None else str(value)
+
+    return text(stored) == text(wanted)
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class QueryCache:
+    """(테이블, 컬럼, eq 필터) -> 행 목록. 반환된 목록은 공유되므로 호출자가 수정하지 않는다."""
+
+    def __init__(self) -> None:
+        self.entries: dict[CacheKey, list[Row]] = {}
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> list[Row] | None:
+        with self._lock:
+            rows = self.entries.get(key)
+            if rows is None:
+                rows = self._derive(key)
+                if rows is not None:
+                    self.entries[key] = rows
+            if rows is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+            return rows
+
+    def _derive(self, key: CacheKey) -> list[Row] | None:
+        """같은 테이블을 "*" 로 받아둔 적이 있으면 eq 필터/컬럼 선택을 메모리에서 적용해 재사용."""
+        table, columns, filters = key
+        base = self.entries.get((table, "*", filters)) if columns != "*" else None
+        if base is None and filters:
+            full = self.entries.get((table, "*", ()))
+            if full is not None:
+                wanted = {column: json.loads(value) for column, value in filters}
+                base = [row for row in full if all(same_value(row.get(c), v) for c, v in wanted.items())]
+        if base is None:
+            return None
+        if columns == "*":
+            return base
+        names = columns.split(",")
+        return [{c: row.get(c) for c in names} for row in base]
+
+    def put(self, key: CacheKey, rows: list[Row]) -> None:
+        with self._lock:
+            self.entries[key] = rows
+
+    def invalidate(self, table: str | None = None) -> None:
+        with self._lock:
+            if table is None:
+                self.entries.clear()
+            else:
+                self.entries = {k: v for k, v in self.entries.items() if k[0] != table}
+
+    def tables(self) -> dict[str, list[Row]]:
+        """스냅샷 저장용: 필터 없이 전체 컬럼("*")으로 받아둔 테이블."""
+        with self._lock:
+            return {
+                table: rows
+                for (table, columns, filters), rows in self.entries.items()
+                if columns == "*" and not filters and table != "(query)"
+            }
+
+
+query_cache = QueryCache()
+
+
+def cached_rows(
+    table: str,
+    columns: str = "*",
+    filters: dict[str, Any] | None = None,
+    supabase: Any = None,
+) -> list[Row]:
+    key = cache_key(table, columns, filters)
+    rows = query_cache.get(key)
+    if rows is None:
+        rows = fetch_all_rows(supabase or get_client(), table, columns, filters)
+        query_cache.put(key, rows)
+    return rows
+
+
+def cached_query(key: str, loader: Callable[[], list[Row]]) -> list[Row]:
+    """페이지네이션이 필요 없는 임의 조회(order/limit 등)를 문자열 키로 캐시."""
+    cache_id: CacheKey = ("(query)", key, ())
+    rows = query_cache.get(cache_id)
+    if rows is None:
+        rows = loader()
+        query_cache.put(cache_id, rows)
+    return rows
+
+
+def save_snapshot(path: str, tables: dict[str, list[Row]] | None = None) -> dict[str, int]:
+    tables = query_cache.tables() if tables is None else tables
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(tables, f, ensure_ascii=False, default=str)
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def load_snapshot(path: str) -> dict[str, int]:
+    """스냅샷의 테이블을 "*" 조회 결과로 캐시에 올린다. 이후 cached_rows 는 네트워크 없이 응답."""
+    with open(path, "r", encoding="utf-8") as f:
+        tables: dict[str, list[Row]] = json.load(f)
+    for table, rows in tables.items():
+        query_cache.put(cache_key(table, "*", None), rows)
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def print_cache_stats() -> None:
+    stats = query_cache.stats
+    if stats.hits or stats.misses:
+        print(f"\n=== 쿼리 캐시 === 적중 {stats.hits}건 / 조회 {stats.misses}건")
@@ -0,0 +1,235 @@
+"""
+공용 Supabase 클라이언트 팩토리.
+
+- .env.local / 환경변수에서 접속 정보를 한 곳에서 읽는다.
+- httpx 커넥션 풀(keep-alive, HTTP/2, timeout)을 조정해 수천 건 요청에서도 연결을 재사용한다.
+- 테이블별 요청 수 / 송수신 바이트 / 지연시간을 실행 단위로 기록한다.
+- httpx / supabase 는 실제로 클라이언트를 만들 때 import 한다.
+  (조회용 짧은 스크립트와 CLI 시작 시간을 줄이기 위함)
+
+사용:
+    from lib.supabase_client import get_client, print_request_stats
+
+    supabase = get_client()
+    ...
+    print_request_stats()
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import httpx
+    from supabase import Client
+
+ENV_FILE = ".env.local"
+URL_ENV_KEYS = ("SUPABASE_URL", "NEXT_PUBLIC_SUPABASE_URL")
+KEY_ENV_KEYS = (
+    "SUPABASE_SERVICE_KEY",
+    "SUPABASE_SERVICE_ROLE_KEY",
+    "SUPABASE_KEY",
+    "NEXT_PUBLIC_SUPABASE_ANON_KEY",
+)
+
+POOL_MAX_CONNECTIONS = 20
+POOL_MAX_KEEPALIVE = 10
+POOL_KEEPALIVE_EXPIRY = 60.0
+POOL_TIMEOUT_SECONDS = 60.0
+POOL_CONNECT_TIMEOUT_SECONDS = 10.0
+REST_PATH_PREFIX = "/rest/v1/"
+_START_KEY = "peopleon_started_at"
+
+
+@dataclass
+class TableStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    elapsed: float = 0.0
+
+
+class RequestStats:
+    """테이블별 HTTP 요청 통계 (httpx event hook 으로 수집)."""
+
+    def __init__(self) -> None:
+        self.tables: dict[str, TableStats] = {}
+        self._lock = threading.Lock()
+        self._last = threading.local()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tables.clear()
+
+    def record_retry(self, table: str) -> None:
+        with self._lock:
+            self.tables.setdefault(table, TableStats()).retries += 1
+
+    def clear_last_status(self) -> None:
+        self._last.status = None
+
+    def last_status(self) -> int | None:
+        """이 스레드에서 마지막으로 받은 응답의 HTTP status (clear_last_status 이후 응답이 없으면 None)."""
+        return getattr(self._last, "status", None)
+
+    def on_request(self, request: httpx.Request) -> None:
+        request.extensions[_START_KEY] = time.perf_counter()
+
+    def on_response(self, response: httpx.Response) -> None:
+        response.read()
+        self._last.status = response.status_code
+        request = response.request
+        started = request.extensions.get(_START_KEY)
+        self.record(
+            table_from_path(request.url.path),
+            bytes_sent=len(request.content or b""),
+            bytes_received=len(response.content or b""),
+            elapsed=time.perf_counter() - started if started is not None else 0.0,
+            failed=response.status_code >= 400,
+        )
+
+    def record(self, table: str, bytes_sent: int, bytes_received: int, elapsed: float, failed: bool = False) -> None:
+        with self._lock:
+            entry = self.tables.setdefault(table, TableStats())
+            entry.requests += 1
+            if failed:
+                entry.errors += 1
+            entry.bytes_sent += bytes_sent
+            entry.bytes_received += bytes_received
+            entry.elapsed += elapsed
+
+    def totals(self) -> TableStats:
+        total = TableStats()
+        for entry in self.tables.values():
+            total.requests += entry.requests
+            total.errors += entry.errors
+            total.retries += entry.retries
+            total.bytes_sent += entry.bytes_sent
+            total.bytes_received += entry.bytes_received
+            total.elapsed += entry.elapsed
+        return total
+
+    def snapshot(self) -> dict[str, TableStats]:
+        with self._lock:
+            return {name: replace(entry) for name, entry in self.tables.items()}
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        return {name: vars(entry).copy() for name, entry in sorted(self.tables.items())}
+
+
+request_stats = RequestStats()
+_client: Client | None = None
+
+
+def table_from_path(path: str) -> str:
+    if path.startswith(REST_PATH_PREFIX):
+        return path[len(REST_PATH_PREFIX):].split("/", 1)[0] or "(rest)"
+    return path.strip("/").split("/", 1)[0] or "(root)"
+
+
+def load_env_file(path: str) -> dict[str, str]:
+    env: dict[str, str] = {}
+    if not os.path.exists(path):
+        return env
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            text = line.strip()
+            if not text or text.startswith("#") or "=" not in text:
+                continue
+            key, value = text.split("=", 1)
+            env[key.strip()] = value.strip().strip('"').strip("'")
+    return env
+
+
+def resolve_credentials(env_file: str = ENV_FILE) -> tuple[str, str]:
+    env_local = load_env_file(env_file)
+
+    def lookup(keys: tuple[str, ...]) -> str:
+        for name in keys:
+            value = os.environ.get(name) or env_local.get(name)
+            if value:
+                return value
+        return ""
+
+    url = lookup(URL_ENV_KEYS)
+    key = lookup(KEY_ENV_KEYS)
+    if not url or not key:
+        raise RuntimeError("Supabase 연결 정보가 없습니다. (.env.local 또는 SUPABASE_URL/SUPABASE_SERVICE_KEY)")
+    return url, key
+
+
+def http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_http_client(stats: RequestStats = request_stats) -> httpx.Client:
+    import httpx
+
+    return httpx.Client(
+        http2=http2_available(),
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(POOL_TIMEOUT_SECONDS, connect=POOL_CONNECT_TIMEOUT_SECONDS),
+        event_hooks={"request": [stats.on_request], "response": [stats.on_response]},
+    )
+
+
+def create_supabase(env_file: str = ENV_FILE) -> Client:
+    """풀링/계측이 적용된 새 클라이언트를 만든다. 보통은 get_client() 를 사용."""
+    from supabase import ClientOptions, create_client
+
+    url, key = resolve_credentials(env_file)
+    http_client = build_http_client()
+    try:
+        options = ClientOptions(httpx_client=http_client)
+    except TypeError:
+        # httpx_client 옵션이 없는 구버전 supabase-py: 기본 세션에 계측 hook 만 연결
+        client = create_client(url, key)
+        session = client.postgrest.session
+        session.event_hooks["request"].append(request_stats.on_request)
+        session.event_hooks["response"].append(request_stats.on_response)
+        return client
+    return create_client(url, key, options=options)
+
+
+def get_client() -> Client:
+    """프로세스 전체에서 공유하는 클라이언트."""
+    global _client
+    if _client is None:
+        _client = create_supabase()
+    return _client
+
+
+def use_client(client: Any) -> None:
+    """get_client() 가 돌려줄 클라이언트를 교체한다. (벤치마크용 FakeSupabase 주입 등)"""
+    global _client
+    _client = client
+
+
+def print_request_stats(stats: RequestStats = request_stats) -> None:
+    if not stats.tables:
+        return
+    print("\n=== 요청 통계 (테이블별) ===")
+    for name, entry in sorted(stats.tables.items(), key=lambda item: -item[1].elapsed):
+        print(
+            f"- {name}: {entry.requests}건 (오류 {entry.errors}, 재시도 {entry.retries}) / "
+            f"송신 {entry.bytes_sent:,}B / 수신 {entry.bytes_received:,}B / {entry.elapsed:.2f}s"
+        )
+    total = stats.totals()
+    print(
+        f"합계: {total.requests}건 / 송신 {total.bytes_sent:,}B / "
+        f"수신 {total.bytes_received:,}B / {total.elapsed:.2f}s"
+    )
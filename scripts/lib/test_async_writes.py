@@ -0,0 +1,116 @@
+"""
+lib/async_writes.py 재시도 판정 테스트.
+
+postgrest 의 APIError 는 응답 본문이 JSON 이면 APIError(r.json()) 로 만들어져
+.response 가 없고 .code 가 PGRST000 같은 PostgREST/SQLSTATE 코드다.
+재시도 여부는 httpx 응답 hook(request_stats.on_response)이 기록한 HTTP status 로 판단해야 한다.
+
+사용:
+    cd scripts && python -m unittest lib.test_async_writes
+    cd scripts && python -m pytest -q lib/test_async_writes.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from lib import async_writes  # noqa: E402
+from lib.async_writes import UpdateOp, retryable_status, run_with_retry  # noqa: E402
+from lib.supabase_client import request_stats  # noqa: E402
+
+
+class FakeAPIError(Exception):
+    """postgrest.exceptions.APIError 처럼 JSON 본문 dict 만 가진 예외."""
+
+    def __init__(self, error: dict[str, Any]) -> None:
+        super().__init__(error.get("message"))
+        self.code = error.get("code")
+        self.message = error.get("message")
+
+
+def fake_response(status: int, table: str = "members") -> SimpleNamespace:
+    request = SimpleNamespace(url=SimpleNamespace(path=f"/rest/v1/{table}"), content=b"{}", extensions={})
+    return SimpleNamespace(status_code=status, request=request, content=b"{}", read=lambda: b"{}")
+
+
+class FakeQuery:
+    def __init__(self, client: "FakeClient") -> None:
+        self.client = client
+
+    def update(self, payload: dict[str, Any]) -> "FakeQuery":
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        status, body = self.client.responses.pop(0)
+        self.client.calls += 1
+        # 실제 클라이언트처럼 예외가 나기 전에 응답 hook 이 먼저 돈다
+        request_stats.on_response(fake_response(status))
+        if status >= 400:
+            raise FakeAPIError(body)
+        return SimpleNamespace(data=[{"id": "1"}])
+
+
+class FakeClient:
+    def __init__(self, responses: list[tuple[int, dict[str, Any]]]) -> None:
+        self.responses = responses
+        self.calls = 0
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self)
+
+
+class RetryableStatusTest(unittest.TestCase):
+    def setUp(self) -> None:
+        request_stats.reset()
+        request_stats.clear_last_status()
+        patcher = mock.patch.object(async_writes.time, "sleep")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_json_body_code_is_not_http_status(self) -> None:
+        exc = FakeAPIError({"code": "PGRST000", "message": "Could not connect"})
+        self.assertTrue(retryable_status(exc, 503))
+        self.assertTrue(retryable_status(exc, 429))
+        self.assertFalse(retryable_status(exc, 400))
+
+    def test_non_json_body_falls_back_to_code(self) -> None:
+        # generate_default_error_message 경로: code 에 HTTP status 가 들어 있다
+        self.assertTrue(retryable_status(FakeAPIError({"code": "502", "message": "Bad Gateway"})))
+        self.assertFalse(retryable_status(FakeAPIError({"code": "404", "message": "Not Found"})))
+
+    def test_503_with_json_body_is_retried(self) -> None:
+        client = FakeClient([(503, {"code": "PGRST000", "message": "Could not connect"}), (200, {})])
+        result = run_with_retry(client, UpdateOp("members", "1", {"name": "김철수"}), max_retries=3)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(request_stats.tables["members"].retries, 1)
+
+    def test_429_is_retried(self) -> None:
+        body = {"code": "PGRST000", "message": "Too Many Requests"}
+        client = FakeClient([(429, body), (429, body), (200, {})])
+        result = run_with_retry(client, UpdateOp("members", "1", {"name": "김철수"}), max_retries=3)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.attempts, 3)
+
+    def test_400_with_json_body_is_not_retried(self) -> None:
+        client = FakeClient([(400, {"code": "PGRST204", "message": "Column not found"}), (200, {})])
+        result = run_with_retry(client, UpdateOp("members", "1", {"name": "김철수"}), max_retries=3)
+        self.assertFalse(result.ok)
+        self.assertEqual(result.attempts, 1)
+        self.assertEqual(client.calls, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+"""
+lib/normalize.py 대조 테스트.
+
+공용 모듈로 옮기기 전의 구현(sync_latest_address_book.py, sync_member_number_to_legacy_cert.py,
+migrate_rights_data.py, step1_main.py)을 그대로 복사해 두고, 까다로운 이름/전화번호 모음에 대해 결과가 같은지 확인한다.
+(기존 is_nan_like 의 pd.isna(float) 는 pandas 없이 돌도록 math.isnan 으로 바꿨다. float 에서는 같은 판정)
+
+사용:
+    cd scripts && python -m unittest lib.test_normalize
+    cd scripts && python -m pytest -q lib/test_normalize.py
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import sys
+import unittest
+from typing import Any
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from lib import normalize  # noqa: E402
+
+ANNOTATION_WORDS = ("별세", "시동생", "없는사람")
+
+
+# --- sync_latest_address_book.py (기존 구현) ---
+
+
+def legacy_is_nan_like(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    text = str(value).strip()
+    return text == "" or text.lower() == "nan"
+
+
+def legacy_as_text(value: Any) -> str:
+    if legacy_is_nan_like(value):
+        return ""
+    return str(value).strip()
+
+
+def legacy_normalize_spaces(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def legacy_clean_name_for_display(raw_name: str) -> str:
+    text = raw_name.replace("\r", " ").replace("\n", " ")
+    text = text.replace("?", "")
+    text = text.strip()
+    text = re.sub(r"\s+", " ", text)
+    return text
+
+
+def legacy_normalize_name_key(text: str) -> str:
+    return re.sub(r"\s+", "", text).strip()
+
+
+def legacy_strip_annotations(name: str) -> str:
+    text = name.replace("?", "").replace("X", "")
+    text = text.replace("\r", " ").replace("\n", " ")
+    for word in ANNOTATION_WORDS:
+        text = text.replace(word, "")
+    text = re.sub(r"\(\s*\)", "", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def legacy_normalize_phone(value: str) -> str:
+    if not value:
+        return ""
+    digits = re.sub(r"\D", "", value)
+    return digits if len(digits) >= 8 else ""
+
+
+# --- sync_member_number_to_legacy_cert.py (기존 구현) ---
+
+
+def legacy_member_as_text(value: Any) -> str:
+    if value is None:
+        return ""
+    text = str(value).strip()
+    if text.lower() == "nan":
+        return ""
+    return text
+
+
+def legacy_member_name_key(name: Any) -> str:
+    text = legacy_member_as_text(name).replace("?", "").replace("X", "")
+    for word in ANNOTATION_WORDS:
+        text = text.replace(word, "")
+    text = text.replace("\r", " ").replace("\n", " ")
+    text = re.sub(r"\s+", "", text)
+    text = re.sub(r"\(\s*\)", "", text)
+    return text.strip()
+
+
+# --- migrate_rights_data.py MigrationManager.normalize_name (기존 구현, pd.isna 스칼라 판정) ---
+
+
+def legacy_migration_normalize_name(name: Any) -> str | None:
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return None
+    return str(name).strip().replace(" ", "")
+
+
+# --- step1_main.py clean_name (기존 구현, pd.isna 스칼라 판정) ---
+
+
+def legacy_step1_clean_name(name: Any) -> str:
+    if name is None or (isinstance(name, float) and math.isnan(name)):
+        return "이름미상"
+    return str(name).strip()
+
+
+NAMES: list[Any] = [
+    "김철수",
+    " 홍 길동 ",
+    "홍　길동",
+    "우승용X\n(없는사람)\n안현숙",
+    "신금수(신재빈)",
+    "이영희(별세)",
+    "이영희 ( 별세 )",
+    "( 별세 )",
+    "(( ))",
+    "(()",
+    "김?순",
+    "김X순 (시동생)",
+    "박\r\n민수",
+    "별\n세",
+    "a\tb",
+    "  \t ",
+    "nan",
+    "NaN",
+    " nan ",
+    "",
+    None,
+    float("nan"),
+    12345,
+    3.5,
+    "Kim Chul-soo",
+    "최 (  ) 영",
+]
+
+PHONES = [
+    "010-1234-5678",
+    "010 1234 5678",
+    "(02) 123-4567",
+    "02-123-456",
+    "1234567",
+    "+82 10-1234-5678",
+    "연락처: 010.9876.5432 (본인)",
+    "",
+]
+
+
+class NormalizeParityTest(unittest.TestCase):
+    def setUp(self) -> None:
+        for fn in (
+            normalize.normalize_spaces,
+            normalize.clean_name_for_display,
+            normalize.normalize_name_key,
+            normalize.strip_annotations,
+            normalize._simple_name_key,
+            normalize.normalize_phone,
+        ):
+            fn.cache_clear()
+
+    def test_as_text(self) -> None:
+        for value in NAMES:
+            with self.subTest(value=value):
+                self.assertEqual(normalize.is_nan_like(value), legacy_is_nan_like(value))
+                self.assertEqual(normalize.as_text(value), legacy_as_text(value))
+                self.assertEqual(normalize.as_text(value), legacy_member_as_text(value))
+
+    def test_sync_latest_text_functions(self) -> None:
+        for value in NAMES:
+            text = legacy_as_text(value)
+            with self.subTest(value=value):
+                self.assertEqual(normalize.normalize_spaces(text), legacy_normalize_spaces(text))
+                self.assertEqual(normalize.clean_name_for_display(text), legacy_clean_name_for_display(text))
+                self.assertEqual(normalize.normalize_name_key(text), legacy_normalize_name_key(text))
+                self.assertEqual(normalize.strip_annotations(text), legacy_strip_annotations(text))
+
+    def test_simple_name_key(self) -> None:
+        for value in NAMES:
+            with self.subTest(value=value):
+                self.assertEqual(normalize.simple_name_key(value), legacy_member_name_key(value))
+                text = legacy_as_text(value)
+                # import_resident_registry 의 simple_key(normalize_name_key(strip_annotations(...)))와도 같다
+                self.assertEqual(
+                    normalize.simple_name_key(text), legacy_normalize_name_key(legacy_strip_annotations(text))
+                )
+
+    def test_name_without_spaces(self) -> None:
+        for value in NAMES:
+            with self.subTest(value=value):
+                self.assertEqual(normalize.name_without_spaces(value), legacy_migration_normalize_name(value))
+
+    def test_step1_clean_name(self) -> None:
+        for value in NAMES:
+            with self.subTest(value=value):
+                # step1_main.clean_name 은 import 시 바로 실행되는 스크립트라 같은 식을 여기서 확인한다
+                actual = "이름미상" if normalize.is_missing(value) else str(value).strip()
+                self.assertEqual(actual, legacy_step1_clean_name(value))
+
+    def test_normalize_phone(self) -> None:
+        for value in PHONES:
+            with self.subTest(value=value):
+                self.assertEqual(normalize.normalize_phone(value), legacy_normalize_phone(value))
+
+    def test_is_missing(self) -> None:
+        self.assertTrue(normalize.is_missing(None))
+        self.assertTrue(normalize.is_missing(float("nan")))
+        self.assertFalse(normalize.is_missing(""))
+        self.assertFalse(normalize.is_missing("nan"))
+        self.assertFalse(normalize.is_missing(0))
+
+    def test_repeated_names_hit_cache(self) -> None:
+        for _ in range(3):
+            for value in NAMES:
+                normalize.simple_name_key(value)
+        info = normalize.cache_info()["simple_name_key"]
+        distinct = len({legacy_as_text(value) for value in NAMES})
+        self.assertEqual(info.misses, distinct)
+        self.assertEqual(info.hits, len(NAMES) * 3 - distinct)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,20 @@
+-- member_payments.updated_at 자동 갱신 + 증분 조회용 인덱스.
+-- rollup_deposit_cashflow.py 는 updated_at 워터마크 이후의 행만 다시 읽으므로,
+-- 앱에서 updated_at 을 넣지 않는 update 도 시각이 바뀌도록 트리거로 보장한다.
+-- 트리거 함수는 accounting_domain_phase3_constraints.sql 의 공통 public.set_updated_at() 을 쓴다.
+-- Run this in Supabase SQL Editor.
+
+do $$
+begin
+    if to_regprocedure('public.set_updated_at()') is null then
+        raise exception 'public.set_updated_at() 가 없습니다. accounting_domain_phase3_constraints.sql 을 먼저 실행하세요.';
+    end if;
+end $$;
+
+drop trigger if exists trg_member_payments_updated_at on public.member_payments;
+create trigger trg_member_payments_updated_at
+before update on public.member_payments
+for each row execute function public.set_updated_at();
+
+create index if not exists idx_member_payments_updated_at
+    on public.member_payments(updated_at, id);
@@ -3,13 +3,28 @@
 - Main Source: 권리증_최종정리_완전판(이름순).xlsx (정규화 데이터)
 - Raw Source: 권리증현황(보관및호환용).xls (모든 시트 데이터)
 - Target: Supabase 'legacy_records' table
+
+원본 파일은 시트가 많아 --workers N 으로 시트 파싱/변환을 프로세스 N개에 나눠 돌릴 수 있다.
+(병합은 부모 프로세스에서 시트 순서대로 하므로 결과는 순차 실행과 같다)
 """
 
 import os
+import sys
 import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 import pandas as pd
 import numpy as np
-from supabase import create_client, Client
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.checkpoint import Journal, default_journal_path
+from lib.instrumentation import Instrumentation
+from lib.normalize import name_without_spaces
+from lib.profiling import Profiler
+from lib.supabase_client import get_client, print_request_stats
 
 # ============================================
 # 설정
@@ -17,24 +32,17 @@ from supabase import create_client, Client
 MAIN_FILE = "data/권리증_최종정리_완전판(이름순).xlsx"
 RAW_FILE = "data/권리증현황(보관및호환용).xls"
 
-SUPABASE_URL = os.environ.get("SUPABASE_URL")
-SUPABASE_KEY = os.environ.get("SUPABASE_SERVICE_KEY")
-
 class MigrationManager:
-    def __init__(self, dry_run=True):
+    def __init__(self, dry_run=True, resume=False):
         self.dry_run = dry_run
+        self.resume = resume
         self.merged_data = {}  # {name: record_dict}
-        self.supabase = self._init_supabase() if not dry_run else None
-
-    def _init_supabase(self):
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise ValueError("SUPABASE_URL/KEY 환경변수 필요")
-        return create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.metrics = Instrumentation("migrate_rights_data")
+        self.supabase = get_client() if not dry_run else None
 
     def normalize_name(self, name):
         """이름 정규화 (공백 제거)"""
-        if pd.isna(name): return None
-        return str(name).strip().replace(" ", "")
+        return name_without_spaces(name)
 
     def smart_read_sheet(self, file_path, sheet_name):
         """헤더 위치를 자동으로 찾아서 읽기"""
@@ -81,20 +89,28 @@ class MigrationManager:
         """메인 파일(정규화된 데이터) 처리"""
         print(f"\n[1/4] 메인 파일 처리: {MAIN_FILE}")
         df = pd.read_excel(MAIN_FILE)
-        
-        for _, row in df.iterrows():
-            name = self.normalize_name(row.get("성명"))
-            if not name: continue
-            
+        names = self._column_names(df, "성명")
+        df = df[[bool(name) for name in names]].reset_index(drop=True)
+        names = [name for name in names if name]
+
+        # 열 단위로 한 번에 변환한 뒤 행마다 조립
+        rights_counts = self._rights_counts(df)
+        contacts = self._extract_contacts(df)
+        addresses = self._extract_addresses(df)
+        certificates = self._extract_certificates(df)
+        status_flags = self._extract_status_flags(df)
+        row_jsons = self._frame_to_json(df)
+
+        for i, name in enumerate(names):
             # V2 로직 재사용: 기본 필드 추출
             record = {
                 "original_name": name,
-                "rights_count": int(row["권리증수"]) if pd.notna(row.get("권리증수")) else 0,
-                "contacts": self._extract_contacts(row),
-                "addresses": self._extract_addresses(row),
-                "certificates": self._extract_certificates(row),
-                "status_flags": self._extract_status_flags(row),
-                "raw_data": {"MainSource": self._row_to_json(row)},
+                "rights_count": rights_counts[i],
+                "contacts": contacts[i],
+                "addresses": addresses[i],
+                "certificates": certificates[i],
+                "status_flags": status_flags[i],
+                "raw_data": {"MainSource": row_jsons[i]},
                 "source_file": "권리증_최종정리_완전판",
                 "is_refunded": True,
                 "extra_info": {}  # Schema compatibility
@@ -102,52 +118,72 @@ class MigrationManager:
             
             self.merged_data[name] = record
 
-    def process_raw_file(self):
-        """원본 파일(모든 시트) 처리 및 병합"""
+    def process_raw_file(self, workers=1):
+        """원본 파일(모든 시트) 처리 및 병합
+
+        workers > 1 이면 시트 파싱/변환을 프로세스 풀에서 병렬로 하고,
+        결과는 시트 순서대로 받아 병합한다 (같은 이름의 list 누적 순서도 순차 실행과 같다).
+        """
         print(f"\n[2/4] 원본 파일 통합: {RAW_FILE}")
         xls = pd.ExcelFile(RAW_FILE)
-        
-        for sheet in xls.sheet_names:
-            print(f"  - 시트 분석: {sheet}")
-            df, name_col = self.smart_read_sheet(RAW_FILE, sheet)
+        sheets = list(xls.sheet_names)
+
+        if workers <= 1 or len(sheets) <= 1:
+            for sheet in sheets:
+                self.merge_sheet_rows(sheet, self.sheet_rows(RAW_FILE, sheet))
+            return
+
+        print(f"  (프로세스 {min(workers, len(sheets))}개로 시트 병렬 처리)")
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheets))) as executor:
+            # map 은 제출 순서대로 결과를 돌려준다 -> 시트 순서대로 결정적으로 병합
+            for sheet, rows in zip(sheets, executor.map(parse_raw_sheet, [RAW_FILE] * len(sheets), sheets)):
+                self.merge_sheet_rows(sheet, rows)
+
+    def sheet_rows(self, file_path, sheet):
+        """시트 하나를 [(정규화 이름, row_json)] 로 변환 (행 순서 유지). 이름 컬럼이 없으면 None."""
+        df, name_col = self.smart_read_sheet(file_path, sheet)
+        if df is None or not name_col:
+            return None
+
+        names = self._column_names(df, name_col)
+        named = df[[bool(name) for name in names]]
+        return list(zip([name for name in names if name], self._frame_to_json(named)))
+
+    def merge_sheet_rows(self, sheet, rows):
+        """sheet_rows 결과를 merged_data 에 병합"""
+        print(f"  - 시트 분석: {sheet}")
+        if rows is None:
+            print(f"    Pass (이름 컬럼 미확인)")
+            return
+
+        count = 0
+        for name, row_json in rows:
+            # 기존 데이터에 병합 or 신규 생성
+            if name not in self.merged_data:
+                self.merged_data[name] = {
+                    "original_name": name,
+                    "rights_count": 0,
+                    "is_refunded": True,
+                    "raw_data": {}
+                }
             
-            if df is None or not name_col:
-                print(f"    Pass (이름 컬럼 미확인)")
-                continue
-                
-            count = 0
-            for _, row in df.iterrows():
-                name = self.normalize_name(row.get(name_col))
-                if not name: continue
-                
-                row_json = self._row_to_json(row)
-                
-                # 기존 데이터에 병합 or 신규 생성
-                if name not in self.merged_data:
-                    self.merged_data[name] = {
-                        "original_name": name,
-                        "rights_count": 0,
-                        "is_refunded": True,
-                        "raw_data": {}
-                    }
-                
-                # raw_data에 시트별 데이터 추가
-                if "raw_data" not in self.merged_data[name]:
-                    self.merged_data[name]["raw_data"] = {}
-                
-                # 시트 이름 중복 방지 (Append list if needed, here simple overwrite/append)
-                if sheet in self.merged_data[name]["raw_data"]:
-                   # 이미 해당 시트 데이터가 있으면 리스트로 변환하여 추가
-                   existing = self.merged_data[name]["raw_data"][sheet]
-                   if isinstance(existing, list):
-                       existing.append(row_json)
-                   else:
-                       self.merged_data[name]["raw_data"][sheet] = [existing, row_json]
-                else:
-                    self.merged_data[name]["raw_data"][sheet] = row_json
-                
-                count += 1
-            print(f"    -> {count}건 병합")
+            # raw_data에 시트별 데이터 추가
+            if "raw_data" not in self.merged_data[name]:
+                self.merged_data[name]["raw_data"] = {}
+            
+            # 시트 이름 중복 방지 (Append list if needed, here simple overwrite/append)
+            if sheet in self.merged_data[name]["raw_data"]:
+               # 이미 해당 시트 데이터가 있으면 리스트로 변환하여 추가
+               existing = self.merged_data[name]["raw_data"][sheet]
+               if isinstance(existing, list):
+                   existing.append(row_json)
+               else:
+                   self.merged_data[name]["raw_data"][sheet] = [existing, row_json]
+            else:
+                self.merged_data[name]["raw_data"][sheet] = row_json
+            
+            count += 1
+        print(f"    -> {count}건 병합")
 
     def match_with_supbase(self):
         """Supabase 멤버와 매칭"""
@@ -205,67 +241,154 @@ class MigrationManager:
                 print("  샘플 데이터 (raw_data keys):", clean_records[0].get("raw_data", {}).keys())
         else:
             batch_size = 50
-            for i in range(0, len(clean_records), batch_size):
-                batch = clean_records[i:i+batch_size]
-                try:
-                    self.supabase.table("legacy_records").upsert(batch, on_conflict="original_name").execute()
-                    print(f"  Progress: {i + len(batch)} / {len(clean_records)}")
-                except Exception as e:
-                    print(f"  ❌ Error batch {i}: {e}")
-
-    # --- Helper Functions ---
-    def _extract_contacts(self, row):
-        contacts = []
-        for i in range(1, 5):
-            val = row.get(f"연락처_{i}")
-            if pd.notna(val): contacts.append(str(val).strip())
-        return contacts
-
-    def _extract_addresses(self, row):
-        addrs = []
-        for i in range(1, 4):
-            val = row.get(f"주소_{i}")
-            if pd.notna(val): addrs.append(str(val).strip())
-        return addrs
-
-    def _extract_certificates(self, row):
-        certs = []
+            # 완료된 배치 번호를 저널에 기록 (--resume 시 건너뜀)
+            with Journal(default_journal_path("migrate_rights_data"), resume=self.resume) as journal:
+                for i in range(0, len(clean_records), batch_size):
+                    batch = clean_records[i:i+batch_size]
+                    batch_key = f"upload_batch:{i // batch_size}"
+                    if journal.done(batch_key):
+                        continue
+                    try:
+                        self.supabase.table("legacy_records").upsert(batch, on_conflict="original_name").execute()
+                        journal.mark(batch_key)
+                        print(f"  Progress: {i + len(batch)} / {len(clean_records)}")
+                    except Exception as e:
+                        print(f"  ❌ Error batch {i}: {e}")
+                if journal.skipped:
+                    print(f"  재개: 완료된 배치 {journal.skipped}개 건너뜀")
+
+    # --- Helper Functions (열 단위 변환: 결과는 df 행 순서대로 한 행에 하나) ---
+    def _column_names(self, df, name_col):
+        if name_col not in df.columns:
+            return [None] * len(df)
+        return [self.normalize_name(v) for v in df[name_col].tolist()]
+
+    def _rights_counts(self, df):
+        if "권리증수" not in df.columns:
+            return [0] * len(df)
+        col = df["권리증수"]
+        return [int(v) if notna else 0 for v, notna in zip(col.tolist(), col.notna().tolist())]
+
+    def _slot_lists(self, df, slots):
+        """slots: 슬롯 순서대로 값 Series (결측=None). 긴 형태로 녹여 행마다 결측이 아닌 값 list 로 모은다."""
+        result = [[] for _ in range(len(df))]
+        if not slots:
+            return result
+        wide = pd.DataFrame({i: values.to_numpy(dtype=object) for i, values in enumerate(slots)})
+        long = wide.melt(ignore_index=False, var_name="slot", value_name="value").dropna(subset=["value"])
+        long = long.rename_axis("pos").sort_values(["pos", "slot"], kind="stable")
+        for pos, value in zip(long.index.tolist(), long["value"].tolist()):
+            result[pos].append(value)
+        return result
+
+    def _stripped_slots(self, df, prefix, count):
+        slots = []
+        for i in range(1, count + 1):
+            col = f"{prefix}{i}"
+            if col in df.columns:
+                slots.append(column_str(df[col]).str.strip().where(df[col].notna(), None))
+        return slots
+
+    def _extract_contacts(self, df):
+        return self._slot_lists(df, self._stripped_slots(df, "연락처_", 4))
+
+    def _extract_addresses(self, df):
+        return self._slot_lists(df, self._stripped_slots(df, "주소_", 3))
+
+    def _extract_certificates(self, df):
+        slots = []
         for i in range(1, 5):
-            no = row.get(f"필증NO_{i}")
-            if pd.notna(no):
-                certs.append({
-                    "no": str(no),
-                    "name": str(row.get(f"필증성명_{i}", "")),
-                    "date": str(row.get(f"필증일자_{i}", "")),
-                    "price": str(row.get(f"가격_{i}", ""))
-                })
-        return certs
-        
-    def _extract_status_flags(self, row):
-        flags = {}
+            no_col = f"필증NO_{i}"
+            if no_col not in df.columns:
+                continue
+            present = df[no_col].notna().to_numpy()
+            # 없는 열은 row.get(col, "") 처럼 "" (있으면 결측도 str 그대로 "nan")
+            fields = [column_str(df[no_col])] + [
+                column_str(df[col]) if col in df.columns else pd.Series("", index=df.index, dtype=object)
+                for col in (f"필증성명_{i}", f"필증일자_{i}", f"가격_{i}")
+            ]
+            certs = [
+                {"no": no, "name": name, "date": date, "price": price} if keep else None
+                for keep, no, name, date, price in zip(present, *(f.tolist() for f in fields))
+            ]
+            slots.append(pd.Series(certs, index=df.index, dtype=object))
+        return self._slot_lists(df, slots)
+
+    def _extract_status_flags(self, df):
+        flags = [{} for _ in range(len(df))]
         for col in ["권리위임", "서류제출", "모임참석"]:
-            if pd.notna(row.get(col)): flags[col] = str(row[col])
+            if col not in df.columns:
+                continue
+            for i, (text, notna) in enumerate(zip(column_str(df[col]).tolist(), df[col].notna().tolist())):
+                if notna: flags[i][col] = text
         return flags
 
-    def _row_to_json(self, row):
-        """Pandas Row -> JSON Dictionary (Handle NaN)"""
-        d = {}
-        for k, v in row.items():
-            if pd.notna(v):
-                # Timestamp 처리
-                if isinstance(v, pd.Timestamp):
-                    d[k] = v.strftime('%Y-%m-%d')
-                else:
-                    d[k] = str(v)
-        return d
+    def _frame_to_json(self, df):
+        """DataFrame -> 행별 JSON Dictionary (NaN 제외, 날짜는 YYYY-MM-DD)"""
+        texts = pd.DataFrame(
+            {col: column_json_text(df[col]).where(df[col].notna(), None) for col in df.columns},
+            index=df.index,
+            dtype=object,
+        )
+        return [{k: v for k, v in record.items() if v is not None} for record in texts.to_dict("records")]
+
+# 값에 Timestamp 가 섞일 수 없는 object 열 (infer_dtype 결과) -> astype(str) 한 번으로 충분
+PLAIN_OBJECT_KINDS = {"string", "empty", "integer", "floating", "mixed-integer-float", "boolean", "decimal", "complex"}
+
+
+def column_str(series):
+    """열의 모든 값(결측 포함)을 str(v) 로. 행 단위 str(row[col]) 과 같은 결과."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.astype(object).map(str)
+    text = series.astype(str).astype(object)
+    missing = series.isna()
+    if missing.any():
+        # astype(str) 는 결측을 남겨 두므로 str(nan) / str(None) / str(NaT) 로 채운다
+        text[missing] = [str(v) for v in series[missing].tolist()]
+    return text
+
+
+def column_json_text(series):
+    """raw_data 값 문자열화: Timestamp 는 YYYY-MM-DD, 나머지는 str (결측 위치 값은 의미 없음)."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime("%Y-%m-%d").astype(object)
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) not in PLAIN_OBJECT_KINDS:
+        return series.map(
+            lambda v: v.strftime("%Y-%m-%d") if isinstance(v, pd.Timestamp) else str(v), na_action="ignore"
+        ).astype(object)
+    return series.astype(str).astype(object)
+
+
+def parse_raw_sheet(file_path, sheet):
+    """프로세스 풀 작업: 시트 하나를 읽고 변환해 [(이름, row_json)] 만 돌려준다 (DB 연결 없음)."""
+    return MigrationManager(dry_run=True).sheet_rows(file_path, sheet)
+
 
 if __name__ == "__main__":
     import sys
     dry_run = "--run" not in sys.argv
+    resume = "--resume" in sys.argv
+    # --workers N: 원본 파일 시트 병렬 처리 프로세스 수 (기본 1=순차, 0=CPU 수)
+    workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 1
+    workers = workers or os.cpu_count() or 1
+    metrics_json = sys.argv[sys.argv.index("--metrics-json") + 1] if "--metrics-json" in sys.argv else None
+    # --profile <경로.prof|경로.collapsed> [--profile-phase main_file|raw_file|match|upload]
+    profile_path = sys.argv[sys.argv.index("--profile") + 1] if "--profile" in sys.argv else None
+    profile_phase = sys.argv[sys.argv.index("--profile-phase") + 1] if "--profile-phase" in sys.argv else None
     
-    mgr = MigrationManager(dry_run)
-    mgr.process_main_file()
-    mgr.process_raw_file()
-    mgr.match_with_supbase()
-    mgr.upload()
+    mgr = MigrationManager(dry_run, resume)
+    with Profiler(profile_path, profile_phase).running() if profile_path else nullcontext():
+        with mgr.metrics.phase("main_file"):
+            mgr.process_main_file()
+        with mgr.metrics.phase("raw_file"):
+            mgr.process_raw_file(workers)
+        with mgr.metrics.phase("match"):
+            mgr.match_with_supbase()
+        with mgr.metrics.phase("upload"):
+            mgr.upload()
+    mgr.metrics.count("records", len(mgr.merged_data))
+    print_request_stats()
+    mgr.metrics.print_report()
+    if metrics_json:
+        mgr.metrics.write_json(metrics_json)
 
@@ -0,0 +1,273 @@
+"""
+PeopleOn 운영 스크립트 통합 CLI.
+
+하위 명령은 실행할 때 해당 모듈만 import 한다. (pandas / supabase 등 무거운 의존성은
+실제로 그 명령이 필요할 때만 로드)
+한 프로세스 안에서는 클라이언트(get_client)와 쿼리 캐시(lib.queries)를 공유하므로
+'+' 로 명령을 이어 붙이거나 shell 에서 여러 조회를 해도 같은 테이블은 한 번만 내려받는다.
+DB 에 쓰는 명령이 끝나면 캐시를 비운다.
+
+사용:
+    python scripts/peopleon.py                      # 명령 목록
+    python scripts/peopleon.py search 김점이 + dossier 김점이 + shared-certs
+    python scripts/peopleon.py --snapshot data/snapshots/today.json search 05-1-6
+    python scripts/peopleon.py snapshot --out data/snapshots/today.json
+    python scripts/peopleon.py shell
+    python scripts/peopleon.py sync-address-book --apply --concurrency 8
+    python scripts/peopleon.py startup-check        # 조회용 명령 시작 시간 예산 점검
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+PROG = "peopleon"
+# 조회용(lightweight) 명령의 시작 시간 예산: 인터프리터 기동 + 모듈 import 까지
+DEFAULT_STARTUP_BUDGET_MS = 300
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl", "supabase", "postgrest", "httpx")
+
+
+@dataclass(frozen=True)
+class Command:
+    module: str
+    help: str
+    func: str = "main"
+    # True 면 import 시점에 HEAVY_MODULES 를 로드하지 않아야 하고 시작 시간 예산을 적용
+    lightweight: bool = False
+    # True 면 실행 후 쿼리 캐시를 비운다
+    writes: bool = False
+
+
+COMMANDS: dict[str, Command] = {
+    "search": Command("search_records", "이름/전화번호/권리증 번호 통합 검색", lightweight=True),
+    "dossier": Command("person_dossier", "인물 종합 조회 (entity id 또는 이름)", lightweight=True),
+    "audit-tail": Command("audit_tail", "audit_logs / system_audit_logs 최근 기록 및 추적 (-f)", lightweight=True),
+    "member-no": Command("check_member_no", "account_entities 조합번호 조회", lightweight=True),
+    "owner": Command("find_owner", "권리증(certificate_registry) 보유자 조회", lightweight=True),
+    "cert-record": Command("view_05_record", "certificate_registry 레코드 조회", lightweight=True),
+    "rights-stats": Command("analyze_rights_stats", "권리증 보유 현황 통계 (xlsx/JSON 보고서)", func="analyze_rights", lightweight=True),
+    "shared-certs": Command("detect_shared_certificates", "권리증 번호 공유 탐지", lightweight=True),
+    "duplicates": Command("find_duplicate_entities", "중복 인물 후보 탐지", lightweight=True),
+    "sync-address-book": Command("sync_latest_address_book", "최신주소(피플용).xlsx 동기화", writes=True),
+    "sync-member-number": Command("sync_member_number_to_legacy_cert", "조합번호 -> 권리증번호 반영", writes=True),
+    "recalc-rights": Command(
+        "recalculate_rights_count_from_cert_numbers", "권리증 번호 기준 rights_count 재계산", writes=True
+    ),
+    "import-resident-registry": Command(
+        "import_resident_registry", "주민등록번호 엑셀 -> secure_resident_registry 일괄 반영", writes=True
+    ),
+    "reconcile-payments": Command("reconcile_member_payments", "분담금 기준액 대비 수납/미납 대사 보고서"),
+    "cashflow-rollup": Command("rollup_deposit_cashflow", "입금 계좌별 일/월 현금흐름 집계 (증분 갱신)", lightweight=True),
+    "export-refunded": Command("export_refunded_rights", "권리증 보유 환불자 명단 저장 (xlsx/csv/parquet)", lightweight=True),
+}
+BUILTINS = {
+    "snapshot": "캐시된/지정 테이블을 JSON 스냅샷으로 저장",
+    "shell": "대화형으로 명령을 이어서 실행 (캐시 공유)",
+    "startup-check": "조회용 명령 시작 시간 예산 점검",
+}
+SNAPSHOT_TABLES = ("account_entities", "members", "certificate_registry", "legacy_records", "relationships")
+CHAIN_SEPARATOR = "+"
+
+
+def load(name: str) -> Callable[[], None]:
+    command = COMMANDS[name]
+    module = importlib.import_module(command.module)
+    return getattr(module, command.func)
+
+
+def run_command(name: str, argv: list[str]) -> None:
+    entry = load(name)
+    # 기존 스크립트의 argparse 가 그대로 동작하도록 sys.argv 를 하위 명령 기준으로 교체
+    saved_argv = sys.argv
+    sys.argv = [f"{PROG} {name}", *argv]
+    try:
+        entry()
+    finally:
+        sys.argv = saved_argv
+        if COMMANDS[name].writes:
+            from lib.queries import query_cache
+
+            query_cache.invalidate()
+
+
+def snapshot(argv: list[str]) -> None:
+    from lib.queries import SNAPSHOT_DIR, cached_rows, save_snapshot
+
+    parser = argparse.ArgumentParser(prog=f"{PROG} snapshot", description=BUILTINS["snapshot"])
+    parser.add_argument("--tables", default=",".join(SNAPSHOT_TABLES), help="저장할 테이블 (쉼표 구분)")
+    parser.add_argument("--out", default=os.path.join(SNAPSHOT_DIR, f"snapshot_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args(argv)
+
+    tables = {table: cached_rows(table) for table in (t.strip() for t in args.tables.split(",")) if table}
+    counts = save_snapshot(args.out, tables)
+    print(f"스냅샷 저장: {args.out} ({', '.join(f'{t} {n}건' for t, n in counts.items())})")
+
+
+def shell(argv: list[str]) -> None:
+    _ = argv
+    print(f"{PROG} shell - 명령을 입력하세요. (help: 목록, exit: 종료)")
+    while True:
+        try:
+            line = input(f"{PROG}> ").strip()
+        except EOFError:
+            print()
+            break
+        if not line:
+            continue
+        if line in ("exit", "quit"):
+            break
+        if line == "help":
+            print_usage()
+            continue
+        run_chain(shlex.split(line))
+
+
+def dispatch(name: str, argv: list[str]) -> None:
+    if name == "snapshot":
+        snapshot(argv)
+    elif name == "shell":
+        shell(argv)
+    elif name == "startup-check":
+        startup_check(argv)
+    elif name in COMMANDS:
+        run_command(name, argv)
+    else:
+        print(f"알 수 없는 명령: {name}\n")
+        print_usage()
+        raise SystemExit(2)
+
+
+def split_chain(argv: list[str]) -> list[list[str]]:
+    chain: list[list[str]] = [[]]
+    for token in argv:
+        if token == CHAIN_SEPARATOR:
+            chain.append([])
+        else:
+            chain[-1].append(token)
+    return [part for part in chain if part]
+
+
+def run_chain(argv: list[str]) -> int:
+    """'+' 로 이어진 명령들을 차례로 실행. 실패한 명령이 있어도 다음 명령은 계속한다."""
+    failures = 0
+    for part in split_chain(argv):
+        try:
+            dispatch(part[0], part[1:])
+        except SystemExit as exc:
+            # 하위 명령의 argparse 오류/--help 는 세션 전체를 끝내지 않는다
+            if exc.code not in (0, None):
+                failures += 1
+        except Exception as exc:
+            failures += 1
+            print(f"[{part[0]}] 오류: {exc}")
+    return failures
+
+
+def probe(name: str) -> None:
+    """자식 프로세스용: 명령 모듈 import 시간과 로드된 무거운 모듈을 JSON 으로 출력."""
+    started = time.perf_counter()
+    load(name)
+    import_ms = (time.perf_counter() - started) * 1000
+    heavy = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(json.dumps({"import_ms": round(import_ms, 1), "heavy_modules": heavy}))
+
+
+def startup_check(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog=f"{PROG} startup-check", description="조회용 명령 시작 시간 예산 점검")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_STARTUP_BUDGET_MS, help="명령당 시작 시간 예산(ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="명령당 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args(argv)
+
+    failures: list[str] = []
+    print(f"\n=== 시작 시간 점검 (예산 {args.budget_ms:.0f}ms) ===")
+    for name, command in COMMANDS.items():
+        if not command.lightweight:
+            continue
+        samples: list[tuple[float, dict]] = []
+        for _ in range(max(1, args.repeat)):
+            started = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--probe", name],
+                capture_output=True,
+                text=True,
+            )
+            wall_ms = (time.perf_counter() - started) * 1000
+            if proc.returncode != 0:
+                failures.append(f"{name}: import 실패 ({(proc.stderr.strip().splitlines() or ['?'])[-1]})")
+                break
+            samples.append((wall_ms, json.loads(proc.stdout.strip().splitlines()[-1])))
+        if not samples:
+            continue
+
+        wall_ms, result = min(samples, key=lambda item: item[0])
+        status = "OK"
+        if wall_ms > args.budget_ms:
+            status = "초과"
+            failures.append(f"{name}: {wall_ms:.0f}ms > {args.budget_ms:.0f}ms")
+        if result["heavy_modules"]:
+            status = "무거운 import"
+            failures.append(f"{name}: import 시점에 {', '.join(result['heavy_modules'])} 로드")
+        print(f"- {name}: 전체 {wall_ms:.0f}ms / import {result['import_ms']:.0f}ms [{status}]")
+
+    if failures:
+        print("\n[실패]")
+        for line in failures:
+            print(f"- {line}")
+        sys.exit(1)
+
+
+def print_usage() -> None:
+    print(f"사용: {PROG} <명령> [옵션]\n")
+    width = max(len(name) for name in COMMANDS)
+    for name, command in COMMANDS.items():
+        print(f"  {name.ljust(width)}  {command.help}")
+    for name, help_text in BUILTINS.items():
+        print(f"  {name.ljust(width)}  {help_text}")
+    print("\n  --snapshot PATH  (명령 앞) 스냅샷을 캐시에 올린 뒤 실행")
+    print(f"  명령1 {CHAIN_SEPARATOR} 명령2 ...  여러 명령을 한 프로세스에서 이어 실행")
+
+
+def main(argv: list[str] | None = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print_usage()
+        return
+
+    if argv[0] == "--probe" and len(argv) > 1:
+        probe(argv[1])
+        return
+    if argv[0] == "--snapshot" and len(argv) > 1:
+        from lib.queries import load_snapshot
+
+        counts = load_snapshot(argv[1])
+        print(f"스냅샷 로드: {argv[1]} ({', '.join(f'{t} {n}건' for t, n in counts.items())})")
+        argv = argv[2:]
+
+    chain = split_chain(argv)
+    if len(chain) == 1 and chain[0][0] not in ("shell",):
+        dispatch(chain[0][0], chain[0][1:])
+        return
+
+    failures = run_chain(argv)
+    from lib.queries import print_cache_stats
+
+    print_cache_stats()
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
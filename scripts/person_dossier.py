@@ -0,0 +1,173 @@
+"""
+인물 종합 조회(dossier): account_entities 한 명을 기준으로 관련 데이터를 한 번에 모은다.
+
+- account_entities (id 또는 이름)
+- certificate_registry (entity_id)
+- members (이름 키 / 조합번호)
+- legacy_records (이름 키 / member_id) + 권리증 번호
+- relationships (member_id)
+- audit_logs (entity_id, 최근 N건)
+
+debug_kim*.py, list_kim_certs.py, check_audit.py 처럼 대상 id 를 코드에 박아두던 조회를 대체한다.
+
+사용:
+    python scripts/person_dossier.py 김점이
+    python scripts/person_dossier.py 656e0807-1dda-4568-9078-3053a52df857 --json out.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from typing import Any
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from audit_tail import TABLES as AUDIT_TABLES, format_row  # noqa: E402
+from lib.normalize import as_text, simple_name_key  # noqa: E402
+from lib.queries import cached_query, cached_rows, print_cache_stats  # noqa: E402
+from lib.supabase_client import get_client, print_request_stats  # noqa: E402
+from recalculate_rights_count_from_cert_numbers import extract_certificate_numbers  # noqa: E402
+from search_records import LEGACY_COLUMNS  # noqa: E402
+
+UUID_PATTERN = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+DEFAULT_AUDIT_LIMIT = 20
+
+Row = dict[str, Any]
+
+
+def find_entities(target: str) -> list[Row]:
+    entities = cached_rows("account_entities")
+    if UUID_PATTERN.match(target.strip()):
+        return [e for e in entities if str(e.get("id")) == target.strip()]
+    key = simple_name_key(target)
+    return [e for e in entities if key and simple_name_key(as_text(e.get("display_name"))) == key]
+
+
+def recent_audit_logs(entity_id: str, limit: int) -> list[Row]:
+    def load() -> list[Row]:
+        res = (
+            get_client()
+            .table("audit_logs")
+            .select("*")
+            .eq("entity_id", entity_id)
+            .order("created_at", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return res.data or []
+
+    return cached_query(f"audit_logs:entity_id={entity_id}:limit={limit}", load)
+
+
+def build_dossier(entity: Row, audit_limit: int = DEFAULT_AUDIT_LIMIT) -> dict[str, Any]:
+    entity_id = str(entity["id"])
+    name_key = simple_name_key(as_text(entity.get("display_name")))
+    member_number = as_text(entity.get("member_number"))
+
+    registry = [r for r in cached_rows("certificate_registry") if str(r.get("entity_id")) == entity_id]
+
+    members = [
+        m
+        for m in cached_rows("members")
+        if (name_key and simple_name_key(as_text(m.get("name"))) == name_key)
+        or (member_number and as_text(m.get("member_number")) == member_number)
+    ]
+    member_ids = {str(m["id"]) for m in members}
+
+    legacy = []
+    for record in cached_rows("legacy_records", LEGACY_COLUMNS):
+        if str(record.get("member_id")) in member_ids or (
+            name_key and simple_name_key(as_text(record.get("original_name"))) == name_key
+        ):
+            legacy.append(
+                {
+                    "id": record["id"],
+                    "original_name": record.get("original_name"),
+                    "member_id": record.get("member_id"),
+                    "rights_count": record.get("rights_count"),
+                    "is_refunded": record.get("is_refunded"),
+                    "certificate_numbers": extract_certificate_numbers(record.get("raw_data"), record.get("certificates")),
+                }
+            )
+
+    relationships = [r for r in cached_rows("relationships") if str(r.get("member_id")) in member_ids]
+
+    return {
+        "entity": entity,
+        "certificate_registry": registry,
+        "members": members,
+        "legacy_records": legacy,
+        "relationships": relationships,
+        "audit_logs": recent_audit_logs(entity_id, audit_limit) if audit_limit > 0 else [],
+    }
+
+
+def print_dossier(dossier: dict[str, Any]) -> None:
+    entity = dossier["entity"]
+    print(f"\n=== {as_text(entity.get('display_name')) or '(이름없음)'} [{entity['id']}] ===")
+    print(
+        f"연락처: {as_text(entity.get('phone')) or '-'} / {as_text(entity.get('phone_secondary')) or '-'} | "
+        f"조합번호: {as_text(entity.get('member_number')) or '-'} | 생년월일: {as_text(entity.get('birth_date')) or '-'}"
+    )
+
+    print(f"\n[certificate_registry] {len(dossier['certificate_registry'])}건")
+    for cert in dossier["certificate_registry"]:
+        print(
+            f"- {as_text(cert.get('certificate_number_normalized')) or as_text(cert.get('certificate_number_raw'))} "
+            f"({as_text(cert.get('certificate_status'))}, active={cert.get('is_active')})"
+        )
+
+    print(f"\n[members] {len(dossier['members'])}건")
+    for member in dossier["members"]:
+        print(
+            f"- {as_text(member.get('name'))} | {as_text(member.get('tier'))} / {as_text(member.get('status'))} | "
+            f"조합번호 {as_text(member.get('member_number')) or '-'} | {member['id']}"
+        )
+
+    print(f"\n[legacy_records] {len(dossier['legacy_records'])}건")
+    for record in dossier["legacy_records"]:
+        numbers = ", ".join(record["certificate_numbers"]) or "번호없음"
+        print(f"- {as_text(record['original_name'])} | 권리 {record.get('rights_count')} | {numbers} | 환불={record.get('is_refunded')}")
+
+    print(f"\n[relationships] {len(dossier['relationships'])}건")
+    for rel in dossier["relationships"]:
+        print(f"- {as_text(rel.get('name'))} ({as_text(rel.get('relation')) or '관계 미입력'}) {as_text(rel.get('phone'))}")
+
+    print(f"\n[audit_logs] 최근 {len(dossier['audit_logs'])}건")
+    for log in dossier["audit_logs"]:
+        print(f"- {format_row(log, AUDIT_TABLES['audit_logs'])}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="인물 종합 조회 (entity id 또는 이름)")
+    parser.add_argument("target", help="account_entities.id 또는 이름")
+    parser.add_argument("--audit-limit", type=int, default=DEFAULT_AUDIT_LIMIT, help="audit_logs 조회 건수 (0=생략)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    entities = find_entities(args.target)
+    if not entities:
+        print(f"'{args.target}' 에 해당하는 account_entities 가 없습니다.")
+        return
+
+    dossiers = [build_dossier(entity, args.audit_limit) for entity in entities]
+    for dossier in dossiers:
+        print_dossier(dossier)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(dossiers, f, ensure_ascii=False, indent=2, default=str)
+        print(f"\nJSON 저장: {args.json_path}")
+
+    print_cache_stats()
+    print_request_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,30 @@
 import argparse
-import os
 import re
 from typing import Any
 
-from supabase import create_client
+from lib.async_writes import (
+    VERSION_COLUMN,
+    UpdateOp,
+    precondition,
+    print_failures,
+    run_guarded_updates,
+    supports_preconditions,
+)
+from lib.changeset import (
+    Changeset,
+    apply_changeset,
+    default_plan_path,
+    load_plan,
+    print_plan_result,
+    source_fingerprint,
+)
+from lib.instrumentation import Instrumentation
+from lib.profiling import add_profile_arguments, profile_from_args
+from lib.queries import fetch_all_rows
+from lib.supabase_client import get_client, print_request_stats
+
+PLAN_NAME = "recalculate_rights_count"
+PLAN_TABLES = ["legacy_records"]
 
 CERT_NO_PATTERNS = [
     re.compile(r"^\d{4}-\d{1,2}-\d+$"),
@@ -99,70 +120,65 @@ def extract_certificate_numbers(raw_data: Any, certificates: Any) -> list[str]:
     return sorted(cert_set)
 
 
-def fetch_all_legacy_records(supabase_client: Any) -> list[dict[str, Any]]:
-    all_records: list[dict[str, Any]] = []
-    page_size = 1000
-    offset = 0
+LEGACY_COLUMNS = "id, original_name, rights_count, raw_data, certificates"
+# rights_count 를 계산하는 원본 컬럼. 동기화 중 바뀌면 계산한 값이 틀리므로 재시도하지 않는다
+COUNT_SOURCE_COLUMNS = ("raw_data", "certificates")
 
-    while True:
-        res = (
-            supabase_client.table("legacy_records")
-            .select("id, original_name, rights_count, raw_data, certificates")
-            .range(offset, offset + page_size - 1)
-            .execute()
-        )
-        batch = res.data or []
-        if not batch:
-            break
 
-        all_records.extend(batch)
-        if len(batch) < page_size:
-            break
-        offset += page_size
+def count_sources(record: dict[str, Any]) -> dict[str, Any]:
+    return {column: record.get(column) for column in COUNT_SOURCE_COLUMNS}
 
-    return all_records
 
+def fetch_all_legacy_records(supabase_client: Any, with_version: bool = False) -> list[dict[str, Any]]:
+    columns = f"{LEGACY_COLUMNS}, {VERSION_COLUMN}" if with_version else LEGACY_COLUMNS
+    return fetch_all_rows(supabase_client, "legacy_records", columns)
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="권리증 번호를 기준으로 legacy_records.rights_count 재계산"
-    )
-    parser.add_argument(
-        "--run",
-        action="store_true",
-        help="실제 업데이트 실행 (기본은 dry-run)",
-    )
-    args = parser.parse_args()
-
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_SERVICE_KEY")
-
-    if not supabase_url or not supabase_key:
-        raise ValueError("SUPABASE_URL, SUPABASE_SERVICE_KEY 환경변수가 필요합니다.")
 
-    supabase = create_client(supabase_url, supabase_key)
-    records = fetch_all_legacy_records(supabase)
+def run_recalc(args: argparse.Namespace, metrics: Instrumentation) -> None:
+    supabase = get_client()
+    plan: Changeset | None = None
+    if not args.run:
+        with metrics.phase("fingerprint"):
+            plan = Changeset(PLAN_NAME, source_fingerprint(supabase, PLAN_TABLES))
+    with metrics.phase("download"):
+        # --run 이면 읽은 updated_at 을 update 조건으로 써서, 그 사이 웹에서 고친 행은 덮어쓰지 않는다
+        with_version = args.run and supports_preconditions(supabase, "legacy_records")
+        records = fetch_all_legacy_records(supabase, with_version)
 
     print(f"총 대상: {len(records)}건")
 
     changed: list[dict[str, Any]] = []
-    for record in records:
-        cert_numbers = extract_certificate_numbers(
-            record.get("raw_data"),
-            record.get("certificates"),
-        )
-        new_count = len(cert_numbers)
-        old_count = int(record.get("rights_count") or 0)
-        if new_count != old_count:
-            changed.append(
-                {
-                    "id": record["id"],
-                    "name": record.get("original_name", ""),
-                    "old_count": old_count,
-                    "new_count": new_count,
-                    "numbers": cert_numbers,
-                }
+    with metrics.phase("extract"):
+        for record in records:
+            cert_numbers = extract_certificate_numbers(
+                record.get("raw_data"),
+                record.get("certificates"),
             )
+            new_count = len(cert_numbers)
+            old_count = int(record.get("rights_count") or 0)
+            if new_count != old_count:
+                changed.append(
+                    {
+                        "id": record["id"],
+                        "name": record.get("original_name", ""),
+                        "old_count": old_count,
+                        "new_count": new_count,
+                        "numbers": cert_numbers,
+                        "expected": precondition(record),
+                        "old_value": record.get("rights_count"),
+                        "sources": count_sources(record),
+                    }
+                )
+                if plan is not None:
+                    plan.update(
+                        "legacy_records",
+                        record["id"],
+                        record,
+                        {"rights_count": new_count},
+                        label=record.get("original_name", ""),
+                        sources=count_sources(record),
+                    )
+    metrics.update_counters({"records": len(records), "changed": len(changed)})
 
     print(f"변경 필요: {len(changed)}건")
     for row in changed[:20]:
@@ -171,26 +187,93 @@ def main() -> None:
             f"{', '.join(row['numbers'][:3]) if row['numbers'] else '번호없음'}"
         )
 
-    if not args.run:
-        print("dry-run 완료. 실제 반영하려면 --run 옵션을 사용하세요.")
+    if plan is not None:
+        plan.write(args.plan)
+        print(f"변경 계획 저장: {args.plan} ({len(plan.changes)}건)")
+        print("dry-run 완료. 실제 반영하려면 --run 또는 --apply-plan 옵션을 사용하세요.")
+        print_request_stats()
         return
 
-    success = 0
-    failed = 0
-    for row in changed:
-        try:
-            (
-                supabase.table("legacy_records")
-                .update({"rights_count": row["new_count"]})
-                .eq("id", row["id"])
-                .execute()
-            )
-            success += 1
-        except Exception as e:
-            failed += 1
-            print(f"[실패] {row['name']} ({row['id']}): {e}")
+    ops = [
+        UpdateOp(
+            "legacy_records",
+            row["id"],
+            {"rights_count": row["new_count"]},
+            label=row["name"],
+            expected=row["expected"],
+            base={"rights_count": row["old_value"]},
+            sources=row["sources"],
+        )
+        for row in changed
+    ]
+    with metrics.phase("update"):
+        results = run_guarded_updates(supabase, ops, args.concurrency)
+    success = sum(1 for r in results if r.ok)
+    conflicts = sum(1 for r in results if r.conflict)
+    failed = len(results) - success - conflicts
+    metrics.update_counters({"updated": success, "failed": failed, "conflicts": conflicts})
+
+    print(f"업데이트 완료: 성공 {success}건 / 실패 {failed}건 / 충돌 {conflicts}건")
+    print_failures(results)
+    print_request_stats()
+
+
+def run_apply_plan(args: argparse.Namespace, metrics: Instrumentation) -> None:
+    plan = load_plan(args.apply_plan, PLAN_NAME)
+    supabase = get_client()
+    with metrics.phase("fingerprint"):
+        fingerprint = source_fingerprint(supabase, PLAN_TABLES)
+    with metrics.phase("update"):
+        result = apply_changeset(supabase, plan, fingerprint, args.concurrency)
+    metrics.update_counters(
+        {"planned": len(plan.changes), "updated": result.updated, "failed": len(result.failures), "stale": len(result.stale)}
+    )
 
-    print(f"업데이트 완료: 성공 {success}건 / 실패 {failed}건")
+    print(f"계획 반영: {args.apply_plan}")
+    print_plan_result(result)
+    print_failures(result.failures)
+    print_request_stats()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="권리증 번호를 기준으로 legacy_records.rights_count 재계산"
+    )
+    parser.add_argument(
+        "--run",
+        action="store_true",
+        help="실제 업데이트 실행 (기본은 dry-run)",
+    )
+    parser.add_argument(
+        "--plan",
+        default=default_plan_path(PLAN_NAME),
+        help="dry-run 변경 계획(NDJSON) 저장 경로",
+    )
+    parser.add_argument(
+        "--apply-plan",
+        metavar="PLAN",
+        help="dry-run 계획 파일을 다시 계산하지 않고 그대로 반영",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="--run / --apply-plan update 동시 전송 수 (asyncio, 기본 1=순차)",
+    )
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    metrics = Instrumentation("recalculate_rights_count")
+    try:
+        with profile_from_args(args):
+            if args.apply_plan:
+                run_apply_plan(args, metrics)
+            else:
+                run_recalc(args, metrics)
+    finally:
+        metrics.print_report()
+        if args.metrics_json:
+            metrics.write_json(args.metrics_json)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,243 @@
+"""
+분담금 납부 대사(reconciliation): member_payments 수납 내역을 unit_types 평형별 기준액과 비교.
+
+화면(PaymentStatusTab)은 조합원 한 명씩 계산하지만, 여기서는 두 테이블을 한 번씩만 내려받아
+pandas 로 (entity, 평형, 회차) 단위 기준액/청구액/수납액 차이를 한 번에 계산한다.
+
+- 회차: certificate, contract, installment_1, installment_2, balance
+  (createStructuredPaymentLines 와 같은 unit_types 금액 컬럼)
+- 회차 행이 아예 없는 경우도 기준액 대비 미납으로 잡기 위해 (entity, 평형) x 회차 격자를 만든다
+- 수납 상태는 paymentDashboard.getPaymentStatus 와 같은 기준 (수납완료/부분납/미납/미설정)
+
+결과는 조합원별 요약 / 회차별 상세 / 회차 합계 시트의 xlsx (또는 csv) 로 저장한다.
+
+사용:
+    python scripts/reconcile_member_payments.py
+    python scripts/reconcile_member_payments.py --out data/reports/분담금_대사.csv --arrears-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.export_writers import ensure_parent  # noqa: E402
+from lib.instrumentation import Instrumentation  # noqa: E402
+from lib.profiling import add_profile_arguments, profile_from_args  # noqa: E402
+from lib.queries import fetch_all_rows  # noqa: E402
+from lib.supabase_client import get_client, print_request_stats  # noqa: E402
+
+DEFAULT_OUTPUT = "data/reports/분담금_대사.xlsx"
+# payment_type -> unit_types 기준액 컬럼
+SCHEDULE = {
+    "certificate": "certificate_amount",
+    "contract": "contract_amount",
+    "installment_1": "installment_1_amount",
+    "installment_2": "installment_2_amount",
+    "balance": "balance_amount",
+}
+PAYMENT_COLUMNS = "entity_id, unit_type_id, payment_type, amount_due, amount_paid, paid_date"
+UNIT_TYPE_COLUMNS = "id, name, " + ", ".join(SCHEDULE.values())
+KEYS = ["entity_id", "unit_type_id"]
+
+
+def load_frames(supabase: Any) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    payments = pd.DataFrame(
+        fetch_all_rows(supabase, "member_payments", PAYMENT_COLUMNS),
+        columns=[c.strip() for c in PAYMENT_COLUMNS.split(",")],
+    )
+    unit_types = pd.DataFrame(
+        fetch_all_rows(supabase, "unit_types", UNIT_TYPE_COLUMNS),
+        columns=[c.strip() for c in UNIT_TYPE_COLUMNS.split(",")],
+    )
+    entities = pd.DataFrame(fetch_all_rows(supabase, "account_entities", "id, display_name"), columns=["id", "display_name"])
+    return payments, unit_types, entities
+
+
+def schedule_frame(unit_types: pd.DataFrame) -> pd.DataFrame:
+    """unit_types 를 (unit_type_id, payment_type, expected) 세로형으로."""
+    long = unit_types.melt(
+        id_vars=["id", "name"], value_vars=list(SCHEDULE.values()), var_name="amount_column", value_name="expected"
+    )
+    long["payment_type"] = long["amount_column"].map({v: k for k, v in SCHEDULE.items()})
+    long["expected"] = pd.to_numeric(long["expected"], errors="coerce").fillna(0.0)
+    return long.rename(columns={"id": "unit_type_id", "name": "unit_type_name"})[
+        ["unit_type_id", "unit_type_name", "payment_type", "expected"]
+    ]
+
+
+def payment_status(due: pd.Series, paid: pd.Series, lines: pd.Series) -> np.ndarray:
+    return np.select(
+        [lines == 0, (due > 0) & (paid >= due), paid > 0],
+        ["미설정", "수납완료", "부분납"],
+        default="미납",
+    )
+
+
+def reconcile(payments: pd.DataFrame, unit_types: pd.DataFrame, entities: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    payments = payments.copy()
+    for column in ("amount_due", "amount_paid"):
+        payments[column] = pd.to_numeric(payments[column], errors="coerce").fillna(0.0)
+
+    structured = payments[payments["payment_type"].isin(list(SCHEDULE)) & payments["unit_type_id"].notna()]
+    actual = (
+        structured.groupby(KEYS + ["payment_type"], sort=False)
+        .agg(due=("amount_due", "sum"), paid=("amount_paid", "sum"), lines=("amount_due", "size"), last_paid_date=("paid_date", "max"))
+        .reset_index()
+    )
+
+    # (entity, 평형) x 회차 격자 + 기준액
+    grid = structured[KEYS].drop_duplicates().merge(schedule_frame(unit_types), on="unit_type_id", how="left")
+    grid["payment_type"] = grid["payment_type"].fillna("")
+    grid = grid[grid["payment_type"] != ""]
+
+    detail = grid.merge(actual, on=KEYS + ["payment_type"], how="left")
+    detail[["due", "paid"]] = detail[["due", "paid"]].fillna(0.0)
+    detail["lines"] = detail["lines"].fillna(0).astype(int)
+    detail["due_variance"] = detail["due"] - detail["expected"]
+    detail["outstanding"] = (detail["expected"] - detail["paid"]).clip(lower=0)
+    detail["overpaid"] = (detail["paid"] - detail["expected"]).clip(lower=0)
+    detail["status"] = payment_status(detail["expected"], detail["paid"], detail["lines"])
+
+    names = entities.rename(columns={"id": "entity_id", "display_name": "name"})
+    detail = detail.merge(names, on="entity_id", how="left")
+    detail["name"] = detail["name"].fillna("")
+    detail["payment_type"] = pd.Categorical(detail["payment_type"], categories=list(SCHEDULE), ordered=True)
+    detail = detail.sort_values(["name", "unit_type_name", "payment_type"]).reset_index(drop=True)
+
+    members = (
+        detail.groupby(KEYS + ["name", "unit_type_name"], dropna=False, observed=True)
+        .agg(
+            expected=("expected", "sum"),
+            due=("due", "sum"),
+            paid=("paid", "sum"),
+            outstanding=("outstanding", "sum"),
+            overpaid=("overpaid", "sum"),
+            lines=("lines", "sum"),
+            missing_lines=("lines", lambda s: int((s == 0).sum())),
+            last_paid_date=("last_paid_date", "max"),
+        )
+        .reset_index()
+    )
+    members["status"] = payment_status(members["expected"], members["paid"], members["lines"])
+    members = members.sort_values(["outstanding", "name"], ascending=[False, True]).reset_index(drop=True)
+
+    by_type = (
+        detail.groupby("payment_type", observed=True)
+        .agg(
+            members=("entity_id", "nunique"),
+            expected=("expected", "sum"),
+            due=("due", "sum"),
+            paid=("paid", "sum"),
+            outstanding=("outstanding", "sum"),
+            arrears_members=("outstanding", lambda s: int((s > 0).sum())),
+        )
+        .reset_index()
+    )
+
+    unassigned = payments[payments["payment_type"].isin(list(SCHEDULE)) & payments["unit_type_id"].isna()]
+    return {"members": members, "detail": detail, "by_type": by_type, "unassigned": unassigned}
+
+
+def write_report(path: str, frames: dict[str, pd.DataFrame], arrears_only: bool) -> list[str]:
+    members = frames["members"]
+    detail = frames["detail"]
+    if arrears_only:
+        members = members[members["outstanding"] > 0]
+        detail = detail[detail["outstanding"] > 0]
+
+    ensure_parent(path)
+    if path.lower().endswith(".csv"):
+        stem = path[: -len(".csv")]
+        outputs = {path: members, f"{stem}_detail.csv": detail, f"{stem}_by_type.csv": frames["by_type"]}
+        for output, frame in outputs.items():
+            frame.to_csv(output, index=False, encoding="utf-8-sig")
+        return list(outputs)
+
+    with pd.ExcelWriter(path) as writer:
+        members.to_excel(writer, sheet_name="조합원별", index=False)
+        detail.to_excel(writer, sheet_name="회차별", index=False)
+        frames["by_type"].to_excel(writer, sheet_name="회차합계", index=False)
+        if not frames["unassigned"].empty:
+            frames["unassigned"].to_excel(writer, sheet_name="평형미지정", index=False)
+    return [path]
+
+
+def run_reconcile(args: argparse.Namespace, metrics: Instrumentation) -> None:
+    supabase = get_client()
+    with metrics.phase("download"):
+        payments, unit_types, entities = load_frames(supabase)
+    print(f"member_payments {len(payments)}건 / unit_types {len(unit_types)}개 / account_entities {len(entities)}명")
+
+    with metrics.phase("reconcile"):
+        frames = reconcile(payments, unit_types, entities)
+
+    members = frames["members"]
+    by_type = frames["by_type"]
+    arrears = members[members["outstanding"] > 0]
+    metrics.update_counters({"members": len(members), "arrears_members": len(arrears), "unassigned_lines": len(frames["unassigned"])})
+
+    print("\n[회차별 합계]")
+    for row in by_type.itertuples(index=False):
+        print(
+            f"- {row.payment_type}: 기준 {row.expected:,.0f} / 청구 {row.due:,.0f} / 수납 {row.paid:,.0f} / "
+            f"미납 {row.outstanding:,.0f} ({row.arrears_members}명)"
+        )
+    print(f"\n미납 조합원: {len(arrears)}명 / 전체 {len(members)}명, 미납 합계 {arrears['outstanding'].sum():,.0f}")
+    if len(frames["unassigned"]):
+        print(f"평형(unit_type_id) 미지정 회차 행: {len(frames['unassigned'])}건 (대사 제외)")
+
+    print(f"\n[미납 상위 {args.limit}명]")
+    for row in arrears.head(args.limit).itertuples(index=False):
+        print(f"- {row.name or row.entity_id} ({row.unit_type_name}): 미납 {row.outstanding:,.0f} / 기준 {row.expected:,.0f} [{row.status}]")
+
+    with metrics.phase("write"):
+        outputs = write_report(args.out, frames, args.arrears_only)
+    for output in outputs:
+        print(f"📁 저장: {output}")
+
+    if args.json_path:
+        ensure_parent(args.json_path)
+        summary = {
+            "members": len(members),
+            "arrears_members": len(arrears),
+            "outstanding_total": float(arrears["outstanding"].sum()),
+            "by_type": json.loads(by_type.astype({"payment_type": str}).to_json(orient="records", force_ascii=False)),
+            "status_counts": {str(k): int(v) for k, v in members["status"].value_counts().items()},
+        }
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"📁 JSON 저장: {args.json_path}")
+
+    print_request_stats()
+    metrics.print_report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="member_payments vs unit_types 분담금 대사")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT, help=f"결과 경로 (.xlsx 또는 .csv, 기본 {DEFAULT_OUTPUT})")
+    parser.add_argument("--json", dest="json_path", help="요약 JSON 저장 경로")
+    parser.add_argument("--arrears-only", action="store_true", help="미납이 있는 조합원/회차만 저장")
+    parser.add_argument("--limit", type=int, default=20, help="화면 출력 미납 상위 건수 (기본 20)")
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    metrics = Instrumentation("reconcile_member_payments")
+    with profile_from_args(args):
+        run_reconcile(args, metrics)
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+
+
+if __name__ == "__main__":
+    main()
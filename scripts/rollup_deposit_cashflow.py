@@ -0,0 +1,284 @@
+"""
+입금 계좌별 현금흐름 집계(rollup): member_payments 를 (계좌, payment_type, 분담금 산입 여부, 일/월) 단위로 미리 합산.
+
+"계좌별로 월마다 얼마가 들어왔나 (is_contribution 구분)" 같은 질문을 매번 member_payments 전체를
+다시 합산하지 않고, 로컬 집계 파일(data/rollups/deposit_cashflow.json)에서 바로 읽도록 한다.
+
+증분 갱신:
+- 워터마크(updated_at) 이후에 바뀐 행만 (updated_at, id) keyset 페이지로 가져온다 (member_payments_updated_at_trigger.sql 필요)
+  offset 페이지와 달리 읽는 도중 다른 행의 updated_at 이 바뀌어도 건너뛰는 행이 없다
+  updated_at = now() 는 트랜잭션 시작 시각이라, 워터마크보다 먼저 시작해 나중에 커밋된 행은
+  워터마크보다 작은 updated_at 으로 나타난다. 그래서 워터마크 - --overlap-seconds 부터 다시 읽는다
+  (같은 행을 다시 받아도 apply 는 결과가 같으므로 안전). overlap 보다 오래 걸린 트랜잭션은 --full 로 맞춘다.
+- 행마다 직전에 반영한 (버킷, 금액)을 기억해 두고, 바뀐 행은 이전 버킷에서 빼고 새 버킷에 더한다
+  -> 납부일/계좌가 바뀐 행도 정확히 옮겨지고, 같은 행을 두 번 받아도 결과가 같다
+- 삭제된 행은 전체 건수가 어긋날 때만 id 목록을 받아 찾아서 뺀다
+- 월 집계는 이번에 바뀐 일 버킷이 속한 달만 다시 합산한다
+
+--full 은 집계 파일을 버리고 처음부터 다시 만든다.
+
+사용:
+    python scripts/rollup_deposit_cashflow.py                 # 증분 갱신 + 최근 월 요약
+    python scripts/rollup_deposit_cashflow.py --full
+    python scripts/rollup_deposit_cashflow.py --csv data/reports/계좌별_월별_입금.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.export_writers import ensure_parent, open_writer  # noqa: E402
+from lib.instrumentation import Instrumentation  # noqa: E402
+from lib.profiling import add_profile_arguments, profile_from_args  # noqa: E402
+from lib.queries import fetch_all_rows, iter_keyset  # noqa: E402
+from lib.supabase_client import get_client, print_request_stats  # noqa: E402
+
+DEFAULT_STATE = "data/rollups/deposit_cashflow.json"
+STATE_VERSION = 1
+PAYMENT_COLUMNS = "id, deposit_account_id, payment_type, is_contribution, amount_paid, paid_date, updated_at"
+UNASSIGNED = "unassigned"
+CSV_COLUMNS = ["월", "계좌", "payment_type", "분담금산입", "입금액", "건수"]
+DEFAULT_OVERLAP_SECONDS = 600
+
+# "계좌|payment_type|분담금산입(1/0)|날짜" (일: YYYY-MM-DD, 월: YYYY-MM)
+BucketKey = str
+
+
+def bucket_key(account: str, payment_type: str, contribution: bool, period: str) -> BucketKey:
+    return f"{account}|{payment_type}|{int(contribution)}|{period}"
+
+
+def split_key(key: BucketKey) -> tuple[str, str, bool, str]:
+    account, payment_type, contribution, period = key.split("|")
+    return account, payment_type, contribution == "1", period
+
+
+def payment_bucket(row: dict[str, Any]) -> tuple[BucketKey, float] | None:
+    """집계 대상이 아니면 None (납부일 없음 / 수납액 0)."""
+    amount = float(row.get("amount_paid") or 0)
+    paid_date = str(row.get("paid_date") or "")[:10]
+    if not paid_date or amount == 0:
+        return None
+    account = str(row.get("deposit_account_id") or UNASSIGNED)
+    key = bucket_key(account, str(row.get("payment_type") or "other"), bool(row.get("is_contribution")), paid_date)
+    return key, amount
+
+
+@dataclass
+class CashflowRollup:
+    watermark: str | None = None
+    # payment id -> [일 버킷, 금액]: 바뀐 행을 이전 버킷에서 빼기 위한 기록
+    applied: dict[str, list[Any]] = field(default_factory=dict)
+    daily: dict[BucketKey, list[float]] = field(default_factory=dict)
+    monthly: dict[BucketKey, list[float]] = field(default_factory=dict)
+    touched_months: set[BucketKey] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, path: str) -> "CashflowRollup":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != STATE_VERSION:
+            return cls()
+        return cls(data.get("watermark"), data.get("applied", {}), data.get("daily", {}), data.get("monthly", {}))
+
+    def save(self, path: str) -> None:
+        ensure_parent(path)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": STATE_VERSION,
+                    "watermark": self.watermark,
+                    "applied": self.applied,
+                    "daily": self.daily,
+                    "monthly": self.monthly,
+                },
+                f,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+
+    def _add(self, key: BucketKey, amount: float, count: int) -> None:
+        bucket = self.daily.setdefault(key, [0.0, 0])
+        bucket[0] = round(bucket[0] + amount, 2)
+        bucket[1] += count
+        if bucket[1] <= 0:
+            del self.daily[key]
+        account, payment_type, contribution, day = split_key(key)
+        self.touched_months.add(bucket_key(account, payment_type, contribution, day[:7]))
+
+    def remove(self, payment_id: str) -> None:
+        previous = self.applied.pop(payment_id, None)
+        if previous and previous[0]:
+            self._add(previous[0], -previous[1], -1)
+
+    def apply(self, row: dict[str, Any]) -> bool:
+        """집계가 바뀌었으면 True (이미 반영한 값 그대로면 False)."""
+        updated_at = row.get("updated_at")
+        if updated_at and (self.watermark is None or str(updated_at) > self.watermark):
+            self.watermark = str(updated_at)
+        payment_id = str(row["id"])
+        current = payment_bucket(row)
+        previous = self.applied.get(payment_id)
+        if previous is not None and (current or (None, 0.0)) == tuple(previous):
+            return False
+        self.remove(payment_id)
+        if current:
+            self._add(current[0], current[1], 1)
+            self.applied[payment_id] = [current[0], current[1]]
+        else:
+            self.applied[payment_id] = [None, 0.0]
+        return True
+
+    def refresh_months(self) -> int:
+        """이번에 바뀐 일 버킷이 속한 월 버킷만 다시 합산."""
+        if not self.touched_months:
+            return 0
+        sums: dict[BucketKey, list[float]] = defaultdict(lambda: [0.0, 0])
+        for key, (amount, count) in self.daily.items():
+            account, payment_type, contribution, day = split_key(key)
+            month_key = bucket_key(account, payment_type, contribution, day[:7])
+            if month_key in self.touched_months:
+                sums[month_key][0] = round(sums[month_key][0] + amount, 2)
+                sums[month_key][1] += count
+        for month_key in self.touched_months:
+            if month_key in sums:
+                self.monthly[month_key] = sums[month_key]
+            else:
+                self.monthly.pop(month_key, None)
+        refreshed = len(self.touched_months)
+        self.touched_months = set()
+        return refreshed
+
+
+def overlap_start(watermark: str, overlap_seconds: float) -> str:
+    """워터마크에서 overlap 만큼 앞당긴 시각 (updated_at 과 같은 ISO 형식)."""
+    start = datetime.fromisoformat(watermark.replace("Z", "+00:00")) - timedelta(seconds=overlap_seconds)
+    return start.isoformat()
+
+
+def sync_rollup(
+    rollup: CashflowRollup,
+    supabase: Any,
+    metrics: Instrumentation,
+    check_deletes: bool = True,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+) -> int:
+    changed = 0
+    # 증분은 (updated_at, id) keyset, 처음 전체 집계는 id keyset (updated_at 이 NULL 인 행도 받는다)
+    if rollup.watermark:
+        pages = iter_keyset(
+            supabase, "member_payments", PAYMENT_COLUMNS, "updated_at", overlap_start(rollup.watermark, overlap_seconds)
+        )
+    else:
+        pages = iter_keyset(supabase, "member_payments", PAYMENT_COLUMNS)
+    with metrics.phase("changed_rows"):
+        for page in pages:
+            changed += sum(1 for row in page if rollup.apply(row))
+
+    if check_deletes and rollup.applied:
+        with metrics.phase("delete_check"):
+            res = supabase.table("member_payments").select("id", count="exact").limit(1).execute()
+            if res.count is None or res.count != len(rollup.applied):
+                live = {str(row["id"]) for row in fetch_all_rows(supabase, "member_payments", "id")}
+                for payment_id in [pid for pid in rollup.applied if pid not in live]:
+                    rollup.remove(payment_id)
+                    changed += 1
+    return changed
+
+
+def account_names(supabase: Any) -> dict[str, str]:
+    rows = fetch_all_rows(supabase, "deposit_accounts", "id, account_name")
+    names = {str(row["id"]): str(row.get("account_name") or row["id"]) for row in rows}
+    names[UNASSIGNED] = "미지정"
+    return names
+
+
+def monthly_rows(rollup: CashflowRollup, names: dict[str, str]) -> list[list[Any]]:
+    rows = []
+    for key, (amount, count) in rollup.monthly.items():
+        account, payment_type, contribution, month = split_key(key)
+        rows.append([month, names.get(account, account), payment_type, "Y" if contribution else "N", amount, int(count)])
+    rows.sort(key=lambda r: (r[0], r[1], r[2], r[3]))
+    return rows
+
+
+def print_recent_months(rollup: CashflowRollup, names: dict[str, str], months: int) -> None:
+    totals: dict[tuple[str, str], list[float]] = defaultdict(lambda: [0.0, 0.0])
+    for key, (amount, _) in rollup.monthly.items():
+        account, _, contribution, month = split_key(key)
+        totals[(month, names.get(account, account))][0 if contribution else 1] += amount
+
+    recent = sorted({month for month, _ in totals})[-months:]
+    print(f"\n[최근 {len(recent)}개월 계좌별 입금] (분담금 산입 / 미산입)")
+    for month in recent:
+        for (row_month, account), (contribution, other) in sorted(totals.items()):
+            if row_month == month:
+                print(f"- {month} {account}: {contribution:,.0f} / {other:,.0f}")
+
+
+def run_rollup(args: argparse.Namespace, metrics: Instrumentation) -> None:
+    supabase = get_client()
+    rollup = CashflowRollup() if args.full else CashflowRollup.load(args.state)
+    print(f"워터마크: {rollup.watermark or '(없음, 전체 집계)'}")
+
+    changed = sync_rollup(rollup, supabase, metrics, not args.skip_delete_check, args.overlap_seconds)
+    with metrics.phase("monthly"):
+        refreshed = rollup.refresh_months()
+    with metrics.phase("save"):
+        rollup.save(args.state)
+    metrics.update_counters({"changed_rows": changed, "refreshed_months": refreshed})
+    print(f"반영 행: {changed}건 / 갱신된 월 버킷: {refreshed}개 / 일 버킷 {len(rollup.daily)}개, 월 버킷 {len(rollup.monthly)}개")
+    print(f"📁 집계 저장: {args.state}")
+
+    names = account_names(supabase)
+    print_recent_months(rollup, names, args.months)
+
+    if args.csv_path:
+        with open_writer(args.csv_path, CSV_COLUMNS) as writer:
+            writer.write_rows(monthly_rows(rollup, names))
+        print(f"📁 월별 집계 저장: {args.csv_path}")
+
+    print_request_stats()
+    metrics.print_report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="입금 계좌별 일/월 현금흐름 집계 (증분 갱신)")
+    parser.add_argument("--state", default=DEFAULT_STATE, help=f"집계 파일 경로 (기본 {DEFAULT_STATE})")
+    parser.add_argument("--full", action="store_true", help="집계 파일을 버리고 전체 재계산")
+    parser.add_argument("--skip-delete-check", action="store_true", help="삭제된 행 확인(건수 비교) 생략")
+    parser.add_argument("--months", type=int, default=6, help="화면에 출력할 최근 월 수 (기본 6)")
+    parser.add_argument("--csv", dest="csv_path", help="월별 집계를 CSV/xlsx 로 저장")
+    parser.add_argument(
+        "--overlap-seconds",
+        type=float,
+        default=DEFAULT_OVERLAP_SECONDS,
+        help=f"워터마크보다 이만큼 앞부터 다시 읽음 (늦게 커밋된 행 대비, 기본 {DEFAULT_OVERLAP_SECONDS})",
+    )
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    metrics = Instrumentation("rollup_deposit_cashflow")
+    with profile_from_args(args):
+        run_rollup(args, metrics)
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+
+
+if __name__ == "__main__":
+    main()
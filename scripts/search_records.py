@@ -0,0 +1,170 @@
+"""
+통합 검색: 이름 / 전화번호 / 권리증·조합번호 한 가지로 여러 테이블을 한 번에 찾는다.
+
+search_string.py, find_person.py, deep_search*.py, find_kim_by_phone.py 처럼
+값을 코드에 박아두고 테이블마다 따로 조회하던 것을 대체한다.
+테이블은 lib.queries.cached_rows 로 한 번만 내려받고 메모리에서 찾으므로
+peopleon 에서 여러 번 검색해도 다운로드는 처음 한 번뿐이다.
+
+사용:
+    python scripts/search_records.py 김점이
+    python scripts/search_records.py 010-9101-5448
+    python scripts/search_records.py 05-1-6 --kind cert --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Iterable
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CURRENT_DIR not in sys.path:
+    sys.path.append(CURRENT_DIR)
+
+from lib.normalize import as_text, simple_name_key  # noqa: E402
+from lib.queries import cached_rows, print_cache_stats  # noqa: E402
+from lib.supabase_client import print_request_stats  # noqa: E402
+from recalculate_rights_count_from_cert_numbers import extract_certificate_numbers, normalize_cert_no  # noqa: E402
+
+LEGACY_COLUMNS = "id, original_name, member_id, rights_count, contacts, raw_data, certificates, is_refunded"
+# 조합번호/권리증 번호 일부(예: 05-1-6, 2005.1.6)
+CERT_FRAGMENT_PATTERN = re.compile(r"^\d{2,4}[-./](\d{1,2}|특)[-./]?\d*$")
+PHONE_PATTERN = re.compile(r"^[\d\-\s]{7,}$")
+MIN_PHONE_DIGITS = 7
+
+
+@dataclass
+class Hit:
+    table: str
+    id: str
+    label: str
+    field: str
+    value: str
+
+
+def classify_term(term: str) -> str:
+    text = term.strip()
+    if CERT_FRAGMENT_PATTERN.fullmatch(text) or normalize_cert_no(text):
+        return "cert"
+    if PHONE_PATTERN.fullmatch(text) and len(re.sub(r"\D", "", text)) >= MIN_PHONE_DIGITS:
+        return "phone"
+    return "name"
+
+
+def digits(value: Any) -> str:
+    return re.sub(r"\D", "", as_text(value))
+
+
+def text_values(value: Any) -> Iterable[str]:
+    if isinstance(value, list):
+        for item in value:
+            yield from text_values(item)
+    elif value is not None:
+        yield as_text(value)
+
+
+def search_names(key: str) -> list[Hit]:
+    hits: list[Hit] = []
+    for row in cached_rows("account_entities"):
+        name = as_text(row.get("display_name"))
+        if key in simple_name_key(name):
+            hits.append(Hit("account_entities", str(row["id"]), name, "display_name", name))
+    for row in cached_rows("members"):
+        name = as_text(row.get("name"))
+        if key in simple_name_key(name):
+            hits.append(Hit("members", str(row["id"]), name, "name", name))
+    for row in cached_rows("legacy_records", LEGACY_COLUMNS):
+        name = as_text(row.get("original_name"))
+        if key in simple_name_key(name):
+            hits.append(Hit("legacy_records", str(row["id"]), name, "original_name", name))
+    return hits
+
+
+def search_phones(needle: str) -> list[Hit]:
+    hits: list[Hit] = []
+    for row in cached_rows("account_entities"):
+        for field in ("phone", "phone_secondary"):
+            if needle in digits(row.get(field)):
+                hits.append(Hit("account_entities", str(row["id"]), as_text(row.get("display_name")), field, as_text(row.get(field))))
+    for row in cached_rows("members"):
+        if needle in digits(row.get("phone")):
+            hits.append(Hit("members", str(row["id"]), as_text(row.get("name")), "phone", as_text(row.get("phone"))))
+    for row in cached_rows("legacy_records", LEGACY_COLUMNS):
+        for contact in text_values(row.get("contacts")):
+            if needle in digits(contact):
+                hits.append(Hit("legacy_records", str(row["id"]), as_text(row.get("original_name")), "contacts", contact))
+                break
+    return hits
+
+
+def search_certificates(term: str) -> list[Hit]:
+    fragment = term.strip().replace(".", "-").replace("/", "-")
+    normalized = normalize_cert_no(term)
+
+    def matches(value: Any) -> bool:
+        text = as_text(value).replace(".", "-").replace("/", "-")
+        return bool(text) and (fragment in text or (normalized is not None and normalize_cert_no(text) == normalized))
+
+    hits: list[Hit] = []
+    for row in cached_rows("certificate_registry"):
+        for field in ("certificate_number_raw", "certificate_number_normalized", "note"):
+            if matches(row.get(field)):
+                hits.append(Hit("certificate_registry", str(row["id"]), as_text(row.get("entity_id")), field, as_text(row.get(field))))
+                break
+    for row in cached_rows("account_entities"):
+        for field in ("member_number", "memo"):
+            if matches(row.get(field)):
+                hits.append(Hit("account_entities", str(row["id"]), as_text(row.get("display_name")), field, as_text(row.get(field))))
+                break
+    for row in cached_rows("members"):
+        if matches(row.get("member_number")):
+            hits.append(Hit("members", str(row["id"]), as_text(row.get("name")), "member_number", as_text(row.get("member_number"))))
+    for row in cached_rows("legacy_records", LEGACY_COLUMNS):
+        for number in extract_certificate_numbers(row.get("raw_data"), row.get("certificates")):
+            if matches(number):
+                hits.append(Hit("legacy_records", str(row["id"]), as_text(row.get("original_name")), "certificate", number))
+                break
+    return hits
+
+
+def search(term: str, kind: str | None = None) -> tuple[str, list[Hit]]:
+    kind = kind or classify_term(term)
+    if kind == "cert":
+        return kind, search_certificates(term)
+    if kind == "phone":
+        return kind, search_phones(digits(term))
+    key = simple_name_key(term)
+    return kind, search_names(key) if key else []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="이름/전화번호/권리증 번호 통합 검색")
+    parser.add_argument("term", help="검색어 (이름, 전화번호, 권리증/조합번호)")
+    parser.add_argument("--kind", choices=("name", "phone", "cert"), help="검색 종류 (기본: 자동 판별)")
+    parser.add_argument("--limit", type=int, default=50, help="화면 출력 건수 (기본 50)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    kind, hits = search(args.term, args.kind)
+
+    if args.json:
+        print(json.dumps([asdict(h) for h in hits], ensure_ascii=False, indent=2))
+        return
+
+    print(f"\n=== 검색: '{args.term}' ({kind}) - {len(hits)}건 ===")
+    for hit in hits[: args.limit]:
+        print(f"- [{hit.table}] {hit.label or '(이름없음)'} | {hit.field}={hit.value} | {hit.id}")
+    if len(hits) > args.limit:
+        print(f"... 외 {len(hits) - args.limit}건")
+
+    print_cache_stats()
+    print_request_stats()
+
+
+if __name__ == "__main__":
+    main()
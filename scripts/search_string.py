@@ -1,12 +1,6 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
+from lib.supabase_client import get_client
 
-load_dotenv('.env.local')
-
-url: str = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
-key: str = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-supabase: Client = create_client(url, key)
+supabase = get_client()
 
 search_val = '05-1-6'
 
@@ -14,14 +8,14 @@ try:
     print(f"Searching for '{search_val}'...")
     
     # Check account_entities (member_number or other fields)
-    res = supabase.table('account_entities').select('*').or(f"member_number.eq.{search_val},memo.ilike.%{search_val}%").execute()
+    res = supabase.table('account_entities').select('*').or_(f"member_number.eq.{search_val},memo.ilike.%{search_val}%").execute()
     if res.data:
         print(f"Found in account_entities: {res.data}")
     else:
         print("Not found in account_entities.")
 
     # Check certificate_registry
-    res = supabase.table('certificate_registry').select('*').or(f"certificate_number_raw.eq.{search_val},certificate_number_normalized.eq.{search_val}").execute()
+    res = supabase.table('certificate_registry').select('*').or_(f"certificate_number_raw.eq.{search_val},certificate_number_normalized.eq.{search_val}").execute()
     if res.data:
         print(f"Found in certificate_registry: {res.data}")
     else:
@@ -8,25 +8,84 @@
 4) 대리인 정보(relationships) 갱신
 
 기본은 Dry-run이며, 실제 반영은 --apply 옵션 사용.
+Dry-run 은 변경 계획(NDJSON)을 저장하며, --apply-plan 으로 엑셀 파싱/매칭 없이 그대로 반영할 수 있다.
+단, 계획에서 새로 만드는 members 에만 연결되는 legacy_records 는 member_id 를 미리 알 수 없어 계획에 넣지 않는다
+(legacy_pending_insert 로 집계). --apply-plan 뒤 dry-run 을 한 번 더 실행해 남은 연결을 반영한다.
 """
 
 from __future__ import annotations
 
 import argparse
-import os
 import re
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable
 
 import pandas as pd
-from supabase import Client, create_client
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+from lib.async_writes import (
+    VERSION_COLUMN,
+    UpdateOp,
+    UpdateResult,
+    precondition,
+    print_failures,
+    run_guarded_updates,
+    supports_preconditions,
+)
+from lib.changeset import (
+    Changeset,
+    DiffStats,
+    apply_changeset,
+    default_plan_path,
+    diff_payload,
+    load_plan,
+    print_plan_result,
+    source_fingerprint,
+)
+from lib.checkpoint import Journal, default_journal_path
+from lib.instrumentation import Instrumentation
+from lib.normalize import (
+    ANNOTATION_WORDS,
+    as_text,
+    clean_name_for_display,
+    is_nan_like,
+    normalize_name_key,
+    normalize_phone,
+    normalize_spaces,
+    simple_name_key,
+    strip_annotations,
+)
+from lib.profiling import add_profile_arguments, profile_from_args
+from lib.supabase_client import get_client, print_request_stats
 
 FILE_PATH = "data/최신주소(피플용).xlsx"
 SHEET_NAME = "최신 주소록"
+PLAN_NAME = "sync_latest_address_book"
+PLAN_TABLES = ["members", "relationships", "legacy_records"]
+# dry-run 에서 계획으로 새로 만들 members 의 자리표시 id (DB 에는 쓰지 않는다)
+PLANNED_MEMBER_PREFIX = "planned:"
+# payload 를 만들 때 읽는 members 컬럼 (보낼 컬럼이 아니어도 바뀌었으면 conflict 재시도를 하지 않는다)
+MEMBER_SOURCE_COLUMNS = ("phone", "member_number", "tier", "status", "memo", "unit_group", "is_registered")
+# relationships 행을 찾은 키
+RELATIONSHIP_SOURCE_COLUMNS = ("member_id", "name")
+RELATIONSHIP_COLUMNS = "id, member_id, name, phone, relation, note"
 
-ANNOTATION_WORDS = ("별세", "시동생", "없는사람")
 MOBILE_PATTERN = re.compile(r"01[016789][-\s]?\d{3,4}[-\s]?\d{4}")
 ZIP_PATTERN = re.compile(r"\b(\d{5})\b")
+PAREN_PATTERN = re.compile(r"\([^)]*\)")
+PAREN_INSIDE_PATTERN = re.compile(r"\(([^)]*)\)")
+LINE_SPLIT_PATTERN = re.compile(r"[\r\n/]+")
+INSIDE_NAME_PATTERN = re.compile(r"[가-힣]{2,6}")
+PLAIN_NAME_PATTERN = re.compile(r"[가-힣]{2,4}")
+
+
+@dataclass
+class NameCandidate:
+    text: str
+    exact_key: str
+    simple_key: str
 
 
 @dataclass
@@ -44,77 +103,7 @@ class MemberRow:
     proxy_phone: str
     source_section: str
     raw: dict[str, Any]
-
-
-def load_env_file(path: str) -> dict[str, str]:
-    env: dict[str, str] = {}
-    if not os.path.exists(path):
-        return env
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            text = line.strip()
-            if not text or "=" not in text:
-                continue
-            key, value = text.split("=", 1)
-            env[key] = value
-    return env
-
-
-def create_supabase() -> Client:
-    env_local = load_env_file(".env.local")
-    url = os.environ.get("SUPABASE_URL") or env_local.get("NEXT_PUBLIC_SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ.get("SUPABASE_KEY") or env_local.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-    if not url or not key:
-        raise RuntimeError("Supabase 연결 정보가 없습니다. (.env.local 또는 SUPABASE_URL/SUPABASE_SERVICE_KEY)")
-    return create_client(url, key)
-
-
-def is_nan_like(value: Any) -> bool:
-    if value is None:
-        return True
-    if isinstance(value, float) and pd.isna(value):
-        return True
-    text = str(value).strip()
-    return text == "" or text.lower() == "nan"
-
-
-def as_text(value: Any) -> str:
-    if is_nan_like(value):
-        return ""
-    return str(value).strip()
-
-
-def normalize_spaces(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
-
-
-def clean_name_for_display(raw_name: str) -> str:
-    text = raw_name.replace("\r", " ").replace("\n", " ")
-    text = text.replace("?", "")
-    text = text.strip()
-    text = re.sub(r"\s+", " ", text)
-    return text
-
-
-def normalize_name_key(text: str) -> str:
-    return re.sub(r"\s+", "", text).strip()
-
-
-def strip_annotations(name: str) -> str:
-    text = name.replace("?", "").replace("X", "")
-    text = text.replace("\r", " ").replace("\n", " ")
-    for word in ANNOTATION_WORDS:
-        text = text.replace(word, "")
-    text = re.sub(r"\(\s*\)", "", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
-
-
-def normalize_phone(value: str) -> str:
-    if not value:
-        return ""
-    digits = re.sub(r"\D", "", value)
-    return digits if len(digits) >= 8 else ""
+    candidates: list[NameCandidate] = field(default_factory=list)
 
 
 def extract_proxy_phone(text: str) -> str:
@@ -185,12 +174,16 @@ def extract_zipcode(address: str) -> str:
 
 def build_name_candidates(raw_name: str) -> list[str]:
     # 후보 순서가 중요: 앞쪽 후보를 우선 매칭
-    candidates: list[str] = []
+    if is_plain_name(raw_name):
+        return [raw_name]
+
+    # dict 를 순서 있는 집합으로 사용 (첫 등장 순서 유지, 중복 검사 O(1))
+    candidates: dict[str, None] = {}
 
     def add(value: str) -> None:
         text = normalize_spaces(value)
-        if text and text not in candidates:
-            candidates.append(text)
+        if text:
+            candidates.setdefault(text)
 
     base = clean_name_for_display(raw_name)
     add(base)
@@ -198,22 +191,35 @@ def build_name_candidates(raw_name: str) -> list[str]:
     stripped = strip_annotations(base)
     add(stripped)
 
-    no_paren = re.sub(r"\([^)]*\)", " ", stripped)
-    add(no_paren)
+    add(PAREN_PATTERN.sub(" ", stripped))
 
     # 줄바꿈 분리 후보 (ex. 우승용X\n(없는사람)\n안현숙)
-    for part in re.split(r"[\r\n/]+", raw_name):
-        chunk = strip_annotations(part)
-        if chunk:
-            add(chunk)
+    for part in LINE_SPLIT_PATTERN.split(raw_name):
+        add(strip_annotations(part))
 
     # 괄호 내부 이름 후보 (ex. 신금수(신재빈))
-    for inside in re.findall(r"\(([^)]*)\)", raw_name):
+    for inside in PAREN_INSIDE_PATTERN.findall(raw_name):
         inside_clean = strip_annotations(inside)
-        if re.fullmatch(r"[가-힣]{2,6}", inside_clean):
+        if INSIDE_NAME_PATTERN.fullmatch(inside_clean):
             add(inside_clean)
 
-    return candidates
+    return list(candidates)
+
+
+def is_plain_name(raw_name: str) -> bool:
+    """주석 없는 2~4글자 한글 이름: 후보가 자기 자신 하나뿐이라 정규식 처리를 건너뛴다."""
+    return PLAIN_NAME_PATTERN.fullmatch(raw_name) is not None and not any(
+        word in raw_name for word in ANNOTATION_WORDS
+    )
+
+
+def name_candidates(raw_name: str) -> list[NameCandidate]:
+    """엑셀 행마다 한 번만 만드는 매칭 후보 (exact / simple 키를 미리 계산)."""
+    if is_plain_name(raw_name):
+        return [NameCandidate(raw_name, raw_name, raw_name)]
+    return [
+        NameCandidate(text, normalize_name_key(text), simple_name_key(text)) for text in build_name_candidates(raw_name)
+    ]
 
 
 def read_excel_rows() -> tuple[list[MemberRow], list[MemberRow]]:
@@ -273,6 +279,7 @@ def read_excel_rows() -> tuple[list[MemberRow], list[MemberRow]]:
             proxy_phone=proxy_phone,
             source_section=source_section,
             raw=row,
+            candidates=name_candidates(raw_name) if source_section == "registered_116" else [],
         )
 
         if source_section == "registered_116":
@@ -297,7 +304,7 @@ def build_member_indexes(members: list[dict[str, Any]]) -> dict[str, Any]:
     for member in members:
         name = as_text(member.get("name"))
         exact_key = normalize_name_key(name)
-        simple_key = normalize_name_key(strip_annotations(name))
+        simple_key = simple_name_key(name)
         phone_key = normalize_phone(as_text(member.get("phone")))
         number_key = parse_member_number(member.get("member_number"))
 
@@ -337,19 +344,17 @@ def match_main_row_to_member(
     by_phone = indexes["by_phone"]
     by_member_number = indexes["by_member_number"]
 
-    candidates = build_name_candidates(row.raw_name)
+    candidates = row.candidates or name_candidates(row.raw_name)
 
     for candidate in candidates:
-        exact_key = normalize_name_key(candidate)
-        matched = pick_unassigned(by_exact.get(exact_key, []), assigned_ids)
+        matched = pick_unassigned(by_exact.get(candidate.exact_key, []), assigned_ids)
         if matched:
-            return matched, f"name_exact:{candidate}"
+            return matched, f"name_exact:{candidate.text}"
 
     for candidate in candidates:
-        simple_key = normalize_name_key(strip_annotations(candidate))
-        matched = pick_unassigned(by_simple.get(simple_key, []), assigned_ids)
+        matched = pick_unassigned(by_simple.get(candidate.simple_key, []), assigned_ids)
         if matched:
-            return matched, f"name_simple:{candidate}"
+            return matched, f"name_simple:{candidate.text}"
 
     if row.phone and row.phone != "미입력":
         matched = pick_unassigned(by_phone.get(normalize_phone(row.phone), []), assigned_ids)
@@ -372,13 +377,20 @@ def upsert_relationship(
     proxy_name: str,
     proxy_phone: str,
     dry_run: bool,
+    pending_updates: list[UpdateOp],
+    journal: Journal | None = None,
+    plan: Changeset | None = None,
 ) -> str:
+    """기존 행 update 는 바로 보내지 않고 pending_updates 에 조건부 update 로 쌓는다 ("update_queued")."""
     if not proxy_name:
         return "skip_empty"
     if normalize_name_key(strip_annotations(proxy_name)) == normalize_name_key(strip_annotations(member_name)):
         return "skip_same_name"
 
     key = (member_id, normalize_name_key(proxy_name))
+    journal_key = f"relationships:{member_id}:{key[1]}"
+    if journal and journal.done(journal_key):
+        return "resumed_skip"
     existing = existing_rel_map.get(key)
     payload = {
         "member_id": member_id,
@@ -388,39 +400,102 @@ def upsert_relationship(
         "note": "최신주소(피플용) 동기화",
     }
 
+    changes = diff_payload(existing, payload)
+    if existing and not changes:
+        return "unchanged"
+    sources = {c: existing.get(c) for c in RELATIONSHIP_SOURCE_COLUMNS if c not in changes} if existing else {}
+
     if dry_run:
+        if plan is not None and existing:
+            plan.update("relationships", existing["id"], existing, changes, label=proxy_name, sources=sources)
+        elif plan is not None:
+            plan.insert("relationships", payload, label=proxy_name)
         return "dry_run_update" if existing else "dry_run_insert"
 
     if existing:
-        supabase.table("relationships").update(payload).eq("id", existing["id"]).execute()
-        return "updated"
+        op = UpdateOp(
+            "relationships",
+            existing["id"],
+            changes,
+            label=proxy_name,
+            key=journal_key,
+            expected=precondition(existing),
+            base={column: existing.get(column) for column in changes},
+            sources=sources,
+        )
+        existing.update(changes)
+        pending_updates.append(op)
+        return "update_queued"
 
     result = supabase.table("relationships").insert(payload).execute()
     if result.data:
         existing_rel_map[key] = result.data[0]
+    if journal:
+        journal.mark(journal_key)
     return "inserted"
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="최신주소(피플용).xlsx 동기화")
-    parser.add_argument("--apply", action="store_true", help="실제 DB 반영")
-    args = parser.parse_args()
-    dry_run = not args.apply
+def member_changes(
+    member: dict[str, Any],
+    payload: dict[str, Any],
+    diff: DiffStats,
+    plan: Changeset | None = None,
+    label: str = "",
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """(바뀐 컬럼, 그 컬럼들의 현재 값, payload 를 만들 때 읽은 나머지 컬럼 값).
 
-    main_rows, extra_rows = read_excel_rows()
-    supabase = create_supabase()
+    같은 멤버를 다시 비교할 때 보낼 값 기준이 되도록 로컬 행에도 반영한다.
+    """
+    changes = diff_payload(member, payload)
+    diff.record(changes)
+    sources = {column: member.get(column) for column in MEMBER_SOURCE_COLUMNS if column not in changes}
+    if plan is not None:
+        plan.update("members", member["id"], member, changes, label=label, sources=sources)
+    base = {column: member.get(column) for column in changes}
+    member.update(changes)
+    return changes, base, sources
 
-    members_res = supabase.table("members").select("*").execute()
-    members = members_res.data or []
 
-    rel_res = supabase.table("relationships").select("id, member_id, name, phone, relation, note").execute()
-    relationships = rel_res.data or []
-    rel_map: dict[tuple[str, str], dict[str, Any]] = {}
-    for rel in relationships:
-        rel_key = (rel["member_id"], normalize_name_key(as_text(rel.get("name"))))
-        rel_map[rel_key] = rel
+def mark_journal(journal: Journal) -> Callable[[UpdateResult], None]:
+    def on_result(result: UpdateResult) -> None:
+        if result.ok:
+            journal.mark(result.op.journal_key)
 
-    indexes = build_member_indexes(members)
+    return on_result
+
+
+def run_sync(
+    args: argparse.Namespace,
+    dry_run: bool,
+    journal: Journal,
+    metrics: Instrumentation | None = None,
+) -> None:
+    metrics = metrics or Instrumentation("sync_latest_address_book")
+    with metrics.phase("excel_parse"):
+        main_rows, extra_rows = read_excel_rows()
+    supabase = get_client()
+    plan: Changeset | None = None
+    if dry_run:
+        with metrics.phase("fingerprint"):
+            plan = Changeset(PLAN_NAME, source_fingerprint(supabase, PLAN_TABLES, [FILE_PATH]))
+
+    with metrics.phase("download"):
+        members_res = supabase.table("members").select("*").execute()
+        members = members_res.data or []
+
+        rel_columns = RELATIONSHIP_COLUMNS
+        if not dry_run and supports_preconditions(supabase, "relationships"):
+            rel_columns += f", {VERSION_COLUMN}"
+        rel_res = supabase.table("relationships").select(rel_columns).execute()
+        relationships = rel_res.data or []
+
+    with metrics.phase("build_indexes"):
+        rel_map: dict[tuple[str, str], dict[str, Any]] = {}
+        for rel in relationships:
+            rel_key = (rel["member_id"], normalize_name_key(as_text(rel.get("name"))))
+            rel_map[rel_key] = rel
+
+        indexes = build_member_indexes(members)
     assigned_member_ids: set[str] = set()
 
     stats: dict[str, int] = {
@@ -431,95 +506,51 @@ def main() -> None:
         "members_inserted": 0,
         "relationships_updated": 0,
         "relationships_inserted": 0,
+        "members_unchanged": 0,
+        "members_changed_columns": 0,
+        "relationships_unchanged": 0,
         "extras_processed": 0,
         "legacy_linked": 0,
         "legacy_conflict_skipped": 0,
+        "legacy_pending_insert": 0,
+        "write_failed": 0,
+        "write_conflicts": 0,
+        "resumed_skipped": 0,
     }
+    member_updates: list[UpdateOp] = []
+    relationship_updates: list[UpdateOp] = []
+    member_diff = DiffStats()
+    write_results: list[UpdateResult] = []
     unmatched_main: list[tuple[int | None, str]] = []
     match_details: list[tuple[int | None, str, str, str]] = []
 
     # 1) 116명 메인 구간 업데이트
-    for row in main_rows:
-        member, matched_by = match_main_row_to_member(row, indexes, assigned_member_ids)
-        if not member:
-            stats["registered_unmatched"] += 1
-            unmatched_main.append((row.no, row.raw_name))
-            continue
-
-        assigned_member_ids.add(member["id"])
-        stats["registered_matched"] += 1
-        match_details.append((row.no, row.raw_name, as_text(member.get("name")), matched_by))
-
-        fallback_status = as_text(member.get("status")) or "정상"
-        status = infer_status(row.raw, row.raw_name, fallback_status)
-        memo = build_memo(row.raw, row.source_section, as_text(member.get("memo")))
-
-        payload: dict[str, Any] = {
-            "phone": row.phone or as_text(member.get("phone")) or "미입력",
-            "member_number": row.member_number or as_text(member.get("member_number")),
-            "tier": as_text(member.get("tier")) or "1차",
-            "is_registered": True,
-            "status": status,
-            "memo": memo,
-            "unit_group": row.unit_group or as_text(member.get("unit_group")),
-        }
-
-        if row.address:
-            payload["address_legal"] = row.address
-            payload["address_mailing"] = row.address
-            zipcode = extract_zipcode(row.address)
-            if zipcode:
-                payload["zipcode"] = zipcode
-
-        if dry_run:
-            stats["members_updated"] += 1
-        else:
-            supabase.table("members").update(payload).eq("id", member["id"]).execute()
-            stats["members_updated"] += 1
-
-        if row.proxy_name:
-            rel_result = upsert_relationship(
-                supabase=supabase,
-                existing_rel_map=rel_map,
-                member_id=member["id"],
-                member_name=as_text(member.get("name")),
-                proxy_name=row.proxy_name,
-                proxy_phone=row.proxy_phone,
-                dry_run=dry_run,
-            )
-            if rel_result in ("updated", "dry_run_update"):
-                stats["relationships_updated"] += 1
-            if rel_result in ("inserted", "dry_run_insert"):
-                stats["relationships_inserted"] += 1
-
-    # 2) 기타/예비 이름 반영 (메인 섹션 외)
-    # 중복 이름은 첫 값 우선
-    seen_extra_names: set[str] = set()
-    for row in extra_rows:
-        name_key = normalize_name_key(row.canonical_name)
-        if not name_key or name_key in seen_extra_names:
-            continue
-        seen_extra_names.add(name_key)
-        stats["extras_processed"] += 1
+    with metrics.phase("registered_rows"):
+        for row in main_rows:
+            member, matched_by = match_main_row_to_member(row, indexes, assigned_member_ids)
+            if not member:
+                stats["registered_unmatched"] += 1
+                unmatched_main.append((row.no, row.raw_name))
+                continue
 
-        # 기존 멤버 조회 (exact -> simple)
-        exact_matches = indexes["by_exact"].get(name_key, [])
-        simple_matches = indexes["by_simple"].get(normalize_name_key(strip_annotations(row.canonical_name)), [])
-        target_member = exact_matches[0] if len(exact_matches) == 1 else (simple_matches[0] if len(simple_matches) == 1 else None)
+            assigned_member_ids.add(member["id"])
+            stats["registered_matched"] += 1
+            match_details.append((row.no, row.raw_name, as_text(member.get("name")), matched_by))
 
-        if target_member:
-            fallback_status = as_text(target_member.get("status")) or "정상"
+            fallback_status = as_text(member.get("status")) or "정상"
             status = infer_status(row.raw, row.raw_name, fallback_status)
-            memo = build_memo(row.raw, row.source_section, as_text(target_member.get("memo")))
+            memo = build_memo(row.raw, row.source_section, as_text(member.get("memo")))
+
             payload: dict[str, Any] = {
-                "phone": row.phone or as_text(target_member.get("phone")) or "미입력",
-                "tier": as_text(target_member.get("tier")) or "예비",
+                "phone": row.phone or as_text(member.get("phone")) or "미입력",
+                "member_number": row.member_number or as_text(member.get("member_number")),
+                "tier": as_text(member.get("tier")) or "1차",
+                "is_registered": True,
                 "status": status,
-                "is_registered": bool(target_member.get("is_registered")),
                 "memo": memo,
+                "unit_group": row.unit_group or as_text(member.get("unit_group")),
             }
-            if not target_member.get("is_registered"):
-                payload["tier"] = "예비"
+
             if row.address:
                 payload["address_legal"] = row.address
                 payload["address_mailing"] = row.address
@@ -527,101 +558,242 @@ def main() -> None:
                 if zipcode:
                     payload["zipcode"] = zipcode
 
-            if dry_run:
-                stats["members_updated"] += 1
-            else:
-                supabase.table("members").update(payload).eq("id", target_member["id"]).execute()
+            changes, base, sources = member_changes(member, payload, member_diff, plan, label=row.raw_name)
+            if changes and dry_run:
                 stats["members_updated"] += 1
-        else:
-            # 신규 생성: 예비/기타
-            status = infer_status(row.raw, row.raw_name, "정상")
-            payload = {
-                "name": row.canonical_name,
-                "phone": row.phone or "미입력",
-                "member_number": row.member_number,
-                "tier": "예비",
-                "is_registered": False,
-                "status": status,
-                "memo": build_memo(row.raw, row.source_section, ""),
-                "unit_group": row.unit_group,
-                "address_legal": row.address,
-                "address_mailing": row.address,
-            }
-            zipcode = extract_zipcode(row.address)
-            if zipcode:
-                payload["zipcode"] = zipcode
+            elif changes:
+                op = UpdateOp(
+                    "members",
+                    member["id"],
+                    changes,
+                    label=row.raw_name,
+                    key=f"members:main:{member['id']}",
+                    expected=precondition(member),
+                    base=base,
+                    sources=sources,
+                )
+                if not journal.done(op.journal_key):
+                    member_updates.append(op)
+
+            if row.proxy_name:
+                rel_result = upsert_relationship(
+                    supabase=supabase,
+                    existing_rel_map=rel_map,
+                    member_id=member["id"],
+                    member_name=as_text(member.get("name")),
+                    proxy_name=row.proxy_name,
+                    proxy_phone=row.proxy_phone,
+                    dry_run=dry_run,
+                    pending_updates=relationship_updates,
+                    journal=journal,
+                    plan=plan,
+                )
+                if rel_result == "dry_run_update":
+                    stats["relationships_updated"] += 1
+                if rel_result in ("inserted", "dry_run_insert"):
+                    stats["relationships_inserted"] += 1
+                if rel_result == "unchanged":
+                    stats["relationships_unchanged"] += 1
 
-            if dry_run:
-                stats["members_inserted"] += 1
+    # 2) 기타/예비 이름 반영 (메인 섹션 외)
+    # 중복 이름은 첫 값 우선
+    with metrics.phase("extra_rows"):
+        seen_extra_names: set[str] = set()
+        for row in extra_rows:
+            name_key = normalize_name_key(row.canonical_name)
+            if not name_key or name_key in seen_extra_names:
+                continue
+            seen_extra_names.add(name_key)
+            stats["extras_processed"] += 1
+
+            # 기존 멤버 조회 (exact -> simple)
+            exact_matches = indexes["by_exact"].get(name_key, [])
+            simple_matches = indexes["by_simple"].get(normalize_name_key(strip_annotations(row.canonical_name)), [])
+            target_member = exact_matches[0] if len(exact_matches) == 1 else (simple_matches[0] if len(simple_matches) == 1 else None)
+
+            if target_member:
+                fallback_status = as_text(target_member.get("status")) or "정상"
+                status = infer_status(row.raw, row.raw_name, fallback_status)
+                memo = build_memo(row.raw, row.source_section, as_text(target_member.get("memo")))
+                payload: dict[str, Any] = {
+                    "phone": row.phone or as_text(target_member.get("phone")) or "미입력",
+                    "tier": as_text(target_member.get("tier")) or "예비",
+                    "status": status,
+                    "is_registered": bool(target_member.get("is_registered")),
+                    "memo": memo,
+                }
+                if not target_member.get("is_registered"):
+                    payload["tier"] = "예비"
+                if row.address:
+                    payload["address_legal"] = row.address
+                    payload["address_mailing"] = row.address
+                    zipcode = extract_zipcode(row.address)
+                    if zipcode:
+                        payload["zipcode"] = zipcode
+
+                changes, base, sources = member_changes(target_member, payload, member_diff, plan, label=row.raw_name)
+                if changes and dry_run:
+                    stats["members_updated"] += 1
+                elif changes:
+                    op = UpdateOp(
+                        "members",
+                        target_member["id"],
+                        changes,
+                        label=row.raw_name,
+                        key=f"members:extra:{target_member['id']}",
+                        expected=precondition(target_member),
+                        base=base,
+                        sources=sources,
+                    )
+                    if not journal.done(op.journal_key):
+                        member_updates.append(op)
             else:
-                inserted = supabase.table("members").insert(payload).execute()
-                if inserted.data:
-                    members.append(inserted.data[0])
-                stats["members_inserted"] += 1
+                # 신규 생성: 예비/기타
+                status = infer_status(row.raw, row.raw_name, "정상")
+                payload = {
+                    "name": row.canonical_name,
+                    "phone": row.phone or "미입력",
+                    "member_number": row.member_number,
+                    "tier": "예비",
+                    "is_registered": False,
+                    "status": status,
+                    "memo": build_memo(row.raw, row.source_section, ""),
+                    "unit_group": row.unit_group,
+                    "address_legal": row.address,
+                    "address_mailing": row.address,
+                }
+                zipcode = extract_zipcode(row.address)
+                if zipcode:
+                    payload["zipcode"] = zipcode
+
+                if plan is not None:
+                    plan.insert("members", payload, label=row.canonical_name)
+                if dry_run:
+                    # --apply 와 같은 후보로 legacy 매칭을 하도록 자리표시 id 로 추가
+                    members.append({"id": f"{PLANNED_MEMBER_PREFIX}{row.canonical_name}", "name": row.canonical_name})
+                    stats["members_inserted"] += 1
+                else:
+                    inserted = supabase.table("members").insert(payload).execute()
+                    if inserted.data:
+                        members.append(inserted.data[0])
+                    stats["members_inserted"] += 1
+
+    with metrics.phase("member_writes"):
+        if member_updates:
+            results = run_guarded_updates(supabase, member_updates, args.concurrency, on_result=mark_journal(journal))
+            stats["members_updated"] += sum(1 for r in results if r.ok)
+            write_results.extend(results)
+        if relationship_updates:
+            results = run_guarded_updates(
+                supabase, relationship_updates, args.concurrency, on_result=mark_journal(journal)
+            )
+            stats["relationships_updated"] += sum(1 for r in results if r.ok)
+            write_results.extend(results)
 
     # 3) legacy_records 이름 매칭 갱신
     # members 최신 다시 로드
-    members = (supabase.table("members").select("id, name").execute().data or []) if not dry_run else members
+    with metrics.phase("legacy_index"):
+        members = (supabase.table("members").select("id, name").execute().data or []) if not dry_run else members
+
+        name_to_member_ids: dict[str, set[str]] = {}
+        for member in members:
+            keys = {
+                normalize_name_key(as_text(member.get("name"))),
+                normalize_name_key(strip_annotations(as_text(member.get("name")))),
+            }
+            for key in keys:
+                if key:
+                    name_to_member_ids.setdefault(key, set()).add(member["id"])
+
+        # 엑셀 이름 후보 -> 실제 매핑된 member_id도 추가
+        row_to_member: dict[str, str] = {}
+        for no, raw_name, mapped_name, _ in match_details:
+            _ = no
+            key = normalize_name_key(clean_name_for_display(raw_name))
+            # mapped_name 기준으로 멤버 id 찾기
+            member_ids = [
+                m["id"]
+                for m in members
+                if normalize_name_key(as_text(m.get("name"))) == normalize_name_key(mapped_name)
+            ]
+            if len(member_ids) == 1:
+                row_to_member[key] = member_ids[0]
+
+    with metrics.phase("legacy_download"):
+        legacy_columns = "id, original_name, member_id, is_refunded"
+        if not dry_run and supports_preconditions(supabase, "legacy_records"):
+            legacy_columns += f", {VERSION_COLUMN}"
+        legacy_records = supabase.table("legacy_records").select(legacy_columns).execute().data or []
+    with metrics.phase("legacy_match"):
+        legacy_updates: list[UpdateOp] = []
+        for record in legacy_records:
+            original_name = as_text(record.get("original_name"))
+            keys = {
+                normalize_name_key(original_name),
+                normalize_name_key(strip_annotations(original_name)),
+            }
 
-    name_to_member_ids: dict[str, set[str]] = {}
-    for member in members:
-        keys = {
-            normalize_name_key(as_text(member.get("name"))),
-            normalize_name_key(strip_annotations(as_text(member.get("name")))),
-        }
-        for key in keys:
-            if key:
-                name_to_member_ids.setdefault(key, set()).add(member["id"])
-
-    # 엑셀 이름 후보 -> 실제 매핑된 member_id도 추가
-    row_to_member: dict[str, str] = {}
-    for no, raw_name, mapped_name, _ in match_details:
-        _ = no
-        key = normalize_name_key(clean_name_for_display(raw_name))
-        # mapped_name 기준으로 멤버 id 찾기
-        member_ids = [
-            m["id"]
-            for m in members
-            if normalize_name_key(as_text(m.get("name"))) == normalize_name_key(mapped_name)
-        ]
-        if len(member_ids) == 1:
-            row_to_member[key] = member_ids[0]
-
-    legacy_records = supabase.table("legacy_records").select("id, original_name, member_id").execute().data or []
-    for record in legacy_records:
-        original_name = as_text(record.get("original_name"))
-        keys = {
-            normalize_name_key(original_name),
-            normalize_name_key(strip_annotations(original_name)),
-        }
-
-        candidate_ids: set[str] = set()
-        for key in keys:
-            if not key:
-                continue
-            candidate_ids.update(name_to_member_ids.get(key, set()))
-            mapped = row_to_member.get(key)
-            if mapped:
-                candidate_ids.add(mapped)
+            candidate_ids: set[str] = set()
+            for key in keys:
+                if not key:
+                    continue
+                candidate_ids.update(name_to_member_ids.get(key, set()))
+                mapped = row_to_member.get(key)
+                if mapped:
+                    candidate_ids.add(mapped)
 
-        if len(candidate_ids) != 1:
-            continue
+            if len(candidate_ids) != 1:
+                continue
 
-        target_member_id = next(iter(candidate_ids))
-        current_member_id = record.get("member_id")
-        if current_member_id and current_member_id != target_member_id:
-            stats["legacy_conflict_skipped"] += 1
-            continue
-        if current_member_id == target_member_id:
-            continue
+            target_member_id = next(iter(candidate_ids))
+            current_member_id = record.get("member_id")
+            if current_member_id and current_member_id != target_member_id:
+                stats["legacy_conflict_skipped"] += 1
+                continue
+            if current_member_id == target_member_id:
+                continue
+            if str(target_member_id).startswith(PLANNED_MEMBER_PREFIX):
+                # 아직 없는 멤버라 계획에 넣을 수 없다
+                stats["legacy_pending_insert"] += 1
+                continue
 
-        if dry_run:
-            stats["legacy_linked"] += 1
-        else:
-            supabase.table("legacy_records").update(
-                {"member_id": target_member_id, "is_refunded": False}
-            ).eq("id", record["id"]).execute()
-            stats["legacy_linked"] += 1
+            changes = diff_payload(record, {"member_id": target_member_id, "is_refunded": False})
+            if plan is not None:
+                plan.update(
+                    "legacy_records",
+                    record["id"],
+                    record,
+                    changes,
+                    label=original_name,
+                    sources={"original_name": record.get("original_name")},
+                )
+            if dry_run:
+                stats["legacy_linked"] += 1
+            else:
+                op = UpdateOp(
+                    "legacy_records",
+                    record["id"],
+                    changes,
+                    label=original_name,
+                    expected=precondition(record),
+                    base={column: record.get(column) for column in changes},
+                    sources={"original_name": record.get("original_name")},
+                )
+                if not journal.done(op.journal_key):
+                    legacy_updates.append(op)
+
+    with metrics.phase("legacy_writes"):
+        if legacy_updates:
+            results = run_guarded_updates(supabase, legacy_updates, args.concurrency, on_result=mark_journal(journal))
+            stats["legacy_linked"] += sum(1 for r in results if r.ok)
+            write_results.extend(results)
+
+    stats["members_unchanged"] = member_diff.unchanged
+    stats["members_changed_columns"] = member_diff.columns
+    stats["write_failed"] = sum(1 for r in write_results if not r.ok and not r.conflict)
+    stats["write_conflicts"] = sum(1 for r in write_results if r.conflict)
+    stats["resumed_skipped"] = journal.skipped
+    metrics.update_counters(stats)
 
     mode = "DRY-RUN" if dry_run else "APPLY"
     print(f"\n=== 최신주소 동기화 결과 ({mode}) ===")
@@ -638,6 +810,75 @@ def main() -> None:
         no, excel_name, mapped_name, matched_by = item
         print(f"- NO {no}: '{excel_name}' -> '{mapped_name}' ({matched_by})")
 
+    if plan is not None:
+        plan.write(args.plan)
+        counts = ", ".join(f"{k} {v}건" for k, v in sorted(plan.summary().items())) or "변경 없음"
+        print(f"\n📁 변경 계획 저장: {args.plan} ({counts})")
+        print(f"   반영: python scripts/sync_latest_address_book.py --apply-plan {args.plan}")
+        if stats["legacy_pending_insert"]:
+            print(
+                f"⚠️ 신규 멤버에 연결될 legacy_records {stats['legacy_pending_insert']}건은 계획에 없습니다."
+                " --apply-plan 뒤 dry-run 을 다시 실행해 반영하세요."
+            )
+
+    print_failures(write_results)
+    print_request_stats()
+    metrics.print_report()
+
+
+def run_apply_plan(args: argparse.Namespace, journal: Journal, metrics: Instrumentation) -> None:
+    """dry-run 이 저장한 계획을 엑셀 파싱/매칭 없이 그대로 반영."""
+    plan = load_plan(args.apply_plan, PLAN_NAME)
+    supabase = get_client()
+    with metrics.phase("fingerprint"):
+        fingerprint = source_fingerprint(supabase, PLAN_TABLES, [FILE_PATH])
+    with metrics.phase("plan_writes"):
+        result = apply_changeset(supabase, plan, fingerprint, args.concurrency, journal)
+    metrics.update_counters(
+        {"planned": len(plan.changes), "updated": result.updated, "inserted": result.inserted, "stale": len(result.stale)}
+    )
+
+    print(f"\n=== 최신주소 동기화 계획 반영 ({args.apply_plan}) ===")
+    print_plan_result(result)
+    print_failures(result.failures)
+    print_request_stats()
+    metrics.print_report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="최신주소(피플용).xlsx 동기화")
+    parser.add_argument("--apply", action="store_true", help="실제 DB 반영")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="members/legacy_records update 동시 전송 수 (asyncio, 기본 1=순차)",
+    )
+    parser.add_argument(
+        "--plan",
+        default=default_plan_path(PLAN_NAME),
+        help="dry-run 변경 계획(NDJSON) 저장 경로",
+    )
+    parser.add_argument("--apply-plan", metavar="PLAN", help="dry-run 계획 파일을 다시 계산하지 않고 그대로 반영")
+    parser.add_argument("--resume", action="store_true", help="저널에 기록된 완료 작업은 건너뛰고 이어서 반영")
+    parser.add_argument("--journal", default=default_journal_path("sync_latest_address_book"), help="작업 저널 경로")
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    dry_run = not args.apply and not args.apply_plan
+    journal = Journal(args.journal, resume=args.resume) if not dry_run else Journal.disabled()
+    metrics = Instrumentation("sync_latest_address_book")
+    try:
+        with profile_from_args(args):
+            if args.apply_plan:
+                run_apply_plan(args, journal, metrics)
+            else:
+                run_sync(args, dry_run, journal, metrics)
+    finally:
+        journal.close()
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+
 
 if __name__ == "__main__":
     main()
@@ -9,16 +9,39 @@ members.member_number(조합번호)를 legacy_records 권리증번호에 반영.
    - raw_data["권리증번호_조합번호"] 기록
 
 기본은 Dry-run, 실제 반영은 --apply.
+Dry-run 은 변경 계획(NDJSON)을 저장하고, --apply-plan 으로 다시 매칭하지 않고 그대로 반영할 수 있다.
 """
 
 from __future__ import annotations
 
 import argparse
-import os
 import re
 from typing import Any
 
-from supabase import Client, create_client
+from lib.async_writes import (
+    VERSION_COLUMN,
+    UpdateOp,
+    precondition,
+    print_failures,
+    run_guarded_updates,
+    supports_preconditions,
+)
+from lib.changeset import (
+    Changeset,
+    apply_changeset,
+    default_plan_path,
+    load_plan,
+    print_plan_result,
+    source_fingerprint,
+)
+from lib.instrumentation import Instrumentation
+from lib.normalize import as_text, simple_name_key
+from lib.profiling import add_profile_arguments, profile_from_args
+from lib.supabase_client import get_client, print_request_stats
+
+PLAN_NAME = "sync_member_number_to_legacy_cert"
+PLAN_TABLES = ["members", "legacy_records"]
+MATCH_SOURCE_COLUMNS = ("member_id", "original_name")
 
 CERT_PATTERNS = [
     re.compile(r"^\d{4}-\d{1,2}-\d+$"),
@@ -26,49 +49,6 @@ CERT_PATTERNS = [
 ]
 SPECIAL_CERT_PATTERN = re.compile(r"^(\d{4})-특-?(\d+)$")
 CERT_LIKE_KEYWORDS = ("권리증", "필증", "증서", "증번호", "채권번호", "certificate", "cert_no", "certno")
-ANNOTATION_WORDS = ("별세", "시동생", "없는사람")
-
-
-def load_env_file(path: str) -> dict[str, str]:
-    env: dict[str, str] = {}
-    if not os.path.exists(path):
-        return env
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            text = line.strip()
-            if not text or "=" not in text:
-                continue
-            key, value = text.split("=", 1)
-            env[key] = value
-    return env
-
-
-def create_supabase() -> Client:
-    env_local = load_env_file(".env.local")
-    url = os.environ.get("SUPABASE_URL") or env_local.get("NEXT_PUBLIC_SUPABASE_URL")
-    key = os.environ.get("SUPABASE_SERVICE_KEY") or os.environ.get("SUPABASE_KEY") or env_local.get("NEXT_PUBLIC_SUPABASE_ANON_KEY")
-    if not url or not key:
-        raise RuntimeError("Supabase 연결 정보가 없습니다.")
-    return create_client(url, key)
-
-
-def as_text(value: Any) -> str:
-    if value is None:
-        return ""
-    text = str(value).strip()
-    if text.lower() == "nan":
-        return ""
-    return text
-
-
-def normalize_name_key(name: str) -> str:
-    text = as_text(name).replace("?", "").replace("X", "")
-    for word in ANNOTATION_WORDS:
-        text = text.replace(word, "")
-    text = text.replace("\r", " ").replace("\n", " ")
-    text = re.sub(r"\s+", "", text)
-    text = re.sub(r"\(\s*\)", "", text)
-    return text.strip()
 
 
 def is_certificate_like_key(key: str) -> bool:
@@ -130,103 +110,126 @@ def collect_cert_numbers(raw_data: Any, certificates: Any) -> set[str]:
     return found
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser(description="조합번호 -> 권리증번호 반영")
-    parser.add_argument("--apply", action="store_true", help="실제 반영")
-    args = parser.parse_args()
+def run_member_number_sync(args: argparse.Namespace, metrics: Instrumentation) -> None:
     dry_run = not args.apply
-
-    supabase = create_supabase()
-    members = supabase.table("members").select("id,name,member_number").execute().data or []
-    legacy_records = supabase.table("legacy_records").select(
-        "id,original_name,member_id,raw_data,certificates"
-    ).execute().data or []
-
-    member_by_id = {m["id"]: m for m in members}
-    name_index: dict[str, list[dict[str, Any]]] = {}
-    for member in members:
-        key = normalize_name_key(as_text(member.get("name")))
-        if not key:
-            continue
-        name_index.setdefault(key, []).append(member)
-
-    stats = {
-        "total_legacy": len(legacy_records),
-        "target_rows": 0,
-        "updated_rows": 0,
-        "skipped_no_member_number": 0,
-        "skipped_invalid_member_number_format": 0,
-        "skipped_already_exists": 0,
-        "skipped_ambiguous_name": 0,
-    }
-
-    sample_updates: list[tuple[str, str, str]] = []
-
-    for record in legacy_records:
-        member = None
-        if record.get("member_id") and record["member_id"] in member_by_id:
-            member = member_by_id[record["member_id"]]
-        else:
-            key = normalize_name_key(as_text(record.get("original_name")))
-            candidates = name_index.get(key, [])
-            if len(candidates) == 1:
-                member = candidates[0]
-            elif len(candidates) > 1:
-                stats["skipped_ambiguous_name"] += 1
+    supabase = get_client()
+    plan: Changeset | None = None
+    if dry_run:
+        with metrics.phase("fingerprint"):
+            plan = Changeset(PLAN_NAME, source_fingerprint(supabase, PLAN_TABLES))
+    with metrics.phase("download"):
+        members = supabase.table("members").select("id,name,member_number").execute().data or []
+        legacy_columns = "id,original_name,member_id,raw_data,certificates"
+        if not dry_run and supports_preconditions(supabase, "legacy_records"):
+            legacy_columns += f",{VERSION_COLUMN}"
+        legacy_records = supabase.table("legacy_records").select(legacy_columns).execute().data or []
+
+    with metrics.phase("match"):
+        member_by_id = {m["id"]: m for m in members}
+        name_index: dict[str, list[dict[str, Any]]] = {}
+        for member in members:
+            key = simple_name_key(as_text(member.get("name")))
+            if not key:
                 continue
+            name_index.setdefault(key, []).append(member)
+
+        stats = {
+            "total_legacy": len(legacy_records),
+            "target_rows": 0,
+            "updated_rows": 0,
+            "skipped_no_member_number": 0,
+            "skipped_invalid_member_number_format": 0,
+            "skipped_already_exists": 0,
+            "skipped_ambiguous_name": 0,
+            "write_failed": 0,
+            "write_conflicts": 0,
+        }
+
+        sample_updates: list[tuple[str, str, str]] = []
+        pending_updates: list[UpdateOp] = []
+
+        for record in legacy_records:
+            member = None
+            if record.get("member_id") and record["member_id"] in member_by_id:
+                member = member_by_id[record["member_id"]]
             else:
+                key = simple_name_key(as_text(record.get("original_name")))
+                candidates = name_index.get(key, [])
+                if len(candidates) == 1:
+                    member = candidates[0]
+                elif len(candidates) > 1:
+                    stats["skipped_ambiguous_name"] += 1
+                    continue
+                else:
+                    continue
+
+            member_number = as_text(member.get("member_number"))
+            if not member_number:
+                stats["skipped_no_member_number"] += 1
+                continue
+            normalized_member_number = normalize_cert_value(member_number)
+            if not normalized_member_number:
+                stats["skipped_invalid_member_number_format"] += 1
+                continue
+
+            stats["target_rows"] += 1
+
+            current_certs = collect_cert_numbers(record.get("raw_data"), record.get("certificates"))
+            if normalized_member_number in current_certs:
+                stats["skipped_already_exists"] += 1
                 continue
 
-        member_number = as_text(member.get("member_number"))
-        if not member_number:
-            stats["skipped_no_member_number"] += 1
-            continue
-        normalized_member_number = normalize_cert_value(member_number)
-        if not normalized_member_number:
-            stats["skipped_invalid_member_number_format"] += 1
-            continue
-
-        stats["target_rows"] += 1
-
-        current_certs = collect_cert_numbers(record.get("raw_data"), record.get("certificates"))
-        if normalized_member_number in current_certs:
-            stats["skipped_already_exists"] += 1
-            continue
-
-        raw_data = record.get("raw_data")
-        if not isinstance(raw_data, dict):
-            raw_data = {}
-        raw_data["권리증번호_조합번호"] = normalized_member_number
-
-        certificates = record.get("certificates")
-        if not isinstance(certificates, list):
-            certificates = []
-
-        certificates.append(
-            {
-                "no": normalized_member_number,
-                "source": "members.member_number_sync",
-            }
-        )
-
-        if not dry_run:
-            supabase.table("legacy_records").update(
+            # 계획의 old 값이 DB 값 그대로 남도록 복사본을 고친다
+            raw_data = record.get("raw_data")
+            raw_data = dict(raw_data) if isinstance(raw_data, dict) else {}
+            raw_data["권리증번호_조합번호"] = normalized_member_number
+
+            certificates = record.get("certificates")
+            certificates = list(certificates) if isinstance(certificates, list) else []
+
+            certificates.append(
                 {
-                    "raw_data": raw_data,
-                    "certificates": certificates,
+                    "no": normalized_member_number,
+                    "source": "members.member_number_sync",
                 }
-            ).eq("id", record["id"]).execute()
-
-        stats["updated_rows"] += 1
-        if len(sample_updates) < 20:
-            sample_updates.append(
-                (
-                    as_text(record.get("original_name")),
-                    as_text(member.get("name")),
-                    normalized_member_number,
-                )
             )
 
+            payload = {"raw_data": raw_data, "certificates": certificates}
+            label = as_text(record.get("original_name"))
+            # 조합원 매칭에 쓴 컬럼: 바뀌었으면 다른 사람의 조합번호일 수 있으므로 재시도하지 않는다
+            sources = {column: record.get(column) for column in MATCH_SOURCE_COLUMNS}
+            if plan is not None:
+                plan.update("legacy_records", record["id"], record, payload, label=label, sources=sources)
+            if dry_run:
+                stats["updated_rows"] += 1
+            else:
+                pending_updates.append(
+                    UpdateOp(
+                        "legacy_records",
+                        record["id"],
+                        payload,
+                        label=label,
+                        expected=precondition(record),
+                        base={column: record.get(column) for column in payload},
+                        sources=sources,
+                    )
+                )
+
+            if len(sample_updates) < 20:
+                sample_updates.append(
+                    (
+                        as_text(record.get("original_name")),
+                        as_text(member.get("name")),
+                        normalized_member_number,
+                    )
+                )
+
+    with metrics.phase("writes"):
+        results = run_guarded_updates(supabase, pending_updates, args.concurrency)
+        stats["updated_rows"] += sum(1 for r in results if r.ok)
+        stats["write_failed"] = sum(1 for r in results if not r.ok and not r.conflict)
+        stats["write_conflicts"] = sum(1 for r in results if r.conflict)
+
     mode = "DRY-RUN" if dry_run else "APPLY"
     print(f"\n=== 조합번호 -> 권리증번호 동기화 ({mode}) ===")
     for key, value in stats.items():
@@ -237,6 +240,56 @@ def main() -> None:
         for legacy_name, member_name, number in sample_updates:
             print(f"- legacy '{legacy_name}' -> member '{member_name}' / {number}")
 
+    if plan is not None:
+        plan.write(args.plan)
+        print(f"\n📁 변경 계획 저장: {args.plan} (legacy_records {len(plan.changes)}건)")
+        print(f"   반영: python scripts/sync_member_number_to_legacy_cert.py --apply-plan {args.plan}")
+
+    metrics.update_counters(stats)
+    print_failures(results)
+    print_request_stats()
+    metrics.print_report()
+
+
+def run_apply_plan(args: argparse.Namespace, metrics: Instrumentation) -> None:
+    plan = load_plan(args.apply_plan, PLAN_NAME)
+    supabase = get_client()
+    with metrics.phase("fingerprint"):
+        fingerprint = source_fingerprint(supabase, PLAN_TABLES)
+    with metrics.phase("writes"):
+        result = apply_changeset(supabase, plan, fingerprint, args.concurrency)
+    metrics.update_counters({"planned": len(plan.changes), "updated_rows": result.updated, "stale": len(result.stale)})
+
+    print(f"\n=== 조합번호 -> 권리증번호 계획 반영 ({args.apply_plan}) ===")
+    print_plan_result(result)
+    print_failures(result.failures)
+    print_request_stats()
+    metrics.print_report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="조합번호 -> 권리증번호 반영")
+    parser.add_argument("--apply", action="store_true", help="실제 반영")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="legacy_records update 동시 전송 수 (asyncio, 기본 1=순차)",
+    )
+    parser.add_argument("--plan", default=default_plan_path(PLAN_NAME), help="dry-run 변경 계획(NDJSON) 저장 경로")
+    parser.add_argument("--apply-plan", metavar="PLAN", help="dry-run 계획 파일을 다시 매칭하지 않고 그대로 반영")
+    parser.add_argument("--metrics-json", help="단계별 계측 결과를 JSON 파일로 저장")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    metrics = Instrumentation("sync_member_number_to_legacy_cert")
+    with profile_from_args(args):
+        if args.apply_plan:
+            run_apply_plan(args, metrics)
+        else:
+            run_member_number_sync(args, metrics)
+    if args.metrics_json:
+        metrics.write_json(args.metrics_json)
+
 
 if __name__ == "__main__":
     main()
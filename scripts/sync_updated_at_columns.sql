@@ -0,0 +1,33 @@
+-- members / legacy_records / relationships 에 updated_at(버전) 컬럼 + 자동 갱신 트리거.
+-- 동기화 스크립트(sync_latest_address_book.py, sync_member_number_to_legacy_cert.py,
+-- recalculate_rights_count_from_cert_numbers.py, --apply-plan)는 읽을 때의 updated_at 을
+-- update 조건으로 붙여, 동기화 도중 웹에서 고친 행을 덮어쓰지 않는다 (lib/async_writes.py).
+-- 컬럼이 없으면 스크립트는 조건 없이 기존처럼 쓴다.
+-- 트리거 함수는 accounting_domain_phase3_constraints.sql 의 공통 public.set_updated_at() 을 쓴다.
+-- Run this in Supabase SQL Editor.
+
+do $$
+begin
+    if to_regprocedure('public.set_updated_at()') is null then
+        raise exception 'public.set_updated_at() 가 없습니다. accounting_domain_phase3_constraints.sql 을 먼저 실행하세요.';
+    end if;
+end $$;
+
+alter table public.members add column if not exists updated_at timestamptz not null default now();
+alter table public.legacy_records add column if not exists updated_at timestamptz not null default now();
+alter table public.relationships add column if not exists updated_at timestamptz not null default now();
+
+drop trigger if exists trg_members_updated_at on public.members;
+create trigger trg_members_updated_at
+before update on public.members
+for each row execute function public.set_updated_at();
+
+drop trigger if exists trg_legacy_records_updated_at on public.legacy_records;
+create trigger trg_legacy_records_updated_at
+before update on public.legacy_records
+for each row execute function public.set_updated_at();
+
+drop trigger if exists trg_relationships_updated_at on public.relationships;
+create trigger trg_relationships_updated_at
+before update on public.relationships
+for each row execute function public.set_updated_at();
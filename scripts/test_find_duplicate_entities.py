@@ -0,0 +1,56 @@
+"""
+find_duplicate_entities.py 테스트.
+
+members 한 명과 accounting_domain_phase2_backfill.sql 이 그 member 로 만든 account_entities 행은
+이름 / 전화번호 / 생년월일이 모두 같지만 이미 연결된 같은 사람이므로 후보가 나오면 안 된다.
+
+사용:
+    cd scripts && python -m unittest test_find_duplicate_entities
+    cd scripts && python -m pytest -q test_find_duplicate_entities.py
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import unittest
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+from find_duplicate_entities import find_candidates, linked_pairs, to_person  # noqa: E402
+
+MEMBER = {"id": "m-1", "name": "김철수", "phone": "010-1234-5678", "birth_date": "1960-01-02", "member_number": ""}
+ENTITY = {
+    "id": "e-1",
+    "display_name": "김철수",
+    "phone": "01012345678",
+    "member_number": "",
+    "meta": {"source": "members_without_party", "source_member_id": "m-1", "birth_date": "600102"},
+}
+
+
+class LinkedPairTest(unittest.TestCase):
+    def people(self, entity: dict) -> list:
+        return [to_person("entity", entity, "display_name"), to_person("member", MEMBER, "name")]
+
+    def test_unlinked_pair_is_candidate(self) -> None:
+        entity = {**ENTITY, "meta": {"birth_date": "600102"}}
+        candidates, _ = find_candidates(self.people(entity), 0.5, linked_pairs([entity], []))
+        self.assertEqual(len(candidates), 1)
+
+    def test_backfilled_entity_is_not_candidate(self) -> None:
+        candidates, stats = find_candidates(self.people(ENTITY), 0.5, linked_pairs([ENTITY], []))
+        self.assertEqual(candidates, [])
+        self.assertEqual(stats["linked_pairs"], 1)
+
+    def test_membership_role_link_is_not_candidate(self) -> None:
+        entity = {**ENTITY, "meta": {"birth_date": "600102"}}
+        roles = [{"entity_id": "e-1", "source_member_id": "m-1"}]
+        candidates, _ = find_candidates(self.people(entity), 0.5, linked_pairs([entity], roles))
+        self.assertEqual(candidates, [])
+
+
+if __name__ == "__main__":
+    unittest.main()